@@ -0,0 +1,223 @@
+# Search results shared between sessions and processes through a memory-mapped file.
+#
+# The file is a hash table of fixed size: each key falls in a bucket of `BUCKET_SIZE`
+# slots, and a full bucket evicts its shallowest, then oldest, entry. The key hashes
+# the position with the settings of the search, so that engines configured differently
+# never read each other's results. During the placing phase the position is reduced to
+# its canonical image under the symmetries of the board. After it, the mills formed so
+# far decide which moves capture, and they are not symmetric with the position, so the
+# position is kept as it is, with the pieces and the mills that cannot be formed again.
+# A slot stores the key, the depth of the search, its value from the point of view of
+# the orange player and the best move, encoded in the image of the position.
+# Readers share a lock on the file and writers hold it exclusively, where `fcntl` is
+# available.
+from src.game_env.board import Board
+from src.game_env.symmetry import canonical_keys, decode_move, encode_move
+from src.globals import ANALYSIS_CACHE_PATH, NODE_INDEX
+from typing import Any, Optional
+from contextlib import contextmanager
+from pathlib import Path
+import dataclasses as dc
+import hashlib
+import json
+import numpy as np
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+BUCKET_SIZE = 4
+
+CACHE_DTYPE = np.dtype(
+    [
+        ("key", "<i8"),
+        ("value", "<f4"),
+        ("stamp", "<u4"),
+        ("depth", "u1"),
+        ("source", "u1"),
+        ("target", "u1"),
+        ("padding", "u1"),
+    ]
+)
+
+
+@dc.dataclass
+class AnalysisCache:
+    """Class to store search results in a file shared by all the engines.
+
+    The settings given with each position should describe everything else that
+    determines the result of a search besides its depth, such as the coefficients of
+    the evaluation. The code of the evaluation is not part of them, so the file should
+    be deleted when it changes.
+
+    Args:
+        path (Path, optional): The file of the cache. Defaults to ANALYSIS_CACHE_PATH.
+        max_entries (int, optional): The capacity of the cache. Defaults to 2**20.
+
+    Attributes:
+        slots (np.ndarray): The memory-mapped slots of the cache, one row per bucket.
+        n_hits (int): The number of lookups that found a usable entry.
+        n_lookups (int): The number of lookups.
+    """
+
+    path: Path = ANALYSIS_CACHE_PATH
+    max_entries: int = 2**20
+    slots: np.ndarray = dc.field(init=False, repr=False)
+    n_hits: int = dc.field(default=0, init=False, repr=False)
+    n_lookups: int = dc.field(default=0, init=False, repr=False)
+    _file: Any = dc.field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        n_buckets = max(1, self.max_entries // BUCKET_SIZE)
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a+b")
+        with self._locked(exclusive=True):
+            # An existing file keeps its size, so that every process agrees on it
+            size = path.stat().st_size
+            if size < CACHE_DTYPE.itemsize * BUCKET_SIZE:
+                self._file.truncate(n_buckets * BUCKET_SIZE * CACHE_DTYPE.itemsize)
+            self.slots = np.memmap(path, dtype=CACHE_DTYPE, mode="r+").reshape(
+                -1, BUCKET_SIZE
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The file is opened again by the process that receives the cache
+        return {"path": self.path, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.n_hits, self.n_lookups = 0, 0
+        self.__post_init__()
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def position_key(board: Board, settings: bytes = b"") -> tuple[int, int]:
+        """Compute the key of a position searched with the given settings.
+
+        Args:
+            board (Board): The board.
+            settings (bytes, optional): The settings of the search. Defaults to b"".
+
+        Returns:
+            tuple[int, int]: The key and the symmetry mapping the board to the image
+                its moves are encoded in.
+        """
+        if board.started_moving:
+            symmetry = 0
+            position = [
+                board.key(),
+                sorted(
+                    [piece.id, NODE_INDEX.get(piece.piece.node, -1)]
+                    for pieces in board.pieces.values()
+                    for piece in pieces
+                ),
+                sorted(
+                    [list(mill[0]), sorted(NODE_INDEX[node] for node in mill[1])]
+                    for mill in board.formed_mills or []
+                ),
+            ]
+        else:
+            canonical, symmetries = canonical_keys(np.array([board.key()]))
+            symmetry = int(symmetries[0])
+            position = [int(canonical[0])]
+        digest = hashlib.blake2b(
+            json.dumps(position).encode() + settings, digest_size=8
+        ).digest()
+        return int.from_bytes(digest, "little", signed=True), symmetry
+
+    def _bucket(self, key: int) -> np.ndarray:
+        # Fibonacci hashing spreads the structured keys over the buckets
+        index = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 20
+        return self.slots[index % len(self.slots)]
+
+    def lookup(
+        self,
+        board: Board,
+        depth: int,
+        possible_moves: list[Any],
+        settings: bytes = b"",
+    ) -> Optional[tuple[Any, float]]:
+        """Look up a search of the position at least as deep as `depth`.
+
+        Args:
+            board (Board): The board to search.
+            depth (int): The depth of the search.
+            possible_moves (list[Any]): The legal moves of the board.
+            settings (bytes, optional): The settings of the search. Defaults to b"".
+
+        Returns:
+            Optional[tuple[Any, float]]: The best move and its value, or None if the
+                cache holds no search deep enough with the same settings.
+        """
+        self.n_lookups += 1
+        key, symmetry = self.position_key(board, settings)
+        with self._locked(exclusive=False):
+            bucket = self._bucket(key)
+            matches = np.flatnonzero((bucket["key"] == key) & (bucket["depth"] > 0))
+            if len(matches) == 0:
+                return None
+            entry = bucket[matches[0]].copy()
+
+        if entry["depth"] < depth:
+            return None
+        move = decode_move(
+            board, possible_moves, entry["source"], entry["target"], symmetry
+        )
+        if move is None:
+            return None
+        self.n_hits += 1
+        return move, float(entry["value"])
+
+    def store(
+        self,
+        board: Board,
+        depth: int,
+        move: Any,
+        value: float,
+        settings: bytes = b"",
+    ):
+        """Store the result of a search, keeping the deepest search of each position.
+
+        Args:
+            board (Board): The board that was searched.
+            depth (int): The depth of the search.
+            move (Any): The best move found.
+            value (float): The value of the search.
+            settings (bytes, optional): The settings of the search. Defaults to b"".
+        """
+        if move is None or depth <= 0:
+            return
+        key, symmetry = self.position_key(board, settings)
+        source, target = encode_move(board, move, symmetry)
+        with self._locked(exclusive=True):
+            bucket = self._bucket(key)
+            matches = np.flatnonzero(bucket["key"] == key)
+            if len(matches) > 0:
+                slot = matches[0]
+                if bucket["depth"][slot] > depth:
+                    return
+            else:
+                # Empty slots have depth 0, so they are taken first
+                slot = np.lexsort((bucket["stamp"], bucket["depth"]))[0]
+            bucket[slot] = (
+                key,
+                value,
+                int(time.time()),
+                min(depth, 255),
+                source,
+                target,
+                0,
+            )
@@ -1,442 +1,1773 @@
-from src.game_env.board import Board
-from src.globals import (
-    NODE_LOOKUP,
-    TRAINING_PARAMETERS,
-    EVALUATION_COEFFICIENTS,
-    Player,
-    Phase,
-    Action,
-)
-from typing import Optional, Any
-import numpy as np
-import dataclasses as dc
-from copy import deepcopy
-from src.game_env.node import Node
-from multiprocessing import Pool, cpu_count
-from abc import ABC
-import signal
-import time
-
-
-@dc.dataclass
-class AutonomousAgent(ABC):
-    """Class to represent an autonomous agent."""
-
-    render_steps: int = 30
-
-    @staticmethod
-    def init_worker():
-        signal.signal(signal.SIGINT, signal.SIG_IGN)
-
-    @staticmethod
-    def generate_possible_moves(board: Board) -> list[tuple[int | None, "Node", int]]:
-        """Method to generate all possible moves for the agent.
-
-        Args:
-            board (Board): The board to generate moves for.
-
-        Returns:
-            list[tuple[int | None, Node, int]]: The list of possible moves.
-        """
-        generated_moves = []
-
-        if board.phase == Phase.placing:
-            piece_to_place = [
-                piece for piece in board.pieces[board.turn] if piece.first_move
-            ][0]
-
-            if board.available_nodes is not None:
-                for node in board.available_nodes:
-                    legality = piece_to_place.check_legal_move(
-                        board=board, new_node=node, just_check=True
-                    )
-                    if legality in [Action.move, Action.remove]:
-                        generated_moves.append((piece_to_place.id, node, legality))
-
-        elif board.phase == Phase.moving:
-            for piece in board.pieces[board.turn]:
-                for node in (
-                    NODE_LOOKUP[piece.piece.node]
-                    if len(board.pieces[board.turn]) > 3
-                    else board.available_nodes
-                ):  # type: ignore
-                    legality = piece.check_legal_move(
-                        board=board, new_node=node, just_check=True
-                    )
-                    if legality in [Action.move, Action.remove]:
-                        generated_moves.append((piece.id, node, legality))
-
-        elif board.phase == Phase.capturing:
-            other_turn = Player.orange if board.turn == Player.white else Player.white
-            for piece in board.pieces[other_turn]:
-                if not piece.first_move:
-                    if piece.removable(board):
-                        generated_moves.append((None, piece.piece.node, Action.remove))
-
-        return generated_moves
-
-    def make_move(
-        self, board: Board, move: tuple[int | None, "Node", int], render: bool = True
-    ) -> Optional[bool]:
-        """Method to make a move on the board.
-
-        Args:
-            board (Board): The board to make the move on.
-            move (tuple[int | None, Node, int]): The move to make.
-            render (bool, optional): Whether to render the move. Defaults to True.
-
-        Returns:
-            Optional[bool]: Whether a piece was removed.
-        """
-
-        if not move:
-            board.winner = Player.orange if board.turn == Player.white else Player.white
-            return
-
-        moved_piece_id, move_node, _ = move
-        moved_piece = (
-            [piece for piece in board.pieces[board.turn] if piece.id == moved_piece_id][
-                0
-            ]
-            if moved_piece_id is not None
-            else None
-        )
-        other_turn = Player.orange if board.turn == Player.white else Player.white
-        if moved_piece is not None:
-            backup_start_node = deepcopy(moved_piece.piece.node)
-
-            if render:
-                start_node = deepcopy(moved_piece.piece.node)
-                end_node = deepcopy(move_node)
-                vector = end_node - start_node
-                current_node = deepcopy(start_node)
-
-                # Simulate move
-                for i in range(self.render_steps):
-                    current_node = Node.from_coords(
-                        start_node.x + vector[0] / self.render_steps * (i + 1),
-                        start_node.y + vector[1] / self.render_steps * (i + 1),
-                    )
-                    moved_piece.piece.node = current_node
-                    time.sleep(0.02)
-            moved_piece.piece.node = backup_start_node
-            move_result = moved_piece.move(move_node, board)
-
-            if move_result == Action.remove:
-                board.phase = Phase.capturing
-            else:
-                board.turn = other_turn
-        else:
-            captured_piece = [
-                piece
-                for piece in board.pieces[other_turn]
-                if piece.piece.node == move_node
-            ][0]
-
-            if board.available_nodes is None:
-                return False
-            captured_piece.remove_mill_containing_piece(board)
-            board.pieces[other_turn].remove(captured_piece)
-            board.available_nodes.append(move_node)
-            board.phase = board.latest_phase
-            board.turn = other_turn
-            return True
-
-        return False
-
-
-@dc.dataclass
-class MinMaxAgent(AutonomousAgent):
-    """Class to represent a MinMax agent.
-
-    Args:
-        max_n_samples (int): The maximum number of samples to consider.
-    """
-
-    max_n_samples: int = 10000
-
-    @staticmethod
-    def evaluate(
-        board: Board,
-        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
-        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
-        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
-    ) -> float:
-        """Method to evaluate the board state.
-
-        Args:
-            board (Board): The board to evaluate
-            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
-            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
-            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
-
-        Returns:
-            float: The evaluation of the board state.
-        """
-
-        game_phase = "placing"
-        if board.started_moving:
-            game_phase = "moving"
-            if len(board.pieces[board.turn]) <= 3:
-                game_phase = "flying"
-
-        coefs = evaluation_coefficients[game_phase]
-
-        sparsity_eval = 0
-        for player in [Player.orange, Player.white]:
-            for piece in board.pieces[player]:
-                if len(board.pieces[player]) > 3:
-                    if board.available_nodes is None:
-                        continue
-                    availables = [
-                        node
-                        for node in node_lookup[piece.piece.node]
-                        if node in board.available_nodes
-                    ]
-                    sparsity_eval += (
-                        len(availables)
-                        if player == Player.orange
-                        else -len(availables)
-                    )
-
-        sparsity_eval = sparsity_eval / 24.0  # in the range [-1, 1]
-        n_pieces_eval = (
-            len(board.pieces[Player.orange]) - len(board.pieces[Player.white])
-        ) / 9.0  # in the range [-1, 1]
-
-        if board.started_moving:
-            if len(board.pieces[Player.orange]) <= 2:
-                return -np.inf
-            if len(board.pieces[Player.white]) <= 2:
-                return np.inf
-
-        if board.current_mills is None or board.piece_mapping is None:
-            return 0
-        
-        white_mills = [
-            mill
-            for mill in board.current_mills
-            if board.piece_mapping[mill[0][0]].piece.player == Player.white
-        ]
-        orange_mills = [
-            mill
-            for mill in board.current_mills
-            if board.piece_mapping[mill[0][0]].piece.player == Player.orange
-        ]
-        n_mills_eval = (
-            len(orange_mills) - len(white_mills)
-        ) / 4.0  # in the range [-1, 1]
-
-        entropy = 0
-        if training_parameters["STUPIDITY"] > 0:
-            entropy = (
-                np.random.normal(0, training_parameters["STUPIDITY"])
-                / training_parameters["STUPIDITY"]
-            )  # in the range [-1, 1]
-
-        return (
-            coefs["sparsity"] * sparsity_eval
-            + coefs["n_pieces"] * n_pieces_eval
-            + coefs["n_mills"] * n_mills_eval
-            + coefs["entropy"] * entropy
-        )
-
-    def minimax(
-        self,
-        board: Board,
-        depth: int,
-        alpha: float,
-        beta: float,
-        fanning: Optional[int] = None,
-        cumulative_n_samples: int = 1,
-        multicore: int = 1,
-        first_call: bool = True,
-        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
-        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
-        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
-    ) -> tuple[Any, float]:
-        """Method to perform the minimax algorithm.
-
-        Args:
-            board (Board): The board to perform the minimax on.
-            depth (int): The depth to perform the minimax to.
-            alpha (float): The alpha value.
-            beta (float): The beta value.
-            fanning (Optional[int], optional): The number of samples to consider. Defaults to None.
-            cumulative_n_samples (int, optional): The cumulative number of samples. Defaults to 1.
-            multicore (int, optional): The number of cores to use. Defaults to 1.
-            first_call (bool, optional): Whether it is the first call. Defaults to True.
-            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
-            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
-            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
-
-        Returns:
-            tuple[int | None, float]: The best move and its value.
-        """
-
-        board.update_draggable_pieces()
-        if depth == 0 or board.game_over:
-            return None, self.evaluate(
-                board, evaluation_coefficients, training_parameters, node_lookup
-            )
-
-        maximizing_player = board.turn == Player.orange
-
-        possible_moves = self.generate_possible_moves(board)
-        next_n_fanning = None
-        if (
-            fanning
-            and fanning > 0
-            and (
-                len(board.pieces[Player.orange]) <= 3
-                or len(board.pieces[Player.white]) <= 3
-            )
-        ):
-            fanning = int(depth * fanning)
-
-            if first_call:
-                fanning = len(possible_moves)
-
-            n_samples = min(
-                len(possible_moves),
-                fanning,
-            )
-
-            cumulative_n_samples *= n_samples
-
-            if depth > 1 and n_samples > 0:
-                next_n_fanning = int(
-                    np.exp(
-                        np.log(self.max_n_samples / cumulative_n_samples) / (depth - 1)
-                    )
-                )
-
-            samples_idx = np.random.choice(
-                len(possible_moves), n_samples, replace=False
-            )
-            possible_moves = [possible_moves[i] for i in samples_idx]
-
-        if len(possible_moves) == 0:
-            return None, float("-inf") if maximizing_player else float("inf")
-
-        extreme_value = float("-inf") if maximizing_player else float("inf")
-        best_move = None
-        if multicore == 1 or depth < 4 or len(possible_moves) / cpu_count() < 0.5:
-            for move in possible_moves:
-                best_move, extreme_value, alpha, beta = self._check_single_move(
-                    board=board,
-                    move=move,
-                    depth=depth,
-                    extreme_value=extreme_value,
-                    alpha=alpha,
-                    beta=beta,
-                    maximizing_player=maximizing_player,
-                    next_n_fanning=next_n_fanning,
-                    cumulative_n_samples=cumulative_n_samples,
-                    best_move=best_move,
-                    evaluation_coefficients=evaluation_coefficients,
-                    training_parameters=training_parameters,
-                    node_lookup=node_lookup,
-                )
-                if beta <= alpha:
-                    break
-        else:
-            with Pool(
-                cpu_count() if multicore == -1 else multicore,
-                initializer=self.init_worker,
-            ) as pool:
-                processes = [
-                    pool.apply_async(
-                        self._check_single_move,
-                        (
-                            board.ai_copy(),
-                            move,
-                            depth,
-                            extreme_value,
-                            alpha,
-                            beta,
-                            maximizing_player,
-                            next_n_fanning,
-                            cumulative_n_samples,
-                            best_move,
-                            evaluation_coefficients,
-                            training_parameters,
-                            node_lookup,
-                        ),
-                    )
-                    for move in possible_moves
-                ]
-                try:
-                    for process in processes:
-                        result = process.get()
-                        move, value, alpha, beta = result
-                        if (
-                            (maximizing_player and value > extreme_value)
-                            or (not maximizing_player and value < extreme_value)
-                            or best_move is None
-                        ):
-                            extreme_value = value
-                            best_move = move
-                        if maximizing_player:
-                            alpha = max(alpha, extreme_value)
-                        else:
-                            beta = min(beta, extreme_value)
-                        if beta <= alpha:
-                            break
-                except KeyboardInterrupt:
-                    print("Keyboard interrupt received. Stopping processes...")
-                    pool.terminate()
-                    pool.join()
-                    raise KeyboardInterrupt
-        return best_move, extreme_value
-
-    def _check_single_move(
-        self,
-        board: Board,
-        move: tuple[int | None, "Node", int],
-        depth: int,
-        extreme_value: float,
-        alpha: float,
-        beta: float,
-        maximizing_player: bool,
-        next_n_fanning: Optional[int],
-        cumulative_n_samples: int,
-        best_move: Any,
-        evaluation_coefficients: dict[str, dict[str, float]],
-        training_parameters: dict[str, Any],
-        node_lookup: dict["Node", list["Node"]],
-    ) -> tuple[Any, float, float, float]:
-        board_copy = board.ai_copy()
-        try:
-            self.make_move(board_copy, move, render=False)
-            _, value = self.minimax(
-                board_copy,
-                depth - 1,
-                alpha,
-                beta,
-                next_n_fanning,
-                cumulative_n_samples,
-                multicore=1,
-                first_call=False,
-                evaluation_coefficients=evaluation_coefficients,
-                training_parameters=training_parameters,
-                node_lookup=node_lookup,
-            )
-        except KeyboardInterrupt:
-            print("Keyboard interrupt received. Stopping processes...")
-            return best_move, extreme_value, alpha, beta
-
-        if (
-            (maximizing_player and value > extreme_value)
-            or (not maximizing_player and value < extreme_value)
-            or best_move is None
-        ):
-            extreme_value = value
-            best_move = move
-
-        if maximizing_player:
-            alpha = max(alpha, extreme_value)
-        else:
-            beta = min(beta, extreme_value)
-
-        return best_move, extreme_value, alpha, beta
+from src.game_env.board import Board
+from src.globals import (
+    NODE_INDEX,
+    NODE_LOOKUP,
+    TRAINING_PARAMETERS,
+    EVALUATION_COEFFICIENTS,
+    Player,
+    Phase,
+    Action,
+    Outcome,
+)
+from typing import TYPE_CHECKING, Callable, Optional, Any
+import numpy as np
+import dataclasses as dc
+from copy import deepcopy
+from src.game_env.node import Node
+from src.game_env.bitboard import (
+    PATTERN_FEATURES,
+    count_mills,
+    counter_pattern_features,
+    free_neighbors,
+    pattern_features,
+    popcount,
+)
+from src.game_env.symmetry import HAND, SYMMETRIES, encode_move, stabilizer
+from multiprocessing import Pool, cpu_count
+from abc import ABC
+import json
+import signal
+import threading
+import time
+
+if TYPE_CHECKING:
+    from src.agents.analysis_cache import AnalysisCache
+    from src.agents.opening_book import OpeningBook
+    from src.agents.proof_number_search import ProofNumberSolver
+    from src.game_env.tablebase import Tablebase
+
+
+class SearchInterrupted(Exception):
+    """Exception raised inside the search when it has been asked to stop."""
+
+
+# Bound types stored in the transposition table
+EXACT, LOWER_BOUND, UPPER_BOUND = 0, 1, 2
+
+# Game phases of the evaluation coefficients, indexed by `evaluation_features`
+GAME_PHASES = ["placing", "moving", "flying"]
+
+# Features weighed by the evaluation, entropy aside
+EVALUATION_FEATURES = ["sparsity", "n_pieces", "n_mills"] + PATTERN_FEATURES
+
+# Evaluation coefficients by phase, as nested tuples of items that cannot be changed
+FrozenCoefficients = tuple[tuple[str, tuple[tuple[str, float], ...]], ...]
+
+
+@dc.dataclass(frozen=True)
+class EngineConfig:
+    """Class to describe how an agent searches, fixed once the agent is created.
+
+    The coefficients are copied from EVALUATION_COEFFICIENTS when the config is
+    created, so that later changes to the globals never reach a running engine. They
+    are kept as nested tuples, which leaves the config hashable, and `coefficients`
+    hands out copies of them as dictionaries.
+
+    Args:
+        depth (int, optional): The depth of the searches. Defaults to 3.
+        fanning (Optional[int], optional): The number of moves searched at each node. Defaults to None.
+        max_nodes (Optional[int], optional): The node budget of each search. Defaults to None.
+        max_time (Optional[float], optional): The time budget of each search in seconds. Defaults to None.
+        stupidity (float, optional): The scale of the noise added to the evaluation. Defaults to 0.0.
+        n_processes (int, optional): The number of processes of each search, -1 for all the cores. Defaults to 1.
+        time_control (Optional[tuple[float, float]], optional): The seconds per game and the increment per move of the clock of the agent. Defaults to None.
+        evaluation_coefficients (dict[str, dict[str, float]] | FrozenCoefficients, optional): Coefficients replacing those of EVALUATION_COEFFICIENTS, by phase. Defaults to ().
+    """
+
+    depth: int = 3
+    fanning: Optional[int] = None
+    max_nodes: Optional[int] = None
+    max_time: Optional[float] = None
+    stupidity: float = 0.0
+    n_processes: int = 1
+    time_control: Optional[tuple[float, float]] = None
+    evaluation_coefficients: dict[str, dict[str, float]] | FrozenCoefficients = ()
+
+    def __post_init__(self):
+        overrides = dict(self.evaluation_coefficients)
+        object.__setattr__(
+            self,
+            "evaluation_coefficients",
+            tuple(
+                (
+                    phase,
+                    tuple({**coefficients, **dict(overrides.get(phase, ()))}.items()),
+                )
+                for phase, coefficients in EVALUATION_COEFFICIENTS.items()
+            ),
+        )
+
+    @classmethod
+    def from_training_parameters(cls, player: Player) -> "EngineConfig":
+        """Take a snapshot of the settings of a player in TRAINING_PARAMETERS."""
+        depth = TRAINING_PARAMETERS["DIFFICULTY"][player]  # type: ignore
+        max_nodes = TRAINING_PARAMETERS["MAX_N_OPERATIONS"]
+        return cls(
+            depth=depth,
+            # The fanning at which a full width search visits about max_nodes leaves
+            fanning=int(np.exp(np.log(max_nodes) / depth)) if max_nodes else None,  # type: ignore
+            max_nodes=max_nodes,  # type: ignore
+            stupidity=TRAINING_PARAMETERS["STUPIDITY"],  # type: ignore
+            n_processes=TRAINING_PARAMETERS["N_PROCESS"],  # type: ignore
+            time_control=TRAINING_PARAMETERS["TIME_CONTROL"],  # type: ignore
+        )
+
+    @property
+    def training_parameters(self) -> dict[str, Any]:
+        """The training parameters read by the evaluation."""
+        return {"STUPIDITY": self.stupidity}
+
+    @property
+    def coefficients(self) -> dict[str, dict[str, float]]:
+        """A copy of the evaluation coefficients, by phase."""
+        return {phase: dict(values) for phase, values in self.evaluation_coefficients}
+
+    def search_parameters(self) -> dict[str, Any]:
+        """Return the arguments of `MinMaxAgent.search`, leaving out the budgets that are not set."""
+        parameters = dict(
+            depth=self.depth,
+            multicore=self.n_processes,
+            evaluation_coefficients=self.coefficients,
+            training_parameters=self.training_parameters,
+        )
+        for name in ["fanning", "max_nodes", "max_time"]:
+            if getattr(self, name) is not None:
+                parameters[name] = getattr(self, name)
+        return parameters
+
+
+@dc.dataclass
+class AutonomousAgent(ABC):
+    """Class to represent an autonomous agent."""
+
+    render_steps: int = 30
+
+    @staticmethod
+    def init_worker():
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    @staticmethod
+    def generate_possible_moves(board: Board) -> list[tuple[int | None, "Node", int]]:
+        """Method to generate all possible moves for the agent.
+
+        Args:
+            board (Board): The board to generate moves for.
+
+        Returns:
+            list[tuple[int | None, Node, int]]: The list of possible moves.
+        """
+        generated_moves = []
+
+        if board.phase == Phase.placing:
+            piece_to_place = [
+                piece for piece in board.pieces[board.turn] if piece.first_move
+            ][0]
+
+            if board.available_nodes is not None:
+                for node in board.available_nodes:
+                    legality = piece_to_place.check_legal_move(
+                        board=board, new_node=node, just_check=True
+                    )
+                    if legality in [Action.move, Action.remove]:
+                        generated_moves.append((piece_to_place.id, node, legality))
+
+        elif board.phase == Phase.moving:
+            for piece in board.pieces[board.turn]:
+                for node in (
+                    NODE_LOOKUP[piece.piece.node]
+                    if len(board.pieces[board.turn]) > 3
+                    else board.available_nodes
+                ):  # type: ignore
+                    legality = piece.check_legal_move(
+                        board=board, new_node=node, just_check=True
+                    )
+                    if legality in [Action.move, Action.remove]:
+                        generated_moves.append((piece.id, node, legality))
+
+        elif board.phase == Phase.capturing:
+            other_turn = Player.orange if board.turn == Player.white else Player.white
+            for piece in board.pieces[other_turn]:
+                if not piece.first_move:
+                    if piece.removable(board):
+                        generated_moves.append((None, piece.piece.node, Action.remove))
+
+        return generated_moves
+
+    def make_move(
+        self, board: Board, move: tuple[int | None, "Node", int], render: bool = True
+    ) -> Optional[bool]:
+        """Method to make a move on the board.
+
+        Args:
+            board (Board): The board to make the move on.
+            move (tuple[int | None, Node, int]): The move to make.
+            render (bool, optional): Whether to render the move. Defaults to True.
+
+        Returns:
+            Optional[bool]: Whether a piece was removed.
+        """
+
+        if not move:
+            board.winner = Player.orange if board.turn == Player.white else Player.white
+            return
+
+        moved_piece_id, move_node, _ = move
+        moved_piece = (
+            [piece for piece in board.pieces[board.turn] if piece.id == moved_piece_id][
+                0
+            ]
+            if moved_piece_id is not None
+            else None
+        )
+        other_turn = Player.orange if board.turn == Player.white else Player.white
+        if moved_piece is not None:
+            backup_start_node = deepcopy(moved_piece.piece.node)
+
+            if render:
+                start_node = deepcopy(moved_piece.piece.node)
+                end_node = deepcopy(move_node)
+                vector = end_node - start_node
+                current_node = deepcopy(start_node)
+
+                # Simulate move
+                for i in range(self.render_steps):
+                    current_node = Node.from_coords(
+                        start_node.x + vector[0] / self.render_steps * (i + 1),
+                        start_node.y + vector[1] / self.render_steps * (i + 1),
+                    )
+                    moved_piece.piece.node = current_node
+                    time.sleep(0.02)
+            moved_piece.piece.node = backup_start_node
+            move_result = moved_piece.move(move_node, board)
+
+            if move_result == Action.remove:
+                board.phase = Phase.capturing
+            else:
+                board.turn = other_turn
+        else:
+            captured_piece = [
+                piece
+                for piece in board.pieces[other_turn]
+                if piece.piece.node == move_node
+            ][0]
+
+            if board.available_nodes is None:
+                return False
+            captured_piece.remove_mill_containing_piece(board)
+            board.pieces[other_turn].remove(captured_piece)
+            board.vacate(move_node, other_turn)
+            board.phase = board.latest_phase
+            board.turn = other_turn
+            return True
+
+        return False
+
+
+@dc.dataclass
+class MinMaxAgent(AutonomousAgent):
+    """Class to represent a MinMax agent.
+
+    Args:
+        max_n_samples (int): The maximum number of samples to consider.
+        max_table_size (int): The maximum number of entries in the transposition table.
+        aspiration_window (float): Half width of the window around the previous value used by `search`.
+        late_move_reductions (bool): Whether to search late quiet moves with a reduced depth first.
+        futility_pruning (bool): Whether to skip quiet moves near the leaves that cannot raise alpha.
+        reduction_min_depth (int): The minimum remaining depth at which moves are reduced.
+        n_full_depth_moves (int): The number of moves searched at full depth before reducing.
+        futility_margins (tuple[float, ...]): The margin added to the static evaluation, by remaining depth.
+        solver (Optional[ProofNumberSolver]): Solver trying to prove a win before each search after the placing phase.
+        solver_max_nodes (int): The maximum number of nodes of the solver at each search.
+        solver_share (float): The share of the node and time budgets of each search given to the solver.
+        tablebase (Optional[Tablebase]): Endgame tables ordering the moves of the positions they cover.
+        opening_book (Optional[OpeningBook]): Book whose moves are played without searching during the placing phase,
+            when they were searched at least as deep and the evaluation has no noise.
+        analysis_cache (Optional[AnalysisCache]): On-disk cache of root search results, shared with other processes and
+            keyed by the settings of the search as well as the position.
+        reduce_symmetric_moves (bool): Whether to search a single root move among the moves leading to symmetric positions.
+        batch_leaf_evaluation (bool): Whether to score the children of the nodes before the leaves with `evaluate_batch` calls.
+        leaf_batch_size (int): The number of leaves of the first `evaluate_batch` call of a node, doubled at each call.
+        eval_cache_size (int): The number of entries of the evaluation cache, rounded up to a power of two, 0 to disable it.
+        progress_callback (Optional[Callable[[dict[str, Any]], None]]): Called after each root move is searched.
+        config (Optional[EngineConfig]): The settings of the searches given by `search_parameters`.
+
+    Attributes:
+        transposition_table (dict[int, tuple[int, float, int, Any]]): Search results keyed by `Board.key`, or by
+            `Board.history_key` once pieces move,
+            stored as (depth, value, bound type, best move).
+        history_table (dict[Any, int]): Score of the moves that caused cutoffs.
+        killer_moves (dict[int, list[Any]]): Latest moves that caused cutoffs at each ply.
+        principal_line (list[Any]): The principal variation of the latest search.
+        n_nodes (int): The number of nodes visited by the running or latest search.
+        last_search_stats (dict[str, Any]): Statistics of the latest search.
+        eval_cache_hits (int): The number of evaluations read from the evaluation cache.
+        eval_cache_lookups (int): The number of evaluations looked up in the evaluation cache.
+    """
+
+    max_n_samples: int = 10000
+    max_table_size: int = 1000000
+    aspiration_window: float = 0.25
+    late_move_reductions: bool = False
+    futility_pruning: bool = False
+    reduction_min_depth: int = 3
+    n_full_depth_moves: int = 3
+    futility_margins: tuple[float, ...] = (0.1, 0.3)
+    solver: Optional["ProofNumberSolver"] = dc.field(default=None, repr=False)
+    solver_max_nodes: int = 2000
+    solver_share: float = 0.25
+    tablebase: Optional["Tablebase"] = dc.field(default=None, repr=False)
+    opening_book: Optional["OpeningBook"] = dc.field(default=None, repr=False)
+    analysis_cache: Optional["AnalysisCache"] = dc.field(default=None, repr=False)
+    reduce_symmetric_moves: bool = True
+    batch_leaf_evaluation: bool = True
+    leaf_batch_size: int = 4
+    eval_cache_size: int = 2**18
+    progress_callback: Optional[Callable[[dict[str, Any]], None]] = dc.field(
+        default=None, repr=False
+    )
+    config: Optional[EngineConfig] = None
+    transposition_table: dict[int, tuple[int, float, int, Any]] = dc.field(
+        default_factory=dict, repr=False
+    )
+    history_table: dict[Any, int] = dc.field(default_factory=dict, repr=False)
+    killer_moves: dict[int, list[Any]] = dc.field(default_factory=dict, repr=False)
+    principal_line: list[Any] = dc.field(default_factory=list, repr=False)
+    n_nodes: int = dc.field(default=0, init=False, repr=False)
+    last_search_stats: dict[str, Any] = dc.field(
+        default_factory=dict, init=False, repr=False
+    )
+    _node_budget: Optional[int] = dc.field(default=None, init=False, repr=False)
+    _deadline: Optional[float] = dc.field(default=None, init=False, repr=False)
+    _budget_exhausted: bool = dc.field(default=False, init=False, repr=False)
+    _root_best: Optional[tuple[Any, float]] = dc.field(
+        default=None, init=False, repr=False
+    )
+    _principal_keys: list[int] = dc.field(default_factory=list, init=False, repr=False)
+    _principal_value: Optional[float] = dc.field(default=None, init=False, repr=False)
+    _stop_event: threading.Event = dc.field(
+        default_factory=threading.Event, init=False, repr=False
+    )
+    _ponder_thread: Optional[threading.Thread] = dc.field(
+        default=None, init=False, repr=False
+    )
+    _ponder_key: Optional[int] = dc.field(default=None, init=False, repr=False)
+    _ponder_state: Optional[dict[str, Any]] = dc.field(
+        default=None, init=False, repr=False
+    )
+    eval_cache_hits: int = dc.field(default=0, init=False, repr=False)
+    eval_cache_lookups: int = dc.field(default=0, init=False, repr=False)
+    _eval_cache_keys: Optional[np.ndarray] = dc.field(
+        default=None, init=False, repr=False
+    )
+    _eval_cache_values: Optional[np.ndarray] = dc.field(
+        default=None, init=False, repr=False
+    )
+    _eval_cache_coefficients: Any = dc.field(default=None, init=False, repr=False)
+    _eval_cache_snapshot: Any = dc.field(default=None, init=False, repr=False)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes start with an empty search state
+        state = self.__dict__.copy()
+        state["transposition_table"] = {}
+        state["progress_callback"] = None
+        state["_stop_event"] = None
+        state["_ponder_thread"] = None
+        state["_ponder_key"] = None
+        state["_ponder_state"] = None
+        state["_eval_cache_keys"] = None
+        state["_eval_cache_values"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self._stop_event = threading.Event()
+
+    def search_parameters(self, **overrides) -> dict[str, Any]:
+        """Return the arguments of `search` given by the config of the agent.
+
+        Args:
+            **overrides: Arguments replacing those of the config.
+
+        Returns:
+            dict[str, Any]: The keyword arguments of `search`.
+        """
+        config = self.config if self.config is not None else EngineConfig()
+        return {**config.search_parameters(), **overrides}
+
+    @staticmethod
+    def evaluate(
+        board: Board,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
+        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
+    ) -> float:
+        """Method to evaluate the board state.
+
+        Args:
+            board (Board): The board to evaluate
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
+            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
+            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
+
+        Returns:
+            float: The evaluation of the board state.
+        """
+
+        game_phase = "placing"
+        if board.started_moving:
+            game_phase = "moving"
+            if len(board.pieces[board.turn]) <= 3:
+                game_phase = "flying"
+
+        coefs = evaluation_coefficients[game_phase]
+
+        sparsity_eval = 0
+        for player in [Player.orange, Player.white]:
+            if node_lookup is NODE_LOOKUP:
+                # The board keeps the number of free neighbours up to date
+                if len(board.pieces[player]) > 3:
+                    sparsity_eval += (
+                        board.free_neighbors[player]
+                        if player == Player.orange
+                        else -board.free_neighbors[player]
+                    )
+                continue
+            for piece in board.pieces[player]:
+                if len(board.pieces[player]) > 3:
+                    if board.available_nodes is None:
+                        continue
+                    availables = [
+                        node
+                        for node in node_lookup[piece.piece.node]
+                        if node in board.available_nodes
+                    ]
+                    sparsity_eval += (
+                        len(availables)
+                        if player == Player.orange
+                        else -len(availables)
+                    )
+
+        sparsity_eval = sparsity_eval / 24.0  # in the range [-1, 1]
+        n_pieces_eval = (
+            len(board.pieces[Player.orange]) - len(board.pieces[Player.white])
+        ) / 9.0  # in the range [-1, 1]
+
+        if board.started_moving:
+            if len(board.pieces[Player.orange]) <= 2:
+                return -np.inf
+            if len(board.pieces[Player.white]) <= 2:
+                return np.inf
+
+        if board.current_mills is None or board.piece_mapping is None:
+            return 0
+
+        n_mills_eval = (
+            board.n_mills[Player.orange] - board.n_mills[Player.white]
+        ) / 4.0  # in the range [-1, 1]
+
+        entropy = 0
+        if training_parameters["STUPIDITY"] > 0:
+            entropy = (
+                np.random.normal(0, training_parameters["STUPIDITY"])
+                / training_parameters["STUPIDITY"]
+            )  # in the range [-1, 1]
+
+        pattern_eval = 0.0
+        if any(coefs.get(feature, 0.0) for feature in PATTERN_FEATURES):
+            features = counter_pattern_features(
+                board.occupancy[Player.orange],
+                board.occupancy[Player.white],
+                board.mill_counters[Player.orange],
+                board.mill_counters[Player.white],
+                len(board.pieces[Player.orange]),
+                len(board.pieces[Player.white]),
+            )
+            pattern_eval = sum(
+                coefs.get(feature, 0.0) * features[feature]
+                for feature in PATTERN_FEATURES
+            )
+
+        return (
+            coefs["sparsity"] * sparsity_eval
+            + coefs["n_pieces"] * n_pieces_eval
+            + coefs["n_mills"] * n_mills_eval
+            + coefs["entropy"] * entropy
+            + pattern_eval
+        )
+
+    @staticmethod
+    def evaluation_features(
+        keys: np.ndarray, patterns: bool = True
+    ) -> tuple[np.ndarray, dict[str, np.ndarray], np.ndarray]:
+        """Method to compute the features weighed by the evaluation of many board states.
+
+        Args:
+            keys (np.ndarray): The positions to evaluate, as returned by `Board.key`.
+            patterns (bool, optional): Whether to compute the pattern features. Defaults to True.
+
+        Returns:
+            tuple[np.ndarray, dict[str, np.ndarray], np.ndarray]: The index of the game
+                phase of each position in GAME_PHASES, the features of each position and
+                its value if the game is over, +-inf, or 0 otherwise.
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        orange, white = keys & 0xFFFFFF, (keys >> 24) & 0xFFFFFF
+        orange_in_hand, white_in_hand = (keys >> 48) & 15, (keys >> 52) & 15
+        white_turn = (keys >> 56) & 1 == 1
+        empty = ~(orange | white) & 0xFFFFFF
+
+        # Pieces waiting to be placed count as one piece, as on the board
+        n_orange = popcount(orange) + (orange_in_hand > 0)
+        n_white = popcount(white) + (white_in_hand > 0)
+        started_moving = (orange_in_hand == 0) & (white_in_hand == 0)
+
+        phase_index = np.where(
+            started_moving,
+            np.where(np.where(white_turn, n_white, n_orange) <= 3, 2, 1),
+            0,
+        )
+        features = {
+            "sparsity": (
+                np.where(n_orange > 3, free_neighbors(orange, empty), 0)
+                - np.where(n_white > 3, free_neighbors(white, empty), 0)
+            )
+            / 24.0,
+            "n_pieces": (n_orange - n_white) / 9.0,
+            "n_mills": (count_mills(orange) - count_mills(white)) / 4.0,
+        }
+        if patterns:
+            features.update(pattern_features(orange, white, n_orange, n_white))
+
+        outcomes = np.zeros(len(keys))
+        outcomes[started_moving & (n_white <= 2)] = np.inf
+        outcomes[started_moving & (n_orange <= 2)] = -np.inf
+        return phase_index, features, outcomes
+
+    @staticmethod
+    def evaluate_batch(
+        keys: np.ndarray,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
+    ) -> np.ndarray:
+        """Method to evaluate many board states at once, as `evaluate` does.
+
+        Args:
+            keys (np.ndarray): The positions to evaluate, as returned by `Board.key`.
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
+            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
+
+        Returns:
+            np.ndarray: The evaluation of each board state.
+        """
+        patterns = any(
+            evaluation_coefficients[phase].get(feature, 0.0)
+            for phase in GAME_PHASES
+            for feature in PATTERN_FEATURES
+        )
+        phase_index, features, outcomes = MinMaxAgent.evaluation_features(
+            keys, patterns
+        )
+
+        values = np.zeros(len(phase_index))
+        for feature, feature_values in features.items():
+            coefs = np.array(
+                [
+                    evaluation_coefficients[phase].get(feature, 0.0)
+                    for phase in GAME_PHASES
+                ]
+            )
+            values = values + coefs[phase_index] * feature_values
+
+        if training_parameters["STUPIDITY"] > 0:
+            coefs = np.array(
+                [evaluation_coefficients[phase]["entropy"] for phase in GAME_PHASES]
+            )
+            values = values + coefs[phase_index] * (
+                np.random.normal(0, training_parameters["STUPIDITY"], len(values))
+                / training_parameters["STUPIDITY"]
+            )
+
+        over = outcomes != 0
+        values[over] = outcomes[over]
+        return values
+
+    def _cached_evaluate(
+        self,
+        board: Board,
+        evaluation_coefficients: dict[str, dict[str, float]],
+        training_parameters: dict[str, Any],
+        node_lookup: dict["Node", list["Node"]],
+    ) -> float:
+        # The evaluation only depends on the key of the position, except for the
+        # stupidity noise, which has to be drawn again at every call
+        if (
+            self.eval_cache_size <= 0
+            or training_parameters["STUPIDITY"] > 0
+            or node_lookup is not NODE_LOOKUP
+        ):
+            return self.evaluate(
+                board, evaluation_coefficients, training_parameters, node_lookup
+            )
+
+        # The coefficients are compared by identity, `search` checks once per search
+        # that they still equal those the cache was filled with
+        if (
+            self._eval_cache_keys is None
+            or self._eval_cache_coefficients is not evaluation_coefficients
+        ):
+            size = 1 << (self.eval_cache_size - 1).bit_length()
+            self._eval_cache_keys = np.full(size, -1, dtype=np.int64)
+            self._eval_cache_values = np.zeros(size, dtype=np.float64)
+            self._eval_cache_coefficients = evaluation_coefficients
+            self._eval_cache_snapshot = deepcopy(evaluation_coefficients)
+
+        key = board.key()
+        # Fibonacci hashing, the high bits of the product depend on the whole key
+        n_bits = (len(self._eval_cache_keys) - 1).bit_length()
+        index = ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> (64 - n_bits)
+        self.eval_cache_lookups += 1
+        if self._eval_cache_keys[index] == key:
+            self.eval_cache_hits += 1
+            return float(self._eval_cache_values[index])  # type: ignore
+
+        value = self.evaluate(
+            board, evaluation_coefficients, training_parameters, node_lookup
+        )
+        # A colliding entry is overwritten
+        self._eval_cache_keys[index] = key
+        self._eval_cache_values[index] = value  # type: ignore
+        return value
+
+    def minimax(
+        self,
+        board: Board,
+        depth: int,
+        alpha: float,
+        beta: float,
+        fanning: Optional[int] = None,
+        cumulative_n_samples: int = 1,
+        multicore: int = 1,
+        first_call: bool = True,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
+        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
+        ply: int = 0,
+    ) -> tuple[Any, float]:
+        """Method to perform the minimax algorithm.
+
+        Args:
+            board (Board): The board to perform the minimax on.
+            depth (int): The depth to perform the minimax to.
+            alpha (float): The alpha value.
+            beta (float): The beta value.
+            fanning (Optional[int], optional): The number of samples to consider. Defaults to None.
+            cumulative_n_samples (int, optional): The cumulative number of samples. Defaults to 1.
+            multicore (int, optional): The number of cores to use. Defaults to 1.
+            first_call (bool, optional): Whether it is the first call. Defaults to True.
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
+            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
+            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
+            ply (int, optional): The distance to the root of the search. Defaults to 0.
+
+        Returns:
+            tuple[int | None, float]: The best move and its value.
+        """
+
+        if self._stop_event.is_set():
+            raise SearchInterrupted
+        if (self._node_budget is not None and self.n_nodes >= self._node_budget) or (
+            self._deadline is not None and time.time() >= self._deadline
+        ):
+            self._budget_exhausted = True
+            raise SearchInterrupted
+        self.n_nodes += 1
+
+        board.update_draggable_pieces()
+        if depth == 0 or board.game_over:
+            return None, self._cached_evaluate(
+                board, evaluation_coefficients, training_parameters, node_lookup
+            )
+
+        maximizing_player = board.turn == Player.orange
+
+        possible_moves = self.generate_possible_moves(board)
+
+        key = board.key()
+        table_key = self._table_key(board)
+        alpha_orig, beta_orig = alpha, beta
+        entry = self.transposition_table.get(table_key)
+        entry_move = None
+        if entry is not None:
+            entry_depth, entry_value, entry_flag, entry_move = entry
+            if entry_depth >= depth and (
+                not first_call or entry_move in possible_moves
+            ):
+                if (
+                    entry_flag == EXACT
+                    or (entry_flag == LOWER_BOUND and entry_value >= beta)
+                    or (entry_flag == UPPER_BOUND and entry_value <= alpha)
+                ):
+                    return entry_move, entry_value
+        possible_moves = self._order_moves(possible_moves, ply, entry_move)
+        if self.tablebase is not None:
+            possible_moves = self._order_by_tablebase(board, possible_moves, entry_move)
+        if first_call and self.reduce_symmetric_moves:
+            possible_moves = self._reduce_symmetric_moves(board, possible_moves)
+
+        next_n_fanning = None
+        reserve_moves = []
+        if (
+            fanning
+            and fanning > 0
+            and (
+                len(board.pieces[Player.orange]) <= 3
+                or len(board.pieces[Player.white]) <= 3
+            )
+        ):
+            fanning = int(depth * fanning)
+
+            if first_call:
+                fanning = len(possible_moves)
+
+            n_samples = min(
+                len(possible_moves),
+                fanning,
+            )
+
+            cumulative_n_samples *= n_samples
+
+            if depth > 1 and n_samples > 0:
+                next_n_fanning = max(
+                    1,
+                    int(
+                        np.exp(
+                            np.log(self.max_n_samples / cumulative_n_samples)
+                            / (depth - 1)
+                        )
+                    ),
+                )
+
+            if n_samples < len(possible_moves):
+                # Keep the most promising moves, the others are only searched when widening
+                possible_moves = self._rank_moves(
+                    board,
+                    possible_moves,
+                    ply,
+                    entry_move,
+                    maximizing_player,
+                    evaluation_coefficients,
+                    training_parameters,
+                    node_lookup,
+                )
+                reserve_moves = possible_moves[n_samples:]
+                possible_moves = possible_moves[:n_samples]
+
+        if len(possible_moves) == 0:
+            return None, float("-inf") if maximizing_player else float("inf")
+
+        extreme_value = float("-inf") if maximizing_player else float("inf")
+        best_move = None
+        futility_value = None
+        if (
+            self.futility_pruning
+            and not first_call
+            and depth <= len(self.futility_margins)
+        ):
+            static_value = self._cached_evaluate(
+                board, evaluation_coefficients, training_parameters, node_lookup
+            )
+            if np.isfinite(static_value):
+                margin = self.futility_margins[depth - 1]
+                futility_value = (
+                    static_value + margin
+                    if maximizing_player
+                    else static_value - margin
+                )
+
+        if (
+            self.batch_leaf_evaluation
+            and depth == 1
+            and not first_call
+            and node_lookup is NODE_LOOKUP
+            and (
+                self._node_budget is None
+                or self.n_nodes + len(possible_moves) <= self._node_budget
+            )
+        ):
+            # The first move, the most likely to cause a cutoff, is searched alone.
+            # The other leaves are scored together instead of one minimax call
+            # each, in chunks of doubling size with a cutoff test between them.
+            best_move, extreme_value, alpha, beta = self._check_single_move(
+                board=board,
+                move=possible_moves[0],
+                depth=depth,
+                extreme_value=extreme_value,
+                alpha=alpha,
+                beta=beta,
+                maximizing_player=maximizing_player,
+                next_n_fanning=next_n_fanning,
+                cumulative_n_samples=cumulative_n_samples,
+                best_move=best_move,
+                evaluation_coefficients=evaluation_coefficients,
+                training_parameters=training_parameters,
+                node_lookup=node_lookup,
+                ply=ply,
+            )
+
+            def futile() -> bool:
+                # The quiet moves cannot raise the bound, as in the loop below
+                return futility_value is not None and (
+                    futility_value <= alpha
+                    if maximizing_player
+                    else futility_value >= beta
+                )
+
+            start, chunk_size = 1, self.leaf_batch_size
+            while beta > alpha and start < len(possible_moves):
+                chunk = possible_moves[start : start + chunk_size]
+                start += len(chunk)
+                chunk_size *= 2
+                if futile():
+                    chunk = [move for move in chunk if move[2] != Action.move]
+                    if not chunk:
+                        continue
+                keys = [self._child_key(board, key, move) for move in chunk]
+                self.n_nodes += len(keys)
+                values = self.evaluate_batch(
+                    np.array(keys), evaluation_coefficients, training_parameters
+                )
+                # The values are taken in order, so that the bounds and the pruning
+                # are those of the loop below
+                for move, value in zip(chunk, values.tolist()):
+                    if move[2] == Action.move and futile():
+                        continue
+                    if (maximizing_player and value > extreme_value) or (
+                        not maximizing_player and value < extreme_value
+                    ):
+                        best_move, extreme_value = move, value
+                    if maximizing_player:
+                        alpha = max(alpha, extreme_value)
+                    else:
+                        beta = min(beta, extreme_value)
+                    if beta <= alpha:
+                        break
+            if beta <= alpha:
+                self._record_cutoff(best_move, depth, ply)
+        elif multicore == 1 or depth < 4 or len(possible_moves) / cpu_count() < 0.5:
+            for i, move in enumerate(possible_moves):
+                # Moves that neither form a mill nor capture
+                quiet = move[2] == Action.move
+                if (
+                    quiet
+                    and best_move is not None
+                    and futility_value is not None
+                    and (
+                        futility_value <= alpha
+                        if maximizing_player
+                        else futility_value >= beta
+                    )
+                ):
+                    continue
+
+                reduction = 0
+                if (
+                    self.late_move_reductions
+                    and quiet
+                    and not first_call
+                    and depth >= self.reduction_min_depth
+                    and i >= self.n_full_depth_moves
+                ):
+                    reduction = 1
+
+                best_move, extreme_value, alpha, beta = self._check_single_move(
+                    board=board,
+                    move=move,
+                    depth=depth,
+                    extreme_value=extreme_value,
+                    alpha=alpha,
+                    beta=beta,
+                    maximizing_player=maximizing_player,
+                    next_n_fanning=next_n_fanning,
+                    cumulative_n_samples=cumulative_n_samples,
+                    best_move=best_move,
+                    evaluation_coefficients=evaluation_coefficients,
+                    training_parameters=training_parameters,
+                    node_lookup=node_lookup,
+                    ply=ply,
+                    reduction=reduction,
+                )
+                if first_call:
+                    self._root_best = (best_move, extreme_value)
+                    self._report_progress(
+                        depth, i + 1, len(possible_moves), best_move, extreme_value
+                    )
+                if beta <= alpha:
+                    self._record_cutoff(move, depth, ply)
+                    break
+                if i == len(possible_moves) - 1 and reserve_moves and best_move == move:
+                    # The lowest ranked move kept is the best so far, so the ranking
+                    # is not trusted and the next move is searched as well
+                    possible_moves.append(reserve_moves.pop(0))
+        else:
+            node_budget = None
+            if self._node_budget is not None:
+                # Each worker gets an equal share of the remaining budget
+                node_budget = max(
+                    1, (self._node_budget - self.n_nodes) // len(possible_moves)
+                )
+            # The agent and the evaluation settings are sent once to each worker,
+            # the tasks only carry the moves to search
+            with Pool(
+                cpu_count() if multicore == -1 else multicore,
+                initializer=_init_search_worker,
+                initargs=(
+                    self,
+                    evaluation_coefficients,
+                    training_parameters,
+                    node_lookup,
+                ),
+            ) as pool:
+                processes = [
+                    pool.apply_async(
+                        _search_move,
+                        (
+                            node_budget,
+                            self._deadline,
+                            board.ai_copy(),
+                            move,
+                            depth,
+                            extreme_value,
+                            alpha,
+                            beta,
+                            maximizing_player,
+                            next_n_fanning,
+                            cumulative_n_samples,
+                            best_move,
+                            ply,
+                        ),
+                    )
+                    for move in possible_moves
+                ]
+                try:
+                    for i, process in enumerate(processes):
+                        if self._stop_event.is_set():
+                            raise SearchInterrupted
+                        result, n_nodes = process.get()
+                        self.n_nodes += n_nodes
+                        if result is None:
+                            self._budget_exhausted = True
+                            continue
+                        move, value, alpha, beta = result
+                        if (
+                            (maximizing_player and value > extreme_value)
+                            or (not maximizing_player and value < extreme_value)
+                            or best_move is None
+                        ):
+                            extreme_value = value
+                            best_move = move
+                        if maximizing_player:
+                            alpha = max(alpha, extreme_value)
+                        else:
+                            beta = min(beta, extreme_value)
+                        if first_call:
+                            self._root_best = (best_move, extreme_value)
+                            self._report_progress(
+                                depth, i + 1, len(processes), best_move, extreme_value
+                            )
+                        if beta <= alpha:
+                            break
+                except KeyboardInterrupt:
+                    print("Keyboard interrupt received. Stopping processes...")
+                    pool.terminate()
+                    pool.join()
+                    raise KeyboardInterrupt
+            if best_move is None and self._budget_exhausted:
+                raise SearchInterrupted
+
+        if extreme_value <= alpha_orig:
+            flag = UPPER_BOUND
+        elif extreme_value >= beta_orig:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        if len(self.transposition_table) >= self.max_table_size:
+            self.transposition_table.clear()
+        if not self._budget_exhausted:
+            self.transposition_table[table_key] = (
+                depth,
+                extreme_value,
+                flag,
+                best_move,
+            )
+
+        return best_move, extreme_value
+
+    def search(
+        self,
+        board: Board,
+        depth: int,
+        fanning: Optional[int] = None,
+        multicore: int = 1,
+        max_nodes: Optional[int] = None,
+        max_time: Optional[float] = None,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
+        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
+    ) -> tuple[Any, float]:
+        """Method to search the best move, reusing the state of the previous searches.
+
+        When the game followed the principal variation of the previous search, the rest
+        of the line is searched first and the search starts with an aspiration window
+        around the previous value. When the node or time budget runs out, the best root
+        move searched so far is returned. The number of visited nodes is stored in
+        `last_search_stats`.
+
+        Args:
+            board (Board): The board to search.
+            depth (int): The depth of the search.
+            fanning (Optional[int], optional): The number of samples to consider. Defaults to None.
+            multicore (int, optional): The number of cores to use. Defaults to 1.
+            max_nodes (Optional[int], optional): The maximum number of nodes to visit. Defaults to None.
+            max_time (Optional[float], optional): The maximum search time in seconds. Defaults to None.
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
+            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
+            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
+
+        Returns:
+            tuple[int | None, float]: The best move and its value.
+        """
+        board.update_draggable_pieces()
+        search_start_time = time.time()
+        solver_nodes = 0
+        if self.solver is not None and board.started_moving:
+            # The solver spends a share of the budgets of the search, which are
+            # charged with its nodes and its time
+            solver_max_nodes = self.solver_max_nodes
+            if max_nodes is not None:
+                solver_max_nodes = min(
+                    solver_max_nodes, max(1, int(self.solver_share * max_nodes))
+                )
+            proven, line = self.solver.prove(
+                board,
+                board.turn,
+                max_nodes=solver_max_nodes,
+                deadline=(
+                    search_start_time + self.solver_share * max_time
+                    if max_time is not None
+                    else None
+                ),
+            )
+            solver_nodes = self.solver.n_nodes
+            if proven and line:
+                # A forced win needs no heuristic search
+                value = float("inf") if board.turn == Player.orange else float("-inf")
+                self.last_search_stats = dict(
+                    depth=depth,
+                    n_nodes=solver_nodes,
+                    max_nodes=max_nodes,
+                    budget_exhausted=False,
+                    time=time.time() - search_start_time,
+                    solved=True,
+                )
+                self.principal_line = line
+                self._principal_keys = []
+                self._principal_value = value
+                return line[0], value
+
+        if (
+            self.opening_book is not None
+            and not board.started_moving
+            and training_parameters["STUPIDITY"] == 0
+        ):
+            start_time = time.time()
+            book_entry = self.opening_book.lookup(
+                board,
+                self.generate_possible_moves(board),
+                depth,
+                evaluation_coefficients,
+            )
+            if book_entry is not None:
+                # The book move was searched offline at least as deep as this search,
+                # with the same coefficients
+                self.last_search_stats = dict(
+                    depth=depth,
+                    n_nodes=0,
+                    max_nodes=max_nodes,
+                    budget_exhausted=False,
+                    time=time.time() - start_time,
+                    book=True,
+                )
+                self.principal_line = []
+                self._principal_keys = []
+                self._principal_value = None
+                return book_entry
+
+        if self.analysis_cache is not None:
+            start_time = time.time()
+            analysis_settings = self._analysis_settings(
+                fanning, evaluation_coefficients, training_parameters
+            )
+            cached = self.analysis_cache.lookup(
+                board, depth, self.generate_possible_moves(board), analysis_settings
+            )
+            if cached is not None:
+                self.last_search_stats = dict(
+                    depth=depth,
+                    n_nodes=0,
+                    max_nodes=max_nodes,
+                    budget_exhausted=False,
+                    time=time.time() - start_time,
+                    cached=True,
+                )
+                self.principal_line = []
+                self._principal_keys = []
+                self._principal_value = None
+                return cached
+
+        key = board.key()
+        alpha, beta = float("-inf"), float("inf")
+
+        if key in self._principal_keys:
+            shift = self._principal_keys.index(key)
+            self.principal_line = self.principal_line[shift:]
+            self.killer_moves = {
+                ply - shift: moves
+                for ply, moves in self.killer_moves.items()
+                if ply >= shift
+            }
+            if self._principal_value is not None and np.isfinite(self._principal_value):
+                alpha = self._principal_value - self.aspiration_window
+                beta = self._principal_value + self.aspiration_window
+        else:
+            self.principal_line = []
+            self.killer_moves = {}
+        self.history_table = {
+            move: score // 2 for move, score in self.history_table.items() if score > 1
+        }
+
+        search_kwargs = dict(
+            fanning=fanning,
+            multicore=multicore,
+            evaluation_coefficients=evaluation_coefficients,
+            training_parameters=training_parameters,
+            node_lookup=node_lookup,
+        )
+        if self._eval_cache_keys is not None:
+            if self._eval_cache_snapshot != evaluation_coefficients:
+                # The coefficients changed, maybe in place, since the cache was filled
+                self._eval_cache_keys = None
+            else:
+                # Equal coefficients, such as the copies given by a config, share it
+                self._eval_cache_coefficients = evaluation_coefficients
+        start_time = search_start_time
+        self.n_nodes = solver_nodes
+        self._node_budget = max_nodes
+        self._deadline = start_time + max_time if max_time is not None else None
+        self._budget_exhausted = False
+        self._root_best = None
+        try:
+            best_move, value = self.minimax(board, depth, alpha, beta, **search_kwargs)  # type: ignore
+            if (alpha, beta) != (float("-inf"), float("inf")) and (
+                value <= alpha or value >= beta
+            ):
+                # The value fell outside of the aspiration window
+                best_move, value = self.minimax(
+                    board,
+                    depth,
+                    float("-inf"),
+                    float("inf"),
+                    **search_kwargs,  # type: ignore
+                )
+        except SearchInterrupted:
+            if not self._budget_exhausted:
+                raise
+            best_move, value = self._root_best or self._fallback_move(
+                board, evaluation_coefficients, training_parameters, node_lookup
+            )
+        finally:
+            self._node_budget = None
+            self._deadline = None
+
+        self.last_search_stats = dict(
+            depth=depth,
+            n_nodes=self.n_nodes,
+            max_nodes=max_nodes,
+            budget_exhausted=self._budget_exhausted,
+            time=time.time() - start_time,
+        )
+        if self.analysis_cache is not None and not self._budget_exhausted:
+            self.analysis_cache.store(board, depth, best_move, value, analysis_settings)
+        self.principal_line, self._principal_keys = self._follow_principal_variation(
+            board, max_length=depth
+        )
+        self._principal_value = value
+        return best_move, value
+
+    def analyze(
+        self,
+        board: Board,
+        depth: int,
+        n_principal_variations: int = 3,
+        fanning: Optional[int] = None,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
+        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
+    ) -> list[tuple[Any, float, list[Any]]]:
+        """Method to search the best moves of the position with their exact values.
+
+        Each root move is searched with a window starting at the value of the k-th best
+        move so far, first with a null window, so that the moves outside of the top k
+        only cost a cheap refutation.
+
+        Args:
+            board (Board): The board to analyze.
+            depth (int): The depth of the search.
+            n_principal_variations (int, optional): The number of moves to rank. Defaults to 3.
+            fanning (Optional[int], optional): The number of samples to consider. Defaults to None.
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
+            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
+            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
+
+        Returns:
+            list[tuple[Any, float, list[Any]]]: The best moves, best first, with their
+                value and their principal variation starting with the move.
+        """
+        board.update_draggable_pieces()
+        maximizing_player = board.turn == Player.orange
+        entry = self.transposition_table.get(self._table_key(board))
+        possible_moves = self._order_moves(
+            self.generate_possible_moves(board), 0, entry[3] if entry else None
+        )
+        if self.reduce_symmetric_moves:
+            possible_moves = self._reduce_symmetric_moves(board, possible_moves)
+
+        search_kwargs = dict(
+            fanning=fanning,
+            first_call=False,
+            evaluation_coefficients=evaluation_coefficients,
+            training_parameters=training_parameters,
+            node_lookup=node_lookup,
+            ply=1,
+        )
+        start_time = time.time()
+        self.n_nodes = 0
+        self._budget_exhausted = False
+        ranked = []
+        for move in possible_moves:
+            board_copy = board.ai_copy()
+            self.make_move(board_copy, move, render=False)
+
+            alpha, beta = float("-inf"), float("inf")
+            if len(ranked) == n_principal_variations:
+                # Only the moves better than the k-th best need an exact value
+                bound = ranked[-1][1]
+                if maximizing_player:
+                    alpha = bound
+                    null_window = (bound, np.nextafter(bound, np.inf))
+                else:
+                    beta = bound
+                    null_window = (np.nextafter(bound, -np.inf), bound)
+                if np.isfinite(bound):
+                    _, value = self.minimax(
+                        board_copy, depth - 1, *null_window, **search_kwargs
+                    )  # type: ignore
+                    if value <= bound if maximizing_player else value >= bound:
+                        continue
+
+            _, value = self.minimax(board_copy, depth - 1, alpha, beta, **search_kwargs)  # type: ignore
+            if len(ranked) == n_principal_variations and (
+                value <= alpha if maximizing_player else value >= beta
+            ):
+                continue
+            ranked.append((move, value))
+            ranked.sort(key=lambda result: result[1], reverse=maximizing_player)
+            del ranked[n_principal_variations:]
+
+        analysis = []
+        for move, value in ranked:
+            board_copy = board.ai_copy()
+            self.make_move(board_copy, move, render=False)
+            line, _ = self._follow_principal_variation(board_copy, depth - 1)
+            analysis.append((move, value, [move] + line))
+
+        self.last_search_stats = dict(
+            depth=depth,
+            n_nodes=self.n_nodes,
+            max_nodes=None,
+            budget_exhausted=False,
+            time=time.time() - start_time,
+            n_principal_variations=len(analysis),
+        )
+        return analysis
+
+    def _fallback_move(
+        self,
+        board: Board,
+        evaluation_coefficients: dict[str, dict[str, float]],
+        training_parameters: dict[str, Any],
+        node_lookup: dict["Node", list["Node"]],
+    ) -> tuple[Any, float]:
+        # Best guess when the budget ran out before a root move was searched
+        entry = self.transposition_table.get(self._table_key(board))
+        moves = self._order_moves(
+            self.generate_possible_moves(board), 0, entry[3] if entry else None
+        )
+        value = self.evaluate(
+            board, evaluation_coefficients, training_parameters, node_lookup
+        )
+        return (moves[0] if moves else None), value
+
+    def principal_variation(
+        self, board: Board, max_length: int = 10
+    ) -> list[tuple[int | None, "Node", int]]:
+        """Method to read the principal variation from the transposition table.
+
+        Args:
+            board (Board): The board to start from.
+            max_length (int, optional): The maximum number of moves to read. Defaults to 10.
+
+        Returns:
+            list[tuple[int | None, Node, int]]: The expected moves, starting with the move to play on `board`.
+        """
+        return self._follow_principal_variation(board, max_length)[0]
+
+    def _analysis_settings(
+        self,
+        fanning: Optional[int],
+        evaluation_coefficients: dict[str, dict[str, float]],
+        training_parameters: dict[str, Any],
+    ) -> bytes:
+        """Describe everything besides the position that decides the result of a search.
+
+        The budgets are left out, since only the searches that complete are stored, and
+        so is the depth, which the cache stores with each entry to reuse deeper searches.
+
+        Returns:
+            bytes: The settings, as given to the analysis cache.
+        """
+        settings = dict(
+            fanning=fanning,
+            stupidity=training_parameters["STUPIDITY"],
+            evaluation_coefficients=evaluation_coefficients,
+            max_n_samples=self.max_n_samples,
+            aspiration_window=self.aspiration_window,
+            late_move_reductions=self.late_move_reductions,
+            futility_pruning=self.futility_pruning,
+            reduction_min_depth=self.reduction_min_depth,
+            n_full_depth_moves=self.n_full_depth_moves,
+            futility_margins=list(self.futility_margins),
+            reduce_symmetric_moves=self.reduce_symmetric_moves,
+        )
+        return json.dumps(settings, sort_keys=True).encode()
+
+    @staticmethod
+    def _table_key(board: Board) -> int:
+        # Once pieces move, positions with the same key can differ in the mills that
+        # can be formed again, and so in their captures and their values
+        return board.history_key() if board.started_moving else board.key()
+
+    def _follow_principal_variation(
+        self, board: Board, max_length: int
+    ) -> tuple[list[tuple[int | None, "Node", int]], list[int]]:
+        board_copy = board.ai_copy()
+        line = []
+        keys = []
+        for _ in range(max_length):
+            board_copy.update_draggable_pieces()
+            key = board_copy.key()
+            keys.append(key)
+            if board_copy.game_over or keys.count(key) > 1:
+                break
+            entry = self.transposition_table.get(self._table_key(board_copy))
+            if entry is None:
+                break
+            move = entry[3]
+            if move not in self.generate_possible_moves(board_copy):
+                break
+            line.append(move)
+            self.make_move(board_copy, move, render=False)
+        else:
+            board_copy.update_draggable_pieces()
+            keys.append(board_copy.key())
+        return line, keys
+
+    def _order_moves(
+        self,
+        moves: list[tuple[int | None, "Node", int]],
+        ply: int,
+        table_move: Any = None,
+    ) -> list[tuple[int | None, "Node", int]]:
+        principal_move = (
+            self.principal_line[ply] if ply < len(self.principal_line) else None
+        )
+        killers = self.killer_moves.get(ply, [])
+
+        def score(move: tuple[int | None, "Node", int]) -> float:
+            if move == table_move:
+                return 4e9
+            if move == principal_move:
+                return 3e9
+            if move in killers:
+                return 2e9
+            return (1e9 if move[2] == Action.remove else 0) + self.history_table.get(
+                move, 0
+            )
+
+        return sorted(moves, key=score, reverse=True)
+
+    def _order_by_tablebase(
+        self,
+        board: Board,
+        moves: list[tuple[int | None, "Node", int]],
+        table_move: Any = None,
+    ) -> list[tuple[int | None, "Node", int]]:
+        # The tables follow the standard rules, without the history of the mills nor
+        # the draw rule of this game, so their values only order the moves: the
+        # fastest wins first and the fastest losses last, the order of the other
+        # moves being kept
+        if (
+            not self.tablebase.tables  # type: ignore
+            or not board.started_moving
+            or any(board.available_pieces.values())
+        ):
+            return moves
+        # The children have the pieces of the opponent to move, one less after a capture
+        other_turn = Player.orange if board.turn == Player.white else Player.white
+        n_pieces, n_other = len(board.pieces[board.turn]), len(board.pieces[other_turn])
+        if not any(
+            material in self.tablebase.tables  # type: ignore
+            for material in [(n_other, n_pieces), (n_other - 1, n_pieces)]
+        ):
+            return moves
+
+        key = board.key()
+
+        def rank(move: tuple[int | None, "Node", int]) -> tuple[int, int]:
+            if move == table_move:
+                return -1, 0
+            probe = self.tablebase.probe_key(self._child_key(board, key, move))  # type: ignore
+            if probe is None or probe[0] == Outcome.draw:
+                return 1, 0
+            outcome, distance = probe
+            # The outcome is seen from the opponent, who moves next
+            return (0, distance) if outcome == Outcome.loss else (2, -distance)
+
+        return sorted(moves, key=rank)
+
+    @staticmethod
+    def _child_key(board: Board, key: int, move: tuple[int | None, "Node", int]) -> int:
+        # Key of the position after the move, without playing it on a copy
+        white_turn = board.turn == Player.white
+        if move[0] is None:
+            # Capture of a piece of the opponent
+            shift = 0 if white_turn else 24
+            key &= ~(1 << (shift + NODE_INDEX[move[1]]) | 1 << 57)
+            return key ^ 1 << 56
+
+        shift = 24 if white_turn else 0
+        piece = board.piece_mapping[move[0]]  # type: ignore
+        if piece.first_move:
+            key -= 1 << (52 if white_turn else 48)
+        else:
+            key &= ~(1 << (shift + NODE_INDEX[piece.piece.node]))
+        key |= 1 << (shift + NODE_INDEX[move[1]])
+        if move[2] == Action.remove:
+            return key | 1 << 57
+        return key ^ 1 << 56
+
+    @staticmethod
+    def _reduce_symmetric_moves(
+        board: Board, moves: list[tuple[int | None, "Node", int]]
+    ) -> list[tuple[int | None, "Node", int]]:
+        # Moves mapped onto each other by a symmetry of the position lead to
+        # equivalent positions, so the first of them represents the others. The
+        # history of the mills is not symmetric once pieces move.
+        if board.started_moving:
+            return moves
+        symmetries = stabilizer(board.key())
+        if len(symmetries) == 1:
+            return moves
+
+        representatives = {}
+        for move in moves:
+            source, target = encode_move(board, move, 0)
+            move_class = min(
+                (
+                    source if source == HAND else int(SYMMETRIES[symmetry, source]),
+                    int(SYMMETRIES[symmetry, target]),
+                )
+                for symmetry in symmetries
+            )
+            representatives.setdefault(move_class, move)
+        return list(representatives.values())
+
+    def _rank_moves(
+        self,
+        board: Board,
+        moves: list[tuple[int | None, "Node", int]],
+        ply: int,
+        table_move: Any,
+        maximizing_player: bool,
+        evaluation_coefficients: dict[str, dict[str, float]],
+        training_parameters: dict[str, Any],
+        node_lookup: dict["Node", list["Node"]],
+    ) -> list[tuple[int | None, "Node", int]]:
+        # Table, principal and killer moves stay first, the others are ranked by the
+        # static evaluation of the position they lead to
+        ordered_moves = self._order_moves(moves, ply, table_move)
+        principal_move = (
+            self.principal_line[ply] if ply < len(self.principal_line) else None
+        )
+        killers = self.killer_moves.get(ply, [])
+        n_first = 0
+        while n_first < len(ordered_moves) and (
+            ordered_moves[n_first] in [table_move, principal_move] + killers
+        ):
+            n_first += 1
+
+        values = {}
+        for move in ordered_moves[n_first:]:
+            board_copy = board.ai_copy()
+            self.make_move(board_copy, move, render=False)
+            board_copy.update_draggable_pieces()
+            value = self._cached_evaluate(
+                board_copy, evaluation_coefficients, training_parameters, node_lookup
+            )
+            values[move] = value if maximizing_player else -value
+
+        return ordered_moves[:n_first] + sorted(
+            ordered_moves[n_first:], key=lambda move: values[move], reverse=True
+        )
+
+    def _report_progress(
+        self,
+        depth: int,
+        n_searched_moves: int,
+        n_moves: int,
+        best_move: Any,
+        value: float,
+    ):
+        if self.progress_callback is None:
+            return
+        if threading.current_thread() is self._ponder_thread:
+            return
+        self.progress_callback(
+            dict(
+                depth=depth,
+                n_searched_moves=n_searched_moves,
+                n_moves=n_moves,
+                best_move=best_move,
+                value=value,
+            )
+        )
+
+    def _record_cutoff(
+        self, move: tuple[int | None, "Node", int], depth: int, ply: int
+    ):
+        self.history_table[move] = self.history_table.get(move, 0) + depth * depth
+        killers = self.killer_moves.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]
+
+    def ponder(self, board: Board, **search_kwargs) -> bool:
+        """Method to search the predicted reply of the opponent in the background.
+
+        The predicted reply is read from the principal variation. The search runs on
+        a copy of the board and fills the transposition table, which the search
+        after the actual reply starts from. The principal variation and the move
+        ordering it leaves are only kept on a ponder hit.
+
+        Args:
+            board (Board): The board, with the opponent to move.
+            **search_kwargs: Keyword arguments forwarded to `search`.
+
+        Returns:
+            bool: Whether a background search was started.
+        """
+        self.stop_pondering()
+
+        ponder_board = board.ai_copy()
+        for move in self.principal_variation(board, max_length=2):
+            ponder_board.update_draggable_pieces()
+            if ponder_board.turn != board.turn:
+                break
+            self.make_move(ponder_board, move, render=False)
+        ponder_board.update_draggable_pieces()
+
+        if ponder_board.turn == board.turn or ponder_board.game_over:
+            return False
+
+        self._ponder_key = ponder_board.key()
+        # The background search moves the principal variation and the killer moves
+        # to the pondered position, so they are put back if it is not reached
+        self._ponder_state = dict(
+            principal_line=list(self.principal_line),
+            _principal_keys=list(self._principal_keys),
+            _principal_value=self._principal_value,
+            killer_moves={ply: list(moves) for ply, moves in self.killer_moves.items()},
+            history_table=dict(self.history_table),
+        )
+        self._ponder_thread = threading.Thread(
+            target=self._ponder, args=(ponder_board, search_kwargs), daemon=True
+        )
+        self._ponder_thread.start()
+        return True
+
+    def stop_pondering(self, board: Optional[Board] = None) -> bool:
+        """Method to end the background search started by `ponder`.
+
+        On a ponder hit, i.e. the board is the pondered position, the background search
+        is allowed to finish so that its results can be reused. Otherwise it is interrupted.
+
+        Args:
+            board (Optional[Board], optional): The board after the opponent's reply. Defaults to None.
+
+        Returns:
+            bool: Whether the board is the pondered position.
+        """
+        if self._ponder_thread is None:
+            return False
+
+        hit = board is not None and board.key() == self._ponder_key
+        if not hit:
+            self._stop_event.set()
+        self._ponder_thread.join()
+        self._stop_event.clear()
+        if not hit and self._ponder_state is not None:
+            for name, value in self._ponder_state.items():
+                setattr(self, name, value)
+        self._ponder_thread = None
+        self._ponder_key = None
+        self._ponder_state = None
+        return hit
+
+    def _ponder(self, board: Board, search_kwargs: dict[str, Any]):
+        try:
+            self.search(board, **search_kwargs)
+        except SearchInterrupted:
+            pass
+
+    def _check_single_move_with_budget(
+        self, node_budget: Optional[int], deadline: Optional[float], *args, **kwargs
+    ) -> tuple[Optional[tuple[Any, float, float, float]], int]:
+        # Runs in a worker process, the result is None when the budget ran out
+        self.n_nodes = 0
+        self._node_budget = node_budget
+        self._deadline = deadline
+        self._budget_exhausted = False
+        try:
+            return self._check_single_move(*args, **kwargs), self.n_nodes
+        except SearchInterrupted:
+            return None, self.n_nodes
+
+    def _check_single_move(
+        self,
+        board: Board,
+        move: tuple[int | None, "Node", int],
+        depth: int,
+        extreme_value: float,
+        alpha: float,
+        beta: float,
+        maximizing_player: bool,
+        next_n_fanning: Optional[int],
+        cumulative_n_samples: int,
+        best_move: Any,
+        evaluation_coefficients: dict[str, dict[str, float]],
+        training_parameters: dict[str, Any],
+        node_lookup: dict["Node", list["Node"]],
+        ply: int = 0,
+        reduction: int = 0,
+    ) -> tuple[Any, float, float, float]:
+        board_copy = board.ai_copy()
+        search_kwargs = dict(
+            multicore=1,
+            first_call=False,
+            evaluation_coefficients=evaluation_coefficients,
+            training_parameters=training_parameters,
+            node_lookup=node_lookup,
+            ply=ply + 1,
+        )
+        try:
+            self.make_move(board_copy, move, render=False)
+            value = None
+            if reduction > 0:
+                # Null window search, the move is only verified at full depth if
+                # the reduced search does not prove it worse than the best so far
+                window = (alpha, beta)
+                if maximizing_player and np.isfinite(alpha):
+                    window = (alpha, np.nextafter(alpha, np.inf))
+                elif not maximizing_player and np.isfinite(beta):
+                    window = (np.nextafter(beta, -np.inf), beta)
+                _, value = self.minimax(
+                    board_copy,
+                    depth - 1 - reduction,
+                    *window,
+                    next_n_fanning,
+                    cumulative_n_samples,
+                    **search_kwargs,  # type: ignore
+                )
+                if value > alpha if maximizing_player else value < beta:
+                    value = None
+            if value is None:
+                _, value = self.minimax(
+                    board_copy,
+                    depth - 1,
+                    alpha,
+                    beta,
+                    next_n_fanning,
+                    cumulative_n_samples,
+                    **search_kwargs,  # type: ignore
+                )
+        except KeyboardInterrupt:
+            print("Keyboard interrupt received. Stopping processes...")
+            return best_move, extreme_value, alpha, beta
+
+        if (
+            (maximizing_player and value > extreme_value)
+            or (not maximizing_player and value < extreme_value)
+            or best_move is None
+        ):
+            extreme_value = value
+            best_move = move
+
+        if maximizing_player:
+            alpha = max(alpha, extreme_value)
+        else:
+            beta = min(beta, extreme_value)
+
+        return best_move, extreme_value, alpha, beta
+
+
+# Agent and evaluation settings of the search workers, set once by `_init_search_worker`
+_worker_search: Optional[
+    tuple[MinMaxAgent, dict[str, dict[str, float]], dict[str, Any], dict]
+] = None
+
+
+def _init_search_worker(
+    agent: MinMaxAgent,
+    evaluation_coefficients: dict[str, dict[str, float]],
+    training_parameters: dict[str, Any],
+    node_lookup: dict["Node", list["Node"]],
+):
+    global _worker_search
+    AutonomousAgent.init_worker()
+    _worker_search = (agent, evaluation_coefficients, training_parameters, node_lookup)
+
+
+def _search_move(
+    node_budget: Optional[int], deadline: Optional[float], *args
+) -> tuple[Optional[tuple[Any, float, float, float]], int]:
+    # The worker keeps its agent, and its transposition table, between the moves
+    agent, evaluation_coefficients, training_parameters, node_lookup = _worker_search  # type: ignore
+    *args, ply = args
+    return agent._check_single_move_with_budget(
+        node_budget,
+        deadline,
+        *args,
+        evaluation_coefficients=evaluation_coefficients,
+        training_parameters=training_parameters,
+        node_lookup=node_lookup,
+        ply=ply,
+    )
@@ -0,0 +1,149 @@
+from src.game_env.board import Board
+from src.agents.autonomous_agents import MinMaxAgent
+from src.agents.time_manager import TimeManager
+from typing import Any, Callable, Optional
+import dataclasses as dc
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+import signal
+
+
+@dc.dataclass
+class EngineProcess:
+    """Class to run a MinMax agent in a dedicated process.
+
+    The game loop sends board snapshots through a pipe and receives progress updates
+    and moves, so the search never competes with rendering for the GIL. The agent
+    lives in the engine process, which keeps its search state between moves.
+
+    Args:
+        agent (MinMaxAgent): The agent to run.
+        time_manager (Optional[TimeManager], optional): The clock of the agent, if the game is timed. Defaults to None.
+
+    Attributes:
+        progress (dict[str, Any]): The latest progress update of the running search.
+        last_search_stats (dict[str, Any]): Statistics of the latest search.
+    """
+
+    agent: MinMaxAgent
+    time_manager: Optional[TimeManager] = None
+    progress: dict[str, Any] = dc.field(default_factory=dict)
+    last_search_stats: dict[str, Any] = dc.field(default_factory=dict)
+    _connection: Optional[Connection] = dc.field(default=None, init=False, repr=False)
+    _process: Optional[mp.Process] = dc.field(default=None, init=False, repr=False)
+
+    def start(self) -> "EngineProcess":
+        """Start the engine process."""
+        self._connection, engine_connection = mp.Pipe()
+        # Not a daemon, so that the engine can start its own pool of workers
+        self._process = mp.Process(
+            target=_engine_loop,
+            args=(engine_connection, self.agent, self.time_manager),
+        )
+        self._process.start()
+        return self
+
+    def search(
+        self,
+        board: Board,
+        on_progress: Optional[Callable[[dict[str, Any]], None]] = None,
+        **search_kwargs,
+    ) -> tuple[Any, float]:
+        """Search the best move in the engine process.
+
+        Args:
+            board (Board): The board to search.
+            on_progress (Optional[Callable[[dict[str, Any]], None]], optional): Called with each progress update. Defaults to None.
+            **search_kwargs: Arguments of `MinMaxAgent.search` replacing those of the config of the agent.
+
+        Returns:
+            tuple[int | None, float]: The best move and its value.
+        """
+        if self._connection is None:
+            raise RuntimeError("The engine process is not running")
+
+        self.progress = {}
+        self._connection.send(("search", board.ai_copy(), search_kwargs))
+        while True:
+            message, *content = self._connection.recv()
+            if message == "progress":
+                self.progress = content[0]
+                if on_progress is not None:
+                    on_progress(self.progress)
+            elif message == "result":
+                self.last_search_stats = content[2]
+                return content[0], content[1]
+            elif message == "error":
+                raise RuntimeError(f"The engine process failed: {content[0]}")
+
+    def ponder(self, board: Board, **search_kwargs):
+        """Let the engine process search the expected reply of the opponent.
+
+        Args:
+            board (Board): The board, with the opponent to move.
+            **search_kwargs: Arguments of `MinMaxAgent.search` replacing those of the config of the agent.
+        """
+        if self._connection is not None:
+            self._connection.send(("ponder", board.ai_copy(), search_kwargs))
+
+    def stop(self, timeout: float = 1.0):
+        """Stop the engine process.
+
+        Args:
+            timeout (float, optional): Time to wait for the engine to exit before killing it. Defaults to 1.0.
+        """
+        if self._process is None or self._connection is None:
+            return
+        try:
+            self._connection.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+        self._connection.close()
+        self._process = None
+        self._connection = None
+
+
+def _engine_loop(
+    connection: Connection, agent: MinMaxAgent, time_manager: Optional[TimeManager]
+):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    agent.progress_callback = lambda progress: connection.send(("progress", progress))
+
+    while True:
+        try:
+            message, *content = connection.recv()
+        except EOFError:
+            break
+
+        if message == "stop":
+            break
+        elif message == "ponder":
+            board, search_kwargs = content
+            agent.ponder(board, **agent.search_parameters(**search_kwargs))
+        elif message == "search":
+            board, search_kwargs = content
+            # The config of the agent was sent once, with the agent
+            search_kwargs = agent.search_parameters(**search_kwargs)
+            try:
+                if time_manager is None:
+                    agent.stop_pondering(board)
+                    best_move, value = agent.search(board, **search_kwargs)
+                else:
+                    # The clock is running, so the ponder search is not waited for,
+                    # and it sets the time of the search
+                    agent.stop_pondering()
+                    search_kwargs.pop("max_time", None)
+                    best_move, value = time_manager.search(
+                        agent, board, **search_kwargs
+                    )
+            except Exception as error:
+                connection.send(("error", repr(error)))
+            else:
+                connection.send(("result", best_move, value, agent.last_search_stats))
+
+    agent.stop_pondering()
+    connection.close()
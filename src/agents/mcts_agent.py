@@ -0,0 +1,442 @@
+from src.game_env.board import Board
+from src.globals import (
+    NODE_INDEX,
+    NODE_LOOKUP,
+    TRAINING_PARAMETERS,
+    EVALUATION_COEFFICIENTS,
+    Player,
+)
+from src.agents.autonomous_agents import AutonomousAgent, EngineConfig, MinMaxAgent
+from src.game_env.node import Node
+from typing import Any, Optional
+import numpy as np
+import dataclasses as dc
+from multiprocessing import Pool, cpu_count
+import time
+
+
+@dc.dataclass
+class MCTSAgent(AutonomousAgent):
+    """Class to represent a Monte Carlo Tree Search agent.
+
+    The tree lives in preallocated arrays indexed by node, the children of a node
+    being stored contiguously. Values are summed from the point of view of the orange
+    player, so that selection only flips their sign for the white player. Leaves are
+    valued with `MinMaxAgent.evaluate`, after an optional random rollout, squashed
+    into [-1, 1]. The subtree of the position reached after the opponent's reply is
+    kept for the next search.
+
+    Args:
+        max_tree_size (int): The number of nodes preallocated for the tree.
+        n_simulations (int): The number of simulations when no budget is given to `search`.
+        exploration (float): The exploration constant.
+        use_priors (bool): Whether to select with PUCT, using priors from the evaluation of the children, or with UCT.
+        prior_temperature (float): The temperature of the softmax giving the priors.
+        rollout_depth (int): The number of random moves played from a leaf before evaluating it.
+        value_scale (float): The evaluation mapped to a value of tanh(1).
+        seed (Optional[int]): The seed of the random rollouts.
+        config (Optional[EngineConfig]): The budgets and coefficients of the searches given by `search_parameters`.
+
+    Attributes:
+        visits (np.ndarray): The number of visits of each node.
+        value_sums (np.ndarray): The sum of the values backed up through each node.
+        priors (np.ndarray): The prior probability of each node.
+        first_child (np.ndarray): The index of the first child of each node.
+        n_children (np.ndarray): The number of children of each node.
+        expanded (np.ndarray): Whether the children of each node were generated.
+        terminal_values (np.ndarray): The value of the expanded nodes without children.
+        keys (np.ndarray): The signature of the position of each visited node, -1 otherwise.
+        moves (np.ndarray): The move leading to each node.
+        n_used (int): The number of nodes in use, the root being node 0.
+        last_search_stats (dict[str, Any]): Statistics of the latest search.
+    """
+
+    max_tree_size: int = 200000
+    n_simulations: int = 1000
+    exploration: float = 1.0
+    use_priors: bool = True
+    prior_temperature: float = 0.2
+    rollout_depth: int = 0
+    value_scale: float = 0.25
+    seed: Optional[int] = None
+    config: Optional[EngineConfig] = None
+    visits: np.ndarray = dc.field(init=False, repr=False)
+    value_sums: np.ndarray = dc.field(init=False, repr=False)
+    priors: np.ndarray = dc.field(init=False, repr=False)
+    first_child: np.ndarray = dc.field(init=False, repr=False)
+    n_children: np.ndarray = dc.field(init=False, repr=False)
+    expanded: np.ndarray = dc.field(init=False, repr=False)
+    terminal_values: np.ndarray = dc.field(init=False, repr=False)
+    keys: np.ndarray = dc.field(init=False, repr=False)
+    moves: np.ndarray = dc.field(init=False, repr=False)
+    n_used: int = dc.field(default=0, init=False, repr=False)
+    last_search_stats: dict[str, Any] = dc.field(
+        default_factory=dict, init=False, repr=False
+    )
+    _rng: np.random.Generator = dc.field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = np.random.default_rng(self.seed)
+        self._allocate()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes grow their own tree
+        state = {
+            field.name: getattr(self, field.name)
+            for field in dc.fields(self)
+            if field.init
+        }
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.last_search_stats = {}
+        self.__post_init__()
+
+    def search_parameters(self, **overrides) -> dict[str, Any]:
+        """Return the arguments of `search` given by the config of the agent.
+
+        The depth and the fanning of the config do not apply to the tree search.
+
+        Args:
+            **overrides: Arguments replacing those of the config.
+
+        Returns:
+            dict[str, Any]: The keyword arguments of `search`.
+        """
+        config = self.config if self.config is not None else EngineConfig()
+        parameters = dict(
+            multicore=config.n_processes,
+            evaluation_coefficients=config.coefficients,
+            training_parameters=config.training_parameters,
+        )
+        for name in ["max_nodes", "max_time"]:
+            if getattr(config, name) is not None:
+                parameters[name] = getattr(config, name)
+        return {**parameters, **overrides}
+
+    def search(
+        self,
+        board: Board,
+        max_nodes: Optional[int] = None,
+        max_time: Optional[float] = None,
+        multicore: int = 1,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+        training_parameters: dict[str, Any] = TRAINING_PARAMETERS,
+        node_lookup: dict["Node", list["Node"]] = NODE_LOOKUP,
+    ) -> tuple[Any, float]:
+        """Method to search the best move, stopping when the budget runs out.
+
+        Args:
+            board (Board): The board to search.
+            max_nodes (Optional[int], optional): The number of simulations. Defaults to `n_simulations` when no time is given.
+            max_time (Optional[float], optional): The maximum search time in seconds. Defaults to None.
+            multicore (int, optional): The number of independent trees searched in parallel, -1 for all cores. Defaults to 1.
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients. Defaults to EVALUATION_COEFFICIENTS.
+            training_parameters (dict[str, Any], optional): The training parameters. Defaults to TRAINING_PARAMETERS.
+            node_lookup (dict[Node, list[Node]], optional): The node lookup. Defaults to NODE_LOOKUP.
+
+        Returns:
+            tuple[int | None, float]: The most visited move and its value for the orange player, in [-1, 1].
+        """
+        start_time = time.time()
+        if max_nodes is None and max_time is None:
+            max_nodes = self.n_simulations
+        deadline = start_time + max_time if max_time is not None else None
+        evaluation_kwargs = dict(
+            evaluation_coefficients=evaluation_coefficients,
+            training_parameters=training_parameters,
+            node_lookup=node_lookup,
+        )
+
+        board.update_draggable_pieces()
+        n_workers = cpu_count() if multicore == -1 else multicore
+        if n_workers > 1:
+            # Root parallelization, the statistics of the root children are summed
+            with Pool(n_workers, initializer=self.init_worker) as pool:
+                results = pool.starmap(
+                    _search_worker,
+                    [
+                        (
+                            dc.replace(self, seed=self._rng.integers(2**31)),
+                            board.ai_copy(),
+                            # Each tree gets at least one simulation
+                            max(1, max_nodes // n_workers) if max_nodes else None,
+                            deadline,
+                            evaluation_kwargs,
+                        )
+                        for _ in range(n_workers)
+                    ],
+                )
+            statistics = {}
+            for root_statistics, _ in results:
+                for move, visits, value_sum in root_statistics:
+                    total_visits, total_value = statistics.get(move, (0, 0.0))
+                    statistics[move] = (total_visits + visits, total_value + value_sum)
+            n_simulations = sum(n for _, n in results)
+            reused_visits = 0
+            self._allocate()
+        else:
+            reused_visits = self._reuse_tree(board)
+            n_simulations = self._run(board, max_nodes, deadline, evaluation_kwargs)
+            statistics = {
+                move: (visits, value_sum)
+                for move, visits, value_sum in self._root_statistics()
+            }
+
+        self.last_search_stats = dict(
+            n_nodes=n_simulations,
+            reused_visits=reused_visits,
+            tree_size=self.n_used,
+            time=time.time() - start_time,
+        )
+        if not statistics:
+            return None, self._terminal_value(board, [], evaluation_kwargs)
+
+        best_move = max(statistics, key=lambda move: statistics[move][0])
+        visits, value_sum = statistics[best_move]
+        return best_move, value_sum / visits if visits > 0 else 0.0
+
+    def _allocate(self):
+        size = self.max_tree_size
+        self.visits = np.zeros(size, dtype=np.int32)
+        self.value_sums = np.zeros(size, dtype=np.float64)
+        self.priors = np.zeros(size, dtype=np.float32)
+        self.first_child = np.full(size, -1, dtype=np.int32)
+        self.n_children = np.zeros(size, dtype=np.int32)
+        self.expanded = np.zeros(size, dtype=bool)
+        self.terminal_values = np.zeros(size, dtype=np.float32)
+        self.keys = np.full(size, -1, dtype=np.int64)
+        self.moves = np.empty(size, dtype=object)
+        self.n_used = 1
+
+    def _run(
+        self,
+        board: Board,
+        max_nodes: Optional[int],
+        deadline: Optional[float],
+        evaluation_kwargs: dict[str, Any],
+    ) -> int:
+        n_simulations = 0
+        while (max_nodes is None or n_simulations < max_nodes) and (
+            deadline is None or time.time() < deadline
+        ):
+            self._simulate(board, evaluation_kwargs)
+            n_simulations += 1
+        return n_simulations
+
+    def _simulate(self, board: Board, evaluation_kwargs: dict[str, Any]):
+        board_copy = board.ai_copy()
+        node = 0
+        path = [node]
+        while self.expanded[node] and self.n_children[node] > 0:
+            node = self._select_child(node, board_copy.turn == Player.orange)
+            self.make_move(board_copy, self.moves[node], render=False)
+            board_copy.update_draggable_pieces()
+            path.append(node)
+
+        if self.expanded[node]:
+            value = float(self.terminal_values[node])
+        else:
+            value = self._expand(node, board_copy, evaluation_kwargs)
+
+        self.visits[path] += 1
+        self.value_sums[path] += value
+
+    def _select_child(self, node: int, maximizing_player: bool) -> int:
+        first = self.first_child[node]
+        children = slice(first, first + self.n_children[node])
+        visits = self.visits[children]
+        sign = 1.0 if maximizing_player else -1.0
+        parent_value = (
+            sign * self.value_sums[node] / self.visits[node]
+            if self.visits[node] > 0
+            else 0.0
+        )
+        values = np.where(
+            visits > 0,
+            sign * self.value_sums[children] / np.maximum(visits, 1),
+            parent_value,
+        )
+        if self.use_priors:
+            scores = values + self.exploration * self.priors[children] * np.sqrt(
+                self.visits[node]
+            ) / (1 + visits)
+        else:
+            scores = values + self.exploration * np.sqrt(
+                np.log(max(self.visits[node], 1)) / np.maximum(visits, 1)
+            )
+            scores[visits == 0] = np.inf
+        return first + int(np.argmax(scores))
+
+    def _expand(
+        self, node: int, board: Board, evaluation_kwargs: dict[str, Any]
+    ) -> float:
+        self.keys[node] = self._signature(board)
+        moves = self.generate_possible_moves(board) if not board.game_over else []
+        if not moves or board.game_over:
+            self.expanded[node] = True
+            self.terminal_values[node] = self._terminal_value(
+                board, moves, evaluation_kwargs
+            )
+            return float(self.terminal_values[node])
+
+        if self.n_used + len(moves) <= self.max_tree_size:
+            first = self.n_used
+            children = slice(first, first + len(moves))
+            self.first_child[node] = first
+            self.n_children[node] = len(moves)
+            self.moves[children] = [None] * len(moves)
+            for i, move in enumerate(moves):
+                self.moves[first + i] = move
+            if self.use_priors:
+                sign = 1.0 if board.turn == Player.orange else -1.0
+                logits = sign * self._child_values(board, moves, evaluation_kwargs)
+                logits = (logits - logits.max()) / self.prior_temperature
+                priors = np.exp(logits)
+                self.priors[children] = priors / priors.sum()
+            self.n_used += len(moves)
+            self.expanded[node] = True
+
+        if self.rollout_depth > 0:
+            return self._rollout(board, evaluation_kwargs)
+        return self._value(board, evaluation_kwargs)
+
+    def _child_values(
+        self,
+        board: Board,
+        moves: list[tuple[int | None, "Node", int]],
+        evaluation_kwargs: dict[str, Any],
+    ) -> np.ndarray:
+        if evaluation_kwargs["node_lookup"] is not NODE_LOOKUP:
+            return np.array(
+                [
+                    self._value(self._child_board(board, move), evaluation_kwargs)
+                    for move in moves
+                ]
+            )
+        # The children are scored together from their keys, without playing the moves
+        key = board.key()
+        values = MinMaxAgent.evaluate_batch(
+            np.array([MinMaxAgent._child_key(board, key, move) for move in moves]),
+            evaluation_kwargs["evaluation_coefficients"],
+            evaluation_kwargs["training_parameters"],
+        )
+        return np.tanh(values / self.value_scale)
+
+    def _child_board(self, board: Board, move: tuple[int | None, "Node", int]) -> Board:
+        board_copy = board.ai_copy()
+        self.make_move(board_copy, move, render=False)
+        board_copy.update_draggable_pieces()
+        return board_copy
+
+    def _rollout(self, board: Board, evaluation_kwargs: dict[str, Any]) -> float:
+        board = board.ai_copy()
+        for _ in range(self.rollout_depth):
+            moves = self.generate_possible_moves(board) if not board.game_over else []
+            if not moves:
+                return self._terminal_value(board, moves, evaluation_kwargs)
+            self.make_move(board, moves[self._rng.integers(len(moves))], render=False)
+            board.update_draggable_pieces()
+        return self._value(board, evaluation_kwargs)
+
+    def _value(self, board: Board, evaluation_kwargs: dict[str, Any]) -> float:
+        return float(
+            np.tanh(MinMaxAgent.evaluate(board, **evaluation_kwargs) / self.value_scale)
+        )
+
+    def _terminal_value(
+        self,
+        board: Board,
+        moves: list[tuple[int | None, "Node", int]],
+        evaluation_kwargs: dict[str, Any],
+    ) -> float:
+        if board.winner is not None:
+            return 1.0 if board.winner == Player.orange else -1.0
+        if board.is_draw:
+            return 0.0
+        if not moves:
+            return -1.0 if board.turn == Player.orange else 1.0
+        return self._value(board, evaluation_kwargs)
+
+    def _root_statistics(self) -> list[tuple[Any, int, float]]:
+        first = self.first_child[0]
+        return [
+            (self.moves[child], int(self.visits[child]), float(self.value_sums[child]))
+            for child in range(first, first + self.n_children[0])
+        ]
+
+    def _reuse_tree(self, board: Board) -> int:
+        # Keep the subtree of the most visited node of the position, if any
+        matches = np.flatnonzero(self.keys[: self.n_used] == self._signature(board))
+        if len(matches) == 0:
+            self._allocate()
+            return 0
+        node = int(matches[np.argmax(self.visits[matches])])
+        if node != 0:
+            self._reroot(node)
+        return int(self.visits[0])
+
+    @staticmethod
+    def _signature(board: Board) -> int:
+        # Unlike `Board.key`, identifies the pieces as well, since the moves stored
+        # in the tree refer to them by id
+        return hash(
+            (
+                board.key(),
+                tuple(
+                    sorted(
+                        (piece.id, NODE_INDEX.get(piece.piece.node, -1))
+                        for pieces in board.pieces.values()
+                        for piece in pieces
+                    )
+                ),
+                tuple(sorted(tuple(mill[0]) for mill in board.formed_mills or [])),
+            )
+        )
+
+    def _reroot(self, node: int):
+        # Breadth first copy of the subtree, which keeps the children contiguous
+        old_nodes = [node]
+        first_child = []
+        i = 0
+        while i < len(old_nodes):
+            old_node = old_nodes[i]
+            n_children = self.n_children[old_node]
+            if n_children > 0:
+                first_child.append(len(old_nodes))
+                first = self.first_child[old_node]
+                old_nodes.extend(range(first, first + n_children))
+            else:
+                first_child.append(-1)
+            i += 1
+
+        indices = np.array(old_nodes)
+        n_nodes = len(indices)
+        # The freed slots get the values given by `_allocate`
+        for array, default in [
+            (self.visits, 0),
+            (self.value_sums, 0.0),
+            (self.priors, 0.0),
+            (self.n_children, 0),
+            (self.expanded, False),
+            (self.terminal_values, 0.0),
+            (self.keys, -1),
+            (self.moves, None),
+        ]:
+            array[:n_nodes] = array[indices]
+            array[n_nodes : self.n_used] = default
+        self.first_child[:n_nodes] = first_child
+        self.first_child[n_nodes : self.n_used] = -1
+        self.n_used = n_nodes
+
+
+def _search_worker(
+    agent: MCTSAgent,
+    board: Board,
+    max_nodes: Optional[int],
+    deadline: Optional[float],
+    evaluation_kwargs: dict[str, Any],
+) -> tuple[list[tuple[Any, int, float]], int]:
+    n_simulations = agent._run(board, max_nodes, deadline, evaluation_kwargs)
+    return agent._root_statistics(), n_simulations
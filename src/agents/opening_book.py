@@ -0,0 +1,266 @@
+# Opening book of the placing phase, built offline by deep searches.
+#
+# The book is a binary file made of a header and of entries sorted by key. The header
+# identifies the format and holds a hash of the evaluation coefficients the positions
+# were searched with, since the moves and values of the book only hold for them. Each
+# entry is the key of a position reduced to the smallest of its images under the
+# symmetries of the board, the best move found in that symmetric image, as the index of
+# the point it leaves (24 for a piece placed from the hand or a capture) and of the
+# point it targets, the depth of the search and its value from the point of view of
+# the orange player. An entry is only used by searches that are not deeper than it and
+# evaluate with the same coefficients.
+from src.game_env.board import Board
+from src.game_env.symmetry import canonical_keys, decode_move, encode_move
+from src.agents.autonomous_agents import MinMaxAgent
+from src.globals import CELL_SIZE, EVALUATION_COEFFICIENTS, MARGIN, OPENING_BOOK_PATH
+from typing import Any, Optional
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+import argparse
+import dataclasses as dc
+import hashlib
+import json
+import numpy as np
+import signal
+import time
+
+BOOK_MAGIC = b"NMMBOOK1"
+
+HEADER_DTYPE = np.dtype([("magic", "S8"), ("coefficients", "<i8")])
+
+BOOK_DTYPE = np.dtype(
+    [
+        ("key", "<i8"),
+        ("source", "u1"),
+        ("target", "u1"),
+        ("depth", "u1"),
+        ("value", "<f4"),
+    ]
+)
+
+
+def coefficients_hash(evaluation_coefficients: dict[str, dict[str, float]]) -> int:
+    """Hash evaluation coefficients, as stored in the header of the book.
+
+    Args:
+        evaluation_coefficients (dict[str, dict[str, float]]): The coefficients, by phase.
+
+    Returns:
+        int: The hash, as a signed 64-bit integer.
+    """
+    coefficients = {
+        phase: dict(values) for phase, values in evaluation_coefficients.items()
+    }
+    digest = hashlib.blake2b(
+        json.dumps(coefficients, sort_keys=True).encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+@dc.dataclass
+class OpeningBook:
+    """Class to look up the moves of an opening book.
+
+    Args:
+        path (Path, optional): The file of the book. Defaults to OPENING_BOOK_PATH.
+
+    Attributes:
+        entries (np.ndarray): The memory-mapped entries of the book, sorted by key.
+        coefficients (Optional[int]): The hash of the evaluation coefficients of the book, None without a book.
+    """
+
+    path: Path = OPENING_BOOK_PATH
+    entries: np.ndarray = dc.field(
+        default_factory=lambda: np.zeros(0, dtype=BOOK_DTYPE), init=False, repr=False
+    )
+    coefficients: Optional[int] = dc.field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        path = Path(self.path)
+        if not path.exists() or path.stat().st_size < HEADER_DTYPE.itemsize:
+            return
+        header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)[0]
+        # Books written without a header do not say which coefficients they hold
+        if header["magic"] != BOOK_MAGIC:
+            return
+        self.coefficients = int(header["coefficients"])
+        if path.stat().st_size > HEADER_DTYPE.itemsize:
+            self.entries = np.memmap(
+                path, dtype=BOOK_DTYPE, mode="r", offset=HEADER_DTYPE.itemsize
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The book is mapped again by the process that receives it
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.entries = np.zeros(0, dtype=BOOK_DTYPE)
+        self.coefficients = None
+        self.__post_init__()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def lookup(
+        self,
+        board: Board,
+        possible_moves: list[Any],
+        depth: int = 0,
+        evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+    ) -> Optional[tuple[Any, float]]:
+        """Look the position up in the book.
+
+        Args:
+            board (Board): The board, in the placing phase or capturing before all the pieces are placed.
+            possible_moves (list[Any]): The legal moves of the position.
+            depth (int, optional): The depth of the search the book move replaces. Defaults to 0.
+            evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients of that search. Defaults to EVALUATION_COEFFICIENTS.
+
+        Returns:
+            Optional[tuple[Any, float]]: The move of the book and its value, or None if
+                the position is out of book, was searched less deeply than `depth` or
+                the book was built with other coefficients.
+        """
+        if len(self.entries) == 0 or board.started_moving:
+            return None
+        if coefficients_hash(evaluation_coefficients) != self.coefficients:
+            return None
+
+        canonical, symmetries = canonical_keys(np.array([board.key()]))
+        keys = self.entries["key"]
+        index = int(np.searchsorted(keys, canonical[0]))
+        if index == len(keys) or keys[index] != canonical[0]:
+            return None
+
+        entry = self.entries[index]
+        if entry["depth"] < depth:
+            return None
+        move = decode_move(
+            board, possible_moves, entry["source"], entry["target"], symmetries[0]
+        )
+        return None if move is None else (move, float(entry["value"]))
+
+
+def _init_worker():
+    # The parent process handles the interruptions
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _search_position(
+    args: tuple[Board, int, Optional[int], dict[str, dict[str, float]]],
+) -> tuple[Any, float]:
+    board, depth, max_nodes, evaluation_coefficients = args
+    return MinMaxAgent().search(
+        board,
+        depth,
+        max_nodes=max_nodes,
+        evaluation_coefficients=evaluation_coefficients,
+    )
+
+
+def build_opening_book(
+    path: Path = OPENING_BOOK_PATH,
+    n_plies: int = 4,
+    depth: int = 5,
+    max_nodes: Optional[int] = None,
+    n_processes: int = -1,
+    verbose: bool = True,
+    evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+) -> int:
+    """Build the opening book of the first plies of the game.
+
+    Every position reachable in fewer than `n_plies` plies is searched once per class
+    of symmetric positions. The book is only used by the searches evaluating with the
+    same coefficients.
+
+    Args:
+        path (Path, optional): The file to write the book to. Defaults to OPENING_BOOK_PATH.
+        n_plies (int, optional): The number of plies covered by the book. Defaults to 4.
+        depth (int, optional): The depth of the searches. Defaults to 5.
+        max_nodes (Optional[int], optional): The node budget of each search. Defaults to None.
+        n_processes (int, optional): The number of processes, -1 for all the cores. Defaults to -1.
+        verbose (bool, optional): Whether to print the progress. Defaults to True.
+        evaluation_coefficients (dict[str, dict[str, float]], optional): The evaluation coefficients of the searches. Defaults to EVALUATION_COEFFICIENTS.
+
+    Returns:
+        int: The number of entries of the book.
+    """
+    n_processes = cpu_count() if n_processes == -1 else n_processes
+    expander = MinMaxAgent()
+    board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+    board.update_draggable_pieces()
+    frontier = {int(canonical_keys(np.array([board.key()]))[0][0]): board}
+    entries = []
+
+    with Pool(n_processes, initializer=_init_worker) as pool:
+        for ply in range(n_plies):
+            start_time = time.time()
+            boards = list(frontier.values())
+            results = pool.map(
+                _search_position,
+                [
+                    (board.ai_copy(), depth, max_nodes, evaluation_coefficients)
+                    for board in boards
+                ],
+                chunksize=max(1, len(boards) // (4 * n_processes)),
+            )
+
+            next_frontier = {}
+            for (key, board), (move, value) in zip(frontier.items(), results):
+                symmetry = int(canonical_keys(np.array([board.key()]))[1][0])
+                if move is not None:
+                    entries.append(
+                        (
+                            key,
+                            *encode_move(board, move, symmetry),
+                            min(depth, 255),
+                            value,
+                        )
+                    )
+
+                for child_move in expander.generate_possible_moves(board):
+                    child = board.ai_copy()
+                    expander.make_move(child, child_move, render=False)
+                    child.update_draggable_pieces()
+                    if child.game_over or child.started_moving:
+                        continue
+                    child_key = int(canonical_keys(np.array([child.key()]))[0][0])
+                    next_frontier.setdefault(child_key, child)
+            frontier = next_frontier
+
+            if verbose:
+                print(
+                    "Ply {}: {} positions searched in {:.1f}s".format(
+                        ply, len(boards), time.time() - start_time
+                    )
+                )
+
+    header = np.array(
+        [(BOOK_MAGIC, coefficients_hash(evaluation_coefficients))], dtype=HEADER_DTYPE
+    )
+    book = np.array(entries, dtype=BOOK_DTYPE)
+    book.sort(order="key")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as file:
+        header.tofile(file)
+        book.tofile(file)
+    return len(book)
+
+
+def main():
+    """Command line entry point of the opening book builder."""
+    parser = argparse.ArgumentParser(description="Build the opening book.")
+    parser.add_argument("--path", type=Path, default=OPENING_BOOK_PATH)
+    parser.add_argument("--plies", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--max-nodes", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=-1)
+    args = parser.parse_args()
+    build_opening_book(
+        args.path, args.plies, args.depth, args.max_nodes, args.processes
+    )
+
+
+if __name__ == "__main__":
+    main()
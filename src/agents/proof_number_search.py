@@ -0,0 +1,181 @@
+from src.game_env.board import Board
+from src.globals import Outcome, Player
+from src.agents.autonomous_agents import AutonomousAgent
+from typing import Any, Optional
+import dataclasses as dc
+import time
+
+INFINITY = float("inf")
+
+
+@dc.dataclass
+class ProofNumberSolver(AutonomousAgent):
+    """Class to prove forced wins with proof-number search.
+
+    The search grows a tree towards the most proving node, the player to move at the
+    root attacking in OR nodes and the opponent defending in AND nodes. Draws,
+    repetitions of a position of the current line and lines longer than `max_depth`
+    count as failures of the attacker, so every proof found is a forced win.
+
+    Args:
+        max_nodes (int): The maximum number of nodes of the proof tree.
+        max_depth (int): The maximum length of the lines, in plies.
+        max_table_size (int): The maximum number of entries in the table of solved positions.
+
+    Attributes:
+        solved_table (dict[int, Player]): Winner of the proven positions, keyed by `Board.history_key`.
+        n_nodes (int): The number of nodes created by the latest call to `solve` or `prove`.
+    """
+
+    max_nodes: int = 100000
+    max_depth: int = 40
+    max_table_size: int = 1000000
+    solved_table: dict[int, Player] = dc.field(default_factory=dict, repr=False)
+    n_nodes: int = dc.field(default=0, init=False, repr=False)
+
+    def solve(self, board: Board) -> tuple[Outcome, list[Any]]:
+        """Method to solve the position for the player to move.
+
+        Args:
+            board (Board): The board to solve.
+
+        Returns:
+            tuple[Outcome, list[Any]]: The outcome for the player to move and the line
+                proving it, empty when the outcome is unknown.
+        """
+        board.update_draggable_pieces()
+        other_turn = Player.orange if board.turn == Player.white else Player.white
+        n_nodes = 0
+        result = Outcome.unknown, []
+        for attacker, outcome in [
+            (board.turn, Outcome.win),
+            (other_turn, Outcome.loss),
+        ]:
+            proven, line = self.prove(board, attacker)
+            n_nodes += self.n_nodes
+            if proven:
+                result = outcome, line
+                break
+        self.n_nodes = n_nodes
+        return result
+
+    def prove(
+        self,
+        board: Board,
+        attacker: Player,
+        max_nodes: Optional[int] = None,
+        deadline: Optional[float] = None,
+    ) -> tuple[bool, list[Any]]:
+        """Method to try to prove that a player wins from the position.
+
+        Args:
+            board (Board): The board to search.
+            attacker (Player): The player to prove the win of.
+            max_nodes (Optional[int], optional): The maximum number of nodes of the proof tree. Defaults to `max_nodes` of the solver.
+            deadline (Optional[float], optional): The time at which the search gives up. Defaults to None.
+
+        Returns:
+            tuple[bool, list[Any]]: Whether the win was proven and the proving line.
+        """
+        max_nodes = self.max_nodes if max_nodes is None else max_nodes
+        board.update_draggable_pieces()
+        proof, disproof = self._initial_numbers(board, attacker, 0, [])
+        self.n_nodes = 1
+        if proof == 0 or disproof == 0:
+            return proof == 0, []
+
+        # The tree is stored in parallel lists indexed by node, the keys of the
+        # positions detecting repetitions and the history keys indexing the solved
+        # positions
+        proofs, disproofs = [proof], [disproof]
+        parents, children = [-1], [[]]
+        moves, or_nodes = [None], [board.turn == attacker]
+        keys, history_keys = [board.key()], [board.history_key()]
+
+        while (
+            proofs[0] != 0
+            and disproofs[0] != 0
+            and len(proofs) < max_nodes
+            and (deadline is None or time.time() < deadline)
+        ):
+            # Walk down to the most proving node
+            board_copy = board.ai_copy()
+            node = 0
+            path_keys = [keys[0]]
+            while children[node]:
+                node = min(
+                    children[node],
+                    key=lambda child: (
+                        proofs[child] if or_nodes[node] else disproofs[child]
+                    ),
+                )
+                self.make_move(board_copy, moves[node], render=False)
+                board_copy.update_draggable_pieces()
+                path_keys.append(keys[node])
+
+            possible_moves = self.generate_possible_moves(board_copy)
+            if not possible_moves:
+                # The player to move is blocked
+                blocked = board_copy.turn == attacker
+                proofs[node] = INFINITY if blocked else 0
+                disproofs[node] = 0 if blocked else INFINITY
+            for move in possible_moves:
+                child_board = board_copy.ai_copy()
+                self.make_move(child_board, move, render=False)
+                child_board.update_draggable_pieces()
+                child_proof, child_disproof = self._initial_numbers(
+                    child_board, attacker, len(path_keys), path_keys
+                )
+                children[node].append(len(proofs))
+                proofs.append(child_proof)
+                disproofs.append(child_disproof)
+                parents.append(node)
+                children.append([])
+                moves.append(move)
+                keys.append(child_board.key())
+                history_keys.append(child_board.history_key())
+                or_nodes.append(child_board.turn == attacker)
+
+            while node != -1:
+                if children[node]:
+                    child_proofs = [proofs[child] for child in children[node]]
+                    child_disproofs = [disproofs[child] for child in children[node]]
+                    if or_nodes[node]:
+                        proofs[node] = min(child_proofs)
+                        disproofs[node] = sum(child_disproofs)
+                    else:
+                        proofs[node] = sum(child_proofs)
+                        disproofs[node] = min(child_disproofs)
+                if proofs[node] == 0:
+                    self._store(history_keys[node], attacker)
+                node = parents[node]
+
+        self.n_nodes = len(proofs)
+        if proofs[0] != 0:
+            return False, []
+
+        line = []
+        node = 0
+        while children[node]:
+            # Any proven reply of the defender is followed
+            node = next(child for child in children[node] if proofs[child] == 0)
+            line.append(moves[node])
+        return True, line
+
+    def _initial_numbers(
+        self, board: Board, attacker: Player, depth: int, path_keys: list[int]
+    ) -> tuple[float, float]:
+        if board.game_over:
+            return (0, INFINITY) if board.winner == attacker else (INFINITY, 0)
+
+        winner = self.solved_table.get(board.history_key())
+        if winner is not None:
+            return (0, INFINITY) if winner == attacker else (INFINITY, 0)
+        if board.key() in path_keys or depth >= self.max_depth:
+            return INFINITY, 0
+        return 1, 1
+
+    def _store(self, key: int, winner: Player):
+        if len(self.solved_table) >= self.max_table_size:
+            self.solved_table.clear()
+        self.solved_table[key] = winner
@@ -0,0 +1,122 @@
+from src.game_env.board import Board
+from src.agents.autonomous_agents import MinMaxAgent
+from typing import Any
+import dataclasses as dc
+import time
+
+
+@dc.dataclass
+class TimeManager:
+    """Class to split a game clock across the moves of an agent.
+
+    The agent searches with iterative deepening up to the requested depth. Each move
+    gets a soft limit, after which no new iteration is started, and a hard limit, at
+    which the running iteration is interrupted. More time goes to the placing phase
+    and to moves whose best move changes between iterations, less to forced moves.
+
+    Args:
+        total_time (float): The time available for the whole game, in seconds.
+        increment (float, optional): The time added to the clock after each move. Defaults to 0.0.
+        reserve (float, optional): Time kept aside for the overhead around the search. Defaults to 0.1.
+        moves_to_go (int, optional): Expected number of moves after the placing phase. Defaults to 30.
+        placing_factor (float, optional): Scale of the time of placing moves. Defaults to 1.5.
+        forced_factor (float, optional): Scale of the time of moves with few alternatives. Defaults to 0.5.
+        instability_factor (float, optional): Scale of the soft limit when the best move changes. Defaults to 1.5.
+        max_factor (float, optional): Ratio between the hard and the initial soft limit. Defaults to 4.0.
+        max_fraction (float, optional): The largest share of the clock a single move can use. Defaults to 0.25.
+
+    Attributes:
+        remaining (float): The time left on the clock.
+        flag_fell (bool): Whether the clock ran out at some point.
+    """
+
+    total_time: float
+    increment: float = 0.0
+    reserve: float = 0.1
+    moves_to_go: int = 30
+    placing_factor: float = 1.5
+    forced_factor: float = 0.5
+    instability_factor: float = 1.5
+    max_factor: float = 4.0
+    max_fraction: float = 0.25
+    remaining: float = dc.field(init=False)
+    flag_fell: bool = dc.field(default=False, init=False)
+
+    def __post_init__(self):
+        self.remaining = self.total_time
+
+    def allocate(self, board: Board, n_moves: int) -> tuple[float, float]:
+        """Compute the time limits of the next move.
+
+        Args:
+            board (Board): The board, with the agent to move.
+            n_moves (int): The number of legal moves.
+
+        Returns:
+            tuple[float, float]: The soft and the hard limit, in seconds.
+        """
+        available = max(0.0, self.remaining - self.reserve)
+        if n_moves <= 1 or available == 0.0:
+            return 0.0, 0.0
+
+        placing = not board.started_moving
+        moves_to_go = self.moves_to_go
+        if placing:
+            moves_to_go += board.available_pieces[board.turn] + sum(
+                piece.first_move for piece in board.pieces[board.turn]
+            )
+
+        soft = available / moves_to_go + self.increment
+        if placing:
+            soft *= self.placing_factor
+        if n_moves <= 3:
+            soft *= self.forced_factor
+
+        hard = min(soft * self.max_factor, available * self.max_fraction)
+        return min(soft, hard), hard
+
+    def search(
+        self, agent: MinMaxAgent, board: Board, depth: int, **search_kwargs
+    ) -> tuple[Any, float]:
+        """Search the best move within the time allocated to it and update the clock.
+
+        Args:
+            agent (MinMaxAgent): The agent to search with.
+            board (Board): The board to search.
+            depth (int): The maximum depth of the search.
+            **search_kwargs: Keyword arguments forwarded to `MinMaxAgent.search`.
+
+        Returns:
+            tuple[int | None, float]: The best move and its value.
+        """
+        start_time = time.time()
+        board.update_draggable_pieces()
+        n_moves = len(agent.generate_possible_moves(board))
+        soft, hard = self.allocate(board, n_moves)
+
+        if n_moves <= 1:
+            # Nothing to choose from, the search only provides the value
+            result = agent.search(board, 1, **search_kwargs)
+        else:
+            result = None
+            for iteration_depth in range(1, depth + 1):
+                elapsed = time.time() - start_time
+                if result is not None and elapsed >= soft:
+                    break
+
+                move, value = agent.search(
+                    board, iteration_depth, max_time=hard - elapsed, **search_kwargs
+                )
+                if result is not None and agent.last_search_stats["budget_exhausted"]:
+                    # Keep the result of the last completed iteration
+                    break
+                if result is not None and move != result[0]:
+                    soft = min(hard, soft * self.instability_factor)
+                result = move, value
+
+        elapsed = time.time() - start_time
+        self.remaining -= elapsed
+        if self.remaining < 0:
+            self.flag_fell = True
+        self.remaining += self.increment
+        return result  # type: ignore
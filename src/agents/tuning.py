@@ -0,0 +1,376 @@
+# Tuning of the evaluation coefficients on the outcomes of self-play games.
+#
+# The positions of the games are labelled with the result of their game, 1 for an
+# orange win, 0.5 for a draw and 0 for a white win, and the coefficients of each game
+# phase are fitted so that a sigmoid of the evaluation predicts the result (the Texel
+# method). The features of the positions are computed once, so that scoring a set of
+# coefficients is a product of matrices, and the candidate coefficients of each step
+# of the local search are scored in parallel.
+from src.game_env.board import Board
+from src.agents.autonomous_agents import (
+    EVALUATION_FEATURES,
+    GAME_PHASES,
+    MinMaxAgent,
+)
+from src.globals import (
+    CELL_SIZE,
+    EVALUATION_COEFFICIENTS,
+    EVALUATION_COEFFICIENTS_PATH,
+    MARGIN,
+    MIN_DRAW_MOVES,
+    Phase,
+    Player,
+)
+from typing import Optional
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+import argparse
+import json
+import numpy as np
+import random
+import signal
+import time
+
+# Labelled data of the worker processes, set once by `_init_scorer`
+_scorer_data: Optional[tuple[list[np.ndarray], list[np.ndarray], float]] = None
+
+
+def _init_worker():
+    # The parent process handles the interruptions
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def play_game(
+    agent: MinMaxAgent,
+    depth: int = 2,
+    n_random_plies: int = 6,
+    random_move_rate: float = 0.2,
+    max_plies: int = 300,
+) -> tuple[list[int], float]:
+    """Play a game of the agent against itself.
+
+    The first plies are played at random, so that the games differ from each other,
+    and so are some of the later moves, without which shallow searches draw almost
+    every game.
+
+    Args:
+        agent (MinMaxAgent): The agent playing both sides.
+        depth (int, optional): The depth of the searches. Defaults to 2.
+        n_random_plies (int, optional): The number of random plies. Defaults to 6.
+        random_move_rate (float, optional): The probability of a random move after them. Defaults to 0.2.
+        max_plies (int, optional): The number of plies after which the game is a draw. Defaults to 300.
+
+    Returns:
+        tuple[list[int], float]: The keys of the positions played after the random
+            plies, and the result of the game.
+    """
+    board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+    keys = []
+    n_quiet_moves = 0
+    for ply in range(max_plies):
+        board.update_draggable_pieces()
+        if board.game_over:
+            break
+        possible_moves = agent.generate_possible_moves(board)
+        if not possible_moves:
+            agent.make_move(board, None, render=False)  # type: ignore
+            break
+
+        if ply >= n_random_plies and board.phase != Phase.capturing:
+            # Positions waiting for a capture are not quiet enough to be labelled
+            keys.append(board.key())
+        if ply < n_random_plies or random.random() < random_move_rate:
+            move = random.choice(possible_moves)
+        else:
+            move, _ = agent.search(board, depth)
+            move = move or random.choice(possible_moves)
+
+        removed = agent.make_move(board, move, render=False)
+        n_quiet_moves = 0 if removed or not board.started_moving else n_quiet_moves + 1
+        if n_quiet_moves > MIN_DRAW_MOVES:
+            board.is_draw = True
+
+    result = 0.5
+    if board.winner is not None:
+        result = 1.0 if board.winner == Player.orange else 0.0
+    return keys, result
+
+
+def _play_games(
+    args: tuple[int, int, int, int, float],
+) -> tuple[list[int], list[float]]:
+    seed, n_games, depth, n_random_plies, random_move_rate = args
+    random.seed(seed)
+    np.random.seed(seed)
+    agent = MinMaxAgent()
+    keys, results = [], []
+    for _ in range(n_games):
+        game_keys, result = play_game(agent, depth, n_random_plies, random_move_rate)
+        keys.extend(game_keys)
+        results.extend([result] * len(game_keys))
+    return keys, results
+
+
+def generate_positions(
+    n_games: int,
+    depth: int = 2,
+    n_random_plies: int = 6,
+    random_move_rate: float = 0.2,
+    n_processes: int = -1,
+    seed: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate labelled positions from self-play games.
+
+    Args:
+        n_games (int): The number of games.
+        depth (int, optional): The depth of the searches. Defaults to 2.
+        n_random_plies (int, optional): The number of random plies of each game. Defaults to 6.
+        random_move_rate (float, optional): The probability of a random move after them. Defaults to 0.2.
+        n_processes (int, optional): The number of processes, -1 for all the cores. Defaults to -1.
+        seed (int, optional): The seed of the random plies. Defaults to 0.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The keys of the positions and the result of
+            their game.
+    """
+    n_processes = cpu_count() if n_processes == -1 else n_processes
+    # Each task plays a few games, so that the games are spread over the processes
+    games_per_task = max(1, min(8, n_games // (4 * n_processes)))
+    tasks = [
+        (
+            seed + start,
+            min(games_per_task, n_games - start),
+            depth,
+            n_random_plies,
+            random_move_rate,
+        )
+        for start in range(0, n_games, games_per_task)
+    ]
+    with Pool(n_processes, initializer=_init_worker) as pool:
+        games = pool.map(_play_games, tasks)
+    keys = np.array(
+        [key for game_keys, _ in games for key in game_keys], dtype=np.int64
+    )
+    results = np.array([result for _, game_results in games for result in game_results])
+    return keys, results
+
+
+def feature_matrices(
+    keys: np.ndarray, results: np.ndarray
+) -> tuple[list[np.ndarray], list[np.ndarray]]:
+    """Compute the features of the positions, split by game phase.
+
+    Positions where the game is over are left out, as the evaluation does not weigh
+    their features.
+
+    Args:
+        keys (np.ndarray): The keys of the positions.
+        results (np.ndarray): The result of the game of each position.
+
+    Returns:
+        tuple[list[np.ndarray], list[np.ndarray]]: For each phase of GAME_PHASES, the
+            features of its positions, one column per feature of EVALUATION_FEATURES,
+            and their results.
+    """
+    phase_index, features, outcomes = MinMaxAgent.evaluation_features(keys)
+    matrix = np.stack([features[feature] for feature in EVALUATION_FEATURES], axis=1)
+    in_play = outcomes == 0
+    return (
+        [matrix[in_play & (phase_index == phase)] for phase in range(len(GAME_PHASES))],
+        [
+            results[in_play & (phase_index == phase)]
+            for phase in range(len(GAME_PHASES))
+        ],
+    )
+
+
+def prediction_error(
+    weights: np.ndarray,
+    matrices: list[np.ndarray],
+    results: list[np.ndarray],
+    scale: float,
+) -> float:
+    """Compute the mean squared error of the results predicted by the evaluation.
+
+    Args:
+        weights (np.ndarray): The coefficients, one row per game phase.
+        matrices (list[np.ndarray]): The features of the positions of each phase.
+        results (list[np.ndarray]): The results of the positions of each phase.
+        scale (float): The scale of the evaluation in the sigmoid.
+
+    Returns:
+        float: The mean squared error.
+    """
+    error, n_positions = 0.0, 0
+    for phase_weights, matrix, phase_results in zip(weights, matrices, results):
+        predictions = 1.0 / (1.0 + np.exp(-scale * (matrix @ phase_weights)))
+        error += float(np.sum((phase_results - predictions) ** 2))
+        n_positions += len(phase_results)
+    return error / max(n_positions, 1)
+
+
+def _init_scorer(matrices: list[np.ndarray], results: list[np.ndarray], scale: float):
+    global _scorer_data
+    _init_worker()
+    _scorer_data = (matrices, results, scale)
+
+
+def _score(weights: np.ndarray) -> float:
+    return prediction_error(weights, *_scorer_data)  # type: ignore
+
+
+def fit_scale(
+    weights: np.ndarray, matrices: list[np.ndarray], results: list[np.ndarray]
+) -> float:
+    """Find the scale of the sigmoid that best predicts the results with `weights`.
+
+    Args:
+        weights (np.ndarray): The coefficients, one row per game phase.
+        matrices (list[np.ndarray]): The features of the positions of each phase.
+        results (list[np.ndarray]): The results of the positions of each phase.
+
+    Returns:
+        float: The scale of the evaluation.
+    """
+    scales = np.geomspace(0.1, 100.0, 61)
+    errors = [prediction_error(weights, matrices, results, scale) for scale in scales]
+    return float(scales[int(np.argmin(errors))])
+
+
+def tune_coefficients(
+    keys: np.ndarray,
+    results: np.ndarray,
+    evaluation_coefficients: dict[str, dict[str, float]] = EVALUATION_COEFFICIENTS,
+    step: float = 0.1,
+    min_step: float = 0.005,
+    max_iterations: int = 200,
+    n_processes: int = -1,
+    verbose: bool = True,
+) -> dict[str, dict[str, float]]:
+    """Fit the evaluation coefficients to the results of the positions.
+
+    The scale of the sigmoid is fitted first with the current coefficients and kept,
+    so that the values of the evaluation stay comparable. Each step of the search then
+    scores every coefficient moved up and down by `step` and keeps the best candidate,
+    and the step is halved when none of them improves the error.
+
+    Args:
+        keys (np.ndarray): The keys of the positions.
+        results (np.ndarray): The result of the game of each position.
+        evaluation_coefficients (dict[str, dict[str, float]], optional): The initial coefficients. Defaults to EVALUATION_COEFFICIENTS.
+        step (float, optional): The initial change of the coefficients. Defaults to 0.1.
+        min_step (float, optional): The change under which the search stops. Defaults to 0.005.
+        max_iterations (int, optional): The maximum number of steps. Defaults to 200.
+        n_processes (int, optional): The number of processes, -1 for all the cores. Defaults to -1.
+        verbose (bool, optional): Whether to print the progress. Defaults to True.
+
+    Returns:
+        dict[str, dict[str, float]]: The fitted coefficients of the features of
+            EVALUATION_FEATURES, for each game phase.
+    """
+    n_processes = cpu_count() if n_processes == -1 else n_processes
+    matrices, phase_results = feature_matrices(keys, results)
+    weights = np.array(
+        [
+            [
+                evaluation_coefficients[phase].get(feature, 0.0)
+                for feature in EVALUATION_FEATURES
+            ]
+            for phase in GAME_PHASES
+        ]
+    )
+    scale = fit_scale(weights, matrices, phase_results)
+    error = prediction_error(weights, matrices, phase_results, scale)
+    if verbose:
+        print("Scale : {:.3f}, initial error : {:.5f}".format(scale, error))
+
+    with Pool(
+        n_processes,
+        initializer=_init_scorer,
+        initargs=(matrices, phase_results, scale),
+    ) as pool:
+        for iteration in range(max_iterations):
+            if step < min_step:
+                break
+            candidates = []
+            for index in np.ndindex(weights.shape):
+                # Phases without positions keep their coefficients
+                if len(phase_results[index[0]]) == 0:
+                    continue
+                for sign in [1, -1]:
+                    candidate = weights.copy()
+                    candidate[index] += sign * step
+                    candidates.append(candidate)
+            errors = pool.map(_score, candidates)
+
+            best = int(np.argmin(errors))
+            if errors[best] < error:
+                weights, error = candidates[best], errors[best]
+            else:
+                step /= 2
+            if verbose:
+                print(
+                    "Iteration {}: error {:.5f}, step {:.4f}".format(
+                        iteration, error, step
+                    )
+                )
+
+    return {
+        phase: {
+            feature: round(float(weight), 4)
+            for feature, weight in zip(EVALUATION_FEATURES, phase_weights)
+        }
+        for phase, phase_weights in zip(GAME_PHASES, weights)
+    }
+
+
+def save_coefficients(
+    evaluation_coefficients: dict[str, dict[str, float]],
+    path: Path = EVALUATION_COEFFICIENTS_PATH,
+):
+    """Write coefficients to the file loaded in place of the hand-picked ones.
+
+    Args:
+        evaluation_coefficients (dict[str, dict[str, float]]): The coefficients.
+        path (Path, optional): The file to write. Defaults to EVALUATION_COEFFICIENTS_PATH.
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(evaluation_coefficients, indent=4))
+
+
+def main():
+    """Command line entry point of the evaluation tuning."""
+    parser = argparse.ArgumentParser(description="Tune the evaluation coefficients.")
+    parser.add_argument("--path", type=Path, default=EVALUATION_COEFFICIENTS_PATH)
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--random-plies", type=int, default=6)
+    parser.add_argument("--random-move-rate", type=float, default=0.2)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--processes", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start_time = time.time()
+    keys, results = generate_positions(
+        args.games,
+        args.depth,
+        args.random_plies,
+        args.random_move_rate,
+        args.processes,
+        args.seed,
+    )
+    print(
+        "{} positions from {} games in {:.1f}s".format(
+            len(keys), args.games, time.time() - start_time
+        )
+    )
+    evaluation_coefficients = tune_coefficients(
+        keys, results, max_iterations=args.iterations, n_processes=args.processes
+    )
+    save_coefficients(evaluation_coefficients, args.path)
+    print("Coefficients written to", args.path)
+
+
+if __name__ == "__main__":
+    main()
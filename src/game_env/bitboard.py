@@ -0,0 +1,383 @@
+# Bit mask representation of the board, with one bit per node in the order of NODES.
+from src.globals import NODES, NODE_INDEX, NODE_LOOKUP, Player
+from typing import TYPE_CHECKING, Any
+import numpy as np
+
+if TYPE_CHECKING:
+    from src.game_env.board import Board
+
+N_POINTS = len(NODES)
+
+NEIGHBOR_MASKS = np.array(
+    [
+        sum(1 << NODE_INDEX[neighbor] for neighbor in NODE_LOOKUP[node])
+        for node in NODES
+    ],
+    dtype=np.int64,
+)
+
+# Each mill is found once, from its middle node
+MILLS = np.array(
+    [
+        sorted([NODE_INDEX[first], NODE_INDEX[middle], NODE_INDEX[last]])
+        for middle in NODES
+        for i, first in enumerate(NODE_LOOKUP[middle])
+        for last in NODE_LOOKUP[middle][i + 1 :]
+        if first.x == middle.x == last.x or first.y == middle.y == last.y
+    ],
+    dtype=np.int64,
+)
+MILL_MASKS = (1 << MILLS).sum(axis=1)
+POINT_MILLS = [
+    np.flatnonzero((MILLS == point).any(axis=1)) for point in range(N_POINTS)
+]
+# Masks of the mills through each point, as Python integers for the board updates
+POINT_MILL_MASKS = [[int(MILL_MASKS[mill]) for mill in mills] for mills in POINT_MILLS]
+
+# Patterns of the evaluation features, as Python integers so that they apply to both
+# integer masks and arrays of masks. THREAT_PATTERNS holds (mill, two points, third
+# point), FORK_PATTERNS (point, then for both mills through it the mill and its two
+# other points) and MILL_EXITS the points next to a mill that are not part of it.
+THREAT_PATTERNS = [
+    (int(mill_mask), int(mill_mask) & ~(1 << int(point)), 1 << int(point))
+    for mill, mill_mask in zip(MILLS, MILL_MASKS)
+    for point in mill
+]
+FORK_PATTERNS = [
+    (
+        1 << point,
+        *[
+            (
+                int(MILL_MASKS[mill]),
+                *[1 << int(other) for other in MILLS[mill] if other != point],
+            )
+            for mill in POINT_MILLS[point]
+        ],
+    )
+    for point in range(N_POINTS)
+]
+MILL_EXITS = [
+    int(np.bitwise_or.reduce(NEIGHBOR_MASKS[mill])) & ~int(mill_mask)
+    for mill, mill_mask in zip(MILLS, MILL_MASKS)
+]
+
+# Counters of pieces per mill, packed in 4 bit fields of a Python integer: adding the
+# increment of a point adds one to the fields of the two mills through it
+FIELDS = sum(1 << 4 * mill for mill in range(len(MILLS)))
+POINT_MILL_INCREMENTS = [
+    sum(1 << 4 * int(mill) for mill in mills) for mills in POINT_MILLS
+]
+# The point shared by two mills, as a bit mask
+MILL_INTERSECTIONS = {
+    (first, second): int(MILL_MASKS[first] & MILL_MASKS[second])
+    for first in range(len(MILLS))
+    for second in range(first + 1, len(MILLS))
+    if MILL_MASKS[first] & MILL_MASKS[second]
+}
+# Union of the neighbours of the points of each byte of a mask
+_BYTE_NEIGHBORS = [
+    [
+        int(np.bitwise_or.reduce(NEIGHBOR_MASKS[8 * byte : 8 * byte + 8][bits]))
+        for bits in (np.arange(256)[:, None] >> np.arange(8) & 1 == 1)
+    ]
+    for byte in range(3)
+]
+_BYTE_NEIGHBOR_ARRAYS = np.array(_BYTE_NEIGHBORS, dtype=np.int64)
+
+
+def neighborhood(masks: Any) -> Any:
+    """Compute the points next to at least one point of each mask.
+
+    Args:
+        masks (Any): A mask, or an array of masks.
+
+    Returns:
+        Any: The masks of the neighbours.
+    """
+    if isinstance(masks, np.ndarray):
+        tables = _BYTE_NEIGHBOR_ARRAYS
+        return (
+            tables[0, masks & 255]
+            | tables[1, (masks >> 8) & 255]
+            | tables[2, (masks >> 16) & 255]
+        )
+    return (
+        _BYTE_NEIGHBORS[0][masks & 255]
+        | _BYTE_NEIGHBORS[1][(masks >> 8) & 255]
+        | _BYTE_NEIGHBORS[2][(masks >> 16) & 255]
+    )
+
+
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], np.int64)
+
+
+def popcount(masks: np.ndarray) -> np.ndarray:
+    """Count the set bits of each mask.
+
+    Args:
+        masks (np.ndarray): Masks of at most 24 bits.
+
+    Returns:
+        np.ndarray: The number of set bits of each mask.
+    """
+    return (
+        _BYTE_POPCOUNT[masks & 255]
+        + _BYTE_POPCOUNT[(masks >> 8) & 255]
+        + _BYTE_POPCOUNT[(masks >> 16) & 255]
+    )
+
+
+def mill_points(masks: np.ndarray) -> np.ndarray:
+    """Compute the points of each mask that belong to a complete mill.
+
+    Args:
+        masks (np.ndarray): The masks of the pieces of one player.
+
+    Returns:
+        np.ndarray: The masks of the pieces that are part of a mill.
+    """
+    in_mill = np.zeros_like(masks)
+    for mill_mask in MILL_MASKS:
+        in_mill |= np.where(masks & mill_mask == mill_mask, mill_mask, 0)
+    return in_mill
+
+
+def count_mills(masks: np.ndarray) -> np.ndarray:
+    """Count the complete mills of each mask.
+
+    Args:
+        masks (np.ndarray): The masks of the pieces of one player.
+
+    Returns:
+        np.ndarray: The number of mills of each mask.
+    """
+    n_mills = np.zeros_like(masks)
+    for mill_mask in MILL_MASKS:
+        n_mills += masks & mill_mask == mill_mask
+    return n_mills
+
+
+def free_neighbors(masks: np.ndarray, empty: np.ndarray) -> np.ndarray:
+    """Count the empty neighbours of the pieces of each mask, with multiplicity.
+
+    Args:
+        masks (np.ndarray): The masks of the pieces of one player.
+        empty (np.ndarray): The masks of the empty points.
+
+    Returns:
+        np.ndarray: The sum over the pieces of the number of their empty neighbours.
+    """
+    n_free = np.zeros_like(masks)
+    for point in range(N_POINTS):
+        n_free += ((masks >> point) & 1) * popcount(empty & NEIGHBOR_MASKS[point])
+    return n_free
+
+
+def mill_threats(masks: Any, empty: Any) -> Any:
+    """Count the mills with two pieces of a player and an empty third point.
+
+    Args:
+        masks (Any): The mask of the pieces of the player, or an array of masks.
+        empty (Any): The mask of the empty points, or an array of masks.
+
+    Returns:
+        Any: The number of open two-in-a-rows.
+    """
+    return sum(
+        ((masks & mill) == pair) & ((empty & point) != 0)
+        for mill, pair, point in THREAT_PATTERNS
+    )
+
+
+def double_threats(masks: Any, other_masks: Any, empty: Any) -> Any:
+    """Count the empty points where a piece of the player would open two mills at once.
+
+    A point qualifies when both mills through it hold one piece of the player and no
+    piece of the opponent.
+
+    Args:
+        masks (Any): The mask of the pieces of the player, or an array of masks.
+        other_masks (Any): The mask of the pieces of the opponent, or an array of masks.
+        empty (Any): The mask of the empty points, or an array of masks.
+
+    Returns:
+        Any: The number of double threat points.
+    """
+    n_points = 0
+    for point, (mill_1, a_1, b_1), (mill_2, a_2, b_2) in FORK_PATTERNS:
+        own_1, own_2 = masks & mill_1, masks & mill_2
+        n_points = n_points + (
+            ((empty & point) != 0)
+            & ((own_1 == a_1) | (own_1 == b_1))
+            & ((other_masks & mill_1) == 0)
+            & ((own_2 == a_2) | (own_2 == b_2))
+            & ((other_masks & mill_2) == 0)
+        )
+    return n_points
+
+
+def blocked_pieces(masks: np.ndarray, empty: np.ndarray) -> np.ndarray:
+    """Count the pieces of a player without any empty neighbour.
+
+    Args:
+        masks (np.ndarray): The masks of the pieces of the player.
+        empty (np.ndarray): The masks of the empty points.
+
+    Returns:
+        np.ndarray: The number of blocked pieces.
+    """
+    return popcount(masks & ~neighborhood(empty))
+
+
+def reopenable_mills(masks: Any, empty: Any) -> Any:
+    """Count the mills of a player with a piece able to step out and back in.
+
+    Args:
+        masks (Any): The mask of the pieces of the player, or an array of masks.
+        empty (Any): The mask of the empty points, or an array of masks.
+
+    Returns:
+        Any: The number of mills that can be opened and closed again.
+    """
+    return sum(
+        ((masks & int(mill)) == int(mill)) & ((empty & exits) != 0)
+        for mill, exits in zip(MILL_MASKS, MILL_EXITS)
+    )
+
+
+PATTERN_FEATURES = [
+    "mill_threats",
+    "double_threats",
+    "blocked_pieces",
+    "reopenable_mills",
+]
+
+
+def pattern_features(
+    orange: Any, white: Any, n_orange: Any, n_white: Any
+) -> dict[str, Any]:
+    """Compute the pattern features of the evaluation, from the point of view of orange.
+
+    Args:
+        orange (Any): The mask of the orange pieces, or an array of masks.
+        white (Any): The mask of the white pieces, or an array of masks.
+        n_orange (Any): The number of orange pieces, counted as in `Board.pieces`.
+        n_white (Any): The number of white pieces, counted as in `Board.pieces`.
+
+    Returns:
+        dict[str, Any]: The value of each feature of PATTERN_FEATURES, roughly in the
+            range [-1, 1].
+    """
+    empty = ~(orange | white) & 0xFFFFFF
+    return {
+        "mill_threats": (mill_threats(orange, empty) - mill_threats(white, empty))
+        / 8.0,
+        "double_threats": (
+            double_threats(orange, white, empty) - double_threats(white, orange, empty)
+        )
+        / 4.0,
+        # Blocked pieces only matter to the players who cannot fly
+        "blocked_pieces": (
+            (n_white > 3) * blocked_pieces(white, empty)
+            - (n_orange > 3) * blocked_pieces(orange, empty)
+        )
+        / 9.0,
+        "reopenable_mills": (
+            reopenable_mills(orange, empty) - reopenable_mills(white, empty)
+        )
+        / 4.0,
+    }
+
+
+def _fields_equal(counters: int, value: int) -> int:
+    # The lowest bit of each field equal to the value is set
+    difference = counters ^ (value * FIELDS)
+    nonzero = (
+        difference | difference >> 1 | difference >> 2 | difference >> 3
+    ) & FIELDS
+    return FIELDS & ~nonzero
+
+
+def _field_indices(fields: int) -> list[int]:
+    indices = []
+    while fields:
+        lowest = fields & -fields
+        indices.append(lowest.bit_length() // 4)
+        fields ^= lowest
+    return indices
+
+
+def counter_pattern_features(
+    orange: int,
+    white: int,
+    orange_counters: int,
+    white_counters: int,
+    n_orange: int,
+    n_white: int,
+) -> dict[str, float]:
+    """Compute `pattern_features` of a single position from its mill counters.
+
+    The counters are kept by the board, so the features only cost a few operations on
+    integers and loops over the few mills and pieces concerned.
+
+    Args:
+        orange (int): The mask of the orange pieces.
+        white (int): The mask of the white pieces.
+        orange_counters (int): The packed number of orange pieces of each mill.
+        white_counters (int): The packed number of white pieces of each mill.
+        n_orange (int): The number of orange pieces, counted as in `Board.pieces`.
+        n_white (int): The number of white pieces, counted as in `Board.pieces`.
+
+    Returns:
+        dict[str, float]: The value of each feature of PATTERN_FEATURES.
+    """
+    empty = ~(orange | white) & 0xFFFFFF
+    counts = {}
+    for player, masks, counters, other_counters, n_pieces in [
+        ("orange", orange, orange_counters, white_counters, n_orange),
+        ("white", white, white_counters, orange_counters, n_white),
+    ]:
+        free_mills = _fields_equal(other_counters, 0)
+        n_threats = (_fields_equal(counters, 2) & free_mills).bit_count()
+
+        # Two mills holding a single piece of the player meet on an empty point
+        single_mills = _field_indices(_fields_equal(counters, 1) & free_mills)
+        n_double_threats = sum(
+            (MILL_INTERSECTIONS.get((first, second), 0) & empty) != 0
+            for i, first in enumerate(single_mills)
+            for second in single_mills[i + 1 :]
+        )
+
+        n_blocked = 0
+        if n_pieces > 3:
+            n_blocked = (masks & ~neighborhood(empty)).bit_count()
+
+        n_reopenable = sum(
+            MILL_EXITS[mill] & empty != 0
+            for mill in _field_indices(_fields_equal(counters, 3))
+        )
+        counts[player] = n_threats, n_double_threats, n_blocked, n_reopenable
+
+    (orange_threats, orange_doubles, orange_blocked, orange_reopenable) = counts[
+        "orange"
+    ]
+    (white_threats, white_doubles, white_blocked, white_reopenable) = counts["white"]
+    return {
+        "mill_threats": (orange_threats - white_threats) / 8.0,
+        "double_threats": (orange_doubles - white_doubles) / 4.0,
+        "blocked_pieces": (white_blocked - orange_blocked) / 9.0,
+        "reopenable_mills": (orange_reopenable - white_reopenable) / 4.0,
+    }
+
+
+def board_masks(board: "Board") -> dict[Player, int]:
+    """Return the masks of the pieces of each player on the board.
+
+    Args:
+        board (Board): The board.
+
+    Returns:
+        dict[Player, int]: The mask of each player, pieces still in hand excluded.
+    """
+    key = board.key()
+    return {Player.orange: key & 0xFFFFFF, Player.white: (key >> 24) & 0xFFFFFF}
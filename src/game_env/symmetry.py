@@ -0,0 +1,175 @@
+# Symmetries of the board: the 8 rotations and reflections of the square, each
+# combined or not with the exchange of the inner and outer rings.
+from src.game_env.board import Board
+from src.game_env.bitboard import N_POINTS
+from src.game_env.node import Node
+from src.globals import NODES, NODE_INDEX
+from typing import Any, Optional
+import numpy as np
+
+# Index of the source of the moves that place a piece from the hand or capture
+HAND = N_POINTS
+
+_RING_SWAP = {0: 2, 2: 0, 4: 6, 6: 4}
+
+
+def _transform(node: Node, symmetry: int) -> Node:
+    x, y = node.x, node.y
+    if symmetry & 8:
+        x, y = _RING_SWAP.get(x, x), _RING_SWAP.get(y, y)
+    if symmetry & 4:
+        x = 6 - x
+    for _ in range(symmetry & 3):
+        x, y = 6 - y, x
+    return Node.from_coords(x, y)
+
+
+# SYMMETRIES[symmetry, point] is the image of the point
+SYMMETRIES = np.array(
+    [
+        [NODE_INDEX[_transform(node, symmetry)] for node in NODES]
+        for symmetry in range(16)
+    ],
+    dtype=np.int64,
+)
+N_SYMMETRIES = len(SYMMETRIES)
+
+# Images of each byte of a mask, so that a mask is transformed with three lookups
+_BYTE_IMAGES = np.zeros((N_SYMMETRIES, 3, 256), dtype=np.int64)
+for _symmetry in range(N_SYMMETRIES):
+    for _byte in range(3):
+        for _bit in range(8):
+            _point = 8 * _byte + _bit
+            if _point < N_POINTS:
+                _BYTE_IMAGES[_symmetry, _byte, (np.arange(256) >> _bit) & 1 == 1] |= (
+                    1 << int(SYMMETRIES[_symmetry, _point])
+                )
+
+
+def transform_masks(masks: np.ndarray, symmetries: np.ndarray | int) -> np.ndarray:
+    """Apply symmetries to masks of points.
+
+    Args:
+        masks (np.ndarray): The masks to transform.
+        symmetries (np.ndarray | int): The symmetry applied to each mask, or to all of them.
+
+    Returns:
+        np.ndarray: The transformed masks.
+    """
+    masks = np.asarray(masks, dtype=np.int64)
+    return (
+        _BYTE_IMAGES[symmetries, 0, masks & 255]
+        | _BYTE_IMAGES[symmetries, 1, (masks >> 8) & 255]
+        | _BYTE_IMAGES[symmetries, 2, (masks >> 16) & 255]
+    )
+
+
+def canonical_masks(masks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Find the smallest image of each mask under the symmetries of the board.
+
+    Args:
+        masks (np.ndarray): The masks to reduce.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The canonical masks and, for each mask, a
+            symmetry mapping it to its canonical mask.
+    """
+    masks = np.asarray(masks, dtype=np.int64)
+    images = np.stack(
+        [transform_masks(masks, symmetry) for symmetry in range(N_SYMMETRIES)]
+    )
+    symmetries = images.argmin(axis=0)
+    return np.take_along_axis(images, symmetries[None], axis=0)[0], symmetries
+
+
+def canonical_keys(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Find the smallest image of each position key under the symmetries of the board.
+
+    The pieces of both players are transformed together, the other fields of the
+    key are left unchanged.
+
+    Args:
+        keys (np.ndarray): Position keys, as returned by `Board.key`.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The canonical keys and, for each key, a
+            symmetry mapping it to its canonical key.
+    """
+    keys = np.asarray(keys, dtype=np.int64)
+    orange_masks, white_masks = keys & 0xFFFFFF, (keys >> 24) & 0xFFFFFF
+    other_fields = keys & ~np.int64(0xFFFFFFFFFFFF)
+    images = np.stack(
+        [
+            transform_masks(orange_masks, symmetry)
+            | (transform_masks(white_masks, symmetry) << 24)
+            | other_fields
+            for symmetry in range(N_SYMMETRIES)
+        ]
+    )
+    symmetries = images.argmin(axis=0)
+    return np.take_along_axis(images, symmetries[None], axis=0)[0], symmetries
+
+
+def encode_move(
+    board: Board, move: tuple[int | None, Any, Any], symmetry: int
+) -> tuple[int, int]:
+    """Encode a move as the indices of its points in a symmetric image of the board.
+
+    Args:
+        board (Board): The board the move is played on.
+        move (tuple[int | None, Node, Action]): The move.
+        symmetry (int): The symmetry applied to the board.
+
+    Returns:
+        tuple[int, int]: The index of the point the move leaves, HAND for a piece
+            placed from the hand or a capture, and of the point it targets.
+    """
+    source = HAND
+    if move[0] is not None:
+        piece = board.piece_mapping[move[0]]  # type: ignore
+        if not piece.first_move:
+            source = int(SYMMETRIES[symmetry, NODE_INDEX[piece.piece.node]])
+    return source, int(SYMMETRIES[symmetry, NODE_INDEX[move[1]]])
+
+
+def decode_move(
+    board: Board, possible_moves: list[Any], source: int, target: int, symmetry: int
+) -> Optional[Any]:
+    """Find the legal move encoded by `encode_move` in a symmetric image of the board.
+
+    Args:
+        board (Board): The board the move is played on.
+        possible_moves (list[Any]): The legal moves of the board.
+        source (int): The index of the point the move leaves in the image, or HAND.
+        target (int): The index of the point the move targets in the image.
+        symmetry (int): The symmetry mapping the board to the image.
+
+    Returns:
+        Optional[Any]: The legal move, or None if none of them matches.
+    """
+    inverse = np.argsort(SYMMETRIES[symmetry])
+    target_node = NODES[inverse[target]]
+    source_node = None if source == HAND else NODES[inverse[source]]
+    for move in possible_moves:
+        piece = board.piece_mapping[move[0]] if move[0] is not None else None  # type: ignore
+        move_source = None if piece is None or piece.first_move else piece.piece.node
+        if move[1] == target_node and move_source == source_node:
+            return move
+    return None
+
+
+def stabilizer(key: int) -> list[int]:
+    """Find the symmetries that leave a position unchanged.
+
+    Args:
+        key (int): The key of the position, as returned by `Board.key`.
+
+    Returns:
+        list[int]: The symmetries mapping the pieces of both players onto themselves,
+            the identity included.
+    """
+    images = transform_masks(
+        np.array([key & 0xFFFFFF, (key >> 24) & 0xFFFFFF])[None],
+        np.arange(N_SYMMETRIES)[:, None],
+    )
+    return np.flatnonzero((images == images[0]).all(axis=1)).tolist()
@@ -0,0 +1,452 @@
+# Endgame tablebases, built by retrograde analysis and memory-mapped at probe time.
+#
+# A table covers the positions where the player to move has `a` pieces and the
+# opponent `b`, all of them on the board. Its rows are the sets of `a` points that are
+# the smallest of their images under the symmetries of the board, and its columns all
+# the sets of `b` points, ranked in colexicographic order. A position is stored in the
+# row of its symmetric image where the pieces of the player to move are canonical.
+#
+# Each entry is a byte: 0 for a draw, otherwise the distance to the end of the game in
+# plies plus one, odd for a loss of the player to move and even for a win. The tables
+# follow the standard rules, where every mill formed allows a capture, even when the
+# same pieces close it again, and they ignore the draw after MIN_DRAW_MOVES quiet
+# moves. Their values are therefore not exact in this game, and the agents only use
+# them to order their moves.
+from src.game_env.board import Board
+from src.game_env.bitboard import (
+    MILL_MASKS,
+    N_POINTS,
+    NEIGHBOR_MASKS,
+    POINT_MILLS,
+    mill_points,
+    popcount,
+)
+from src.game_env.symmetry import canonical_masks, transform_masks
+from src.globals import TABLEBASE_DIRECTORY, Outcome, Phase
+from typing import Any, Optional
+from itertools import combinations
+from math import comb
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+import argparse
+import dataclasses as dc
+import numpy as np
+import signal
+
+DEFAULT_MATERIALS = [(3, 3), (3, 4), (4, 3), (4, 4), (3, 5), (5, 3)]
+MAX_DISTANCE = 254
+
+
+def _subsets(n_pieces: int) -> np.ndarray:
+    # All the sets of `n_pieces` points, the colexicographic order being the order
+    # of the masks
+    masks = [
+        sum(1 << point for point in points)
+        for points in combinations(range(N_POINTS), n_pieces)
+    ]
+    return np.array(sorted(masks), dtype=np.int64)
+
+
+# Contribution of each byte of a mask to its colexicographic rank, given the number of
+# set bits in the lower bytes
+_RANK_TABLES = np.zeros((3, N_POINTS + 1, 256), dtype=np.int64)
+for _byte in range(3):
+    for _n_lower in range(N_POINTS + 1):
+        for _value in range(256):
+            _count = _n_lower
+            for _bit in range(8):
+                if _value >> _bit & 1:
+                    _count += 1
+                    _RANK_TABLES[_byte, _n_lower, _value] += comb(
+                        8 * _byte + _bit, _count
+                    )
+
+
+def rank_masks(masks: np.ndarray) -> np.ndarray:
+    """Compute the colexicographic rank of masks among the masks with as many bits.
+
+    Args:
+        masks (np.ndarray): The masks to rank.
+
+    Returns:
+        np.ndarray: The rank of each mask.
+    """
+    masks = np.asarray(masks, dtype=np.int64)
+    low, middle, high = masks & 255, (masks >> 8) & 255, (masks >> 16) & 255
+    n_low = popcount(low)
+    return (
+        _RANK_TABLES[0, 0, low]
+        + _RANK_TABLES[1, n_low, middle]
+        + _RANK_TABLES[2, n_low + popcount(middle), high]
+    )
+
+
+@dc.dataclass
+class _Indexing:
+    # Rows of the tables whose player to move has `n_pieces` pieces
+    n_pieces: int
+    subsets: np.ndarray = dc.field(init=False)
+    rows: np.ndarray = dc.field(init=False)
+    subset_rows: np.ndarray = dc.field(init=False)
+    subset_symmetries: np.ndarray = dc.field(init=False)
+
+    def __post_init__(self):
+        self.subsets = _subsets(self.n_pieces)
+        canonical, self.subset_symmetries = canonical_masks(self.subsets)
+        self.rows, self.subset_rows = np.unique(canonical, return_inverse=True)
+
+
+_INDEXINGS: dict[int, _Indexing] = {}
+
+
+def _indexing(n_pieces: int) -> _Indexing:
+    if n_pieces not in _INDEXINGS:
+        _INDEXINGS[n_pieces] = _Indexing(n_pieces)
+    return _INDEXINGS[n_pieces]
+
+
+def table_path(directory: Path, material: tuple[int, int]) -> Path:
+    """Return the path of the table of a material configuration.
+
+    Args:
+        directory (Path): The directory of the tables.
+        material (tuple[int, int]): The number of pieces of the player to move and of the opponent.
+
+    Returns:
+        Path: The path of the table.
+    """
+    return Path(directory) / "{}v{}.bin".format(*material)
+
+
+def table_shape(material: tuple[int, int]) -> tuple[int, int]:
+    """Return the shape of the table of a material configuration.
+
+    Args:
+        material (tuple[int, int]): The number of pieces of the player to move and of the opponent.
+
+    Returns:
+        tuple[int, int]: The number of rows and columns of the table.
+    """
+    return len(_indexing(material[0]).rows), comb(N_POINTS, material[1])
+
+
+@dc.dataclass
+class Tablebase:
+    """Class to probe the endgame tables found in a directory.
+
+    Args:
+        directory (Path, optional): The directory of the tables. Defaults to TABLEBASE_DIRECTORY.
+
+    Attributes:
+        tables (dict[tuple[int, int], np.memmap]): The memory-mapped table of each material configuration.
+    """
+
+    directory: Path = TABLEBASE_DIRECTORY
+    tables: dict[tuple[int, int], np.memmap] = dc.field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def __post_init__(self):
+        for path in sorted(Path(self.directory).glob("*v*.bin")):
+            material = tuple(int(n_pieces) for n_pieces in path.stem.split("v"))
+            self.tables[material] = np.memmap(  # type: ignore
+                path,
+                dtype=np.uint8,
+                mode="r",
+                shape=table_shape(material),  # type: ignore
+            )
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The tables are mapped again by the process that receives the tablebase
+        return {"directory": self.directory}
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.tables = {}
+        self.__post_init__()
+
+    def probe(self, board: Board) -> Optional[tuple[Outcome, int]]:
+        """Look the position up in the tables.
+
+        Args:
+            board (Board): The board, with all the pieces placed and no capture pending.
+
+        Returns:
+            Optional[tuple[Outcome, int]]: The outcome for the player to move and the
+                distance to the end of the game in plies, or None if no table covers
+                the position.
+        """
+        if not self.tables or board.phase != Phase.moving:
+            return None
+        return self.probe_key(board.key())
+
+    def probe_key(self, key: int) -> Optional[tuple[Outcome, int]]:
+        """Look up the position of a key, as returned by `Board.key`, in the tables.
+
+        Args:
+            key (int): The key of the position.
+
+        Returns:
+            Optional[tuple[Outcome, int]]: The outcome for the player to move and the
+                distance to the end of the game in plies, or None if no table covers
+                the position.
+        """
+        # Pieces in hand or a pending capture
+        if not self.tables or (key >> 48) & 0xFF or (key >> 57) & 1:
+            return None
+
+        orange, white = key & 0xFFFFFF, (key >> 24) & 0xFFFFFF
+        mover, other = (white, orange) if (key >> 56) & 1 else (orange, white)
+        material = (mover.bit_count(), other.bit_count())
+        table = self.tables.get(material)
+        if table is None:
+            return None
+
+        value = int(_lookup(table, material, mover, other))
+        if value == 0:
+            return Outcome.draw, 0
+        return (Outcome.loss if value % 2 else Outcome.win), value - 1
+
+
+def _lookup(
+    table: np.ndarray, material: tuple[int, int], mover_masks: Any, other_masks: Any
+) -> np.ndarray:
+    indexing = _indexing(material[0])
+    subset_ranks = rank_masks(mover_masks)
+    symmetries = indexing.subset_symmetries[subset_ranks]
+    columns = rank_masks(transform_masks(other_masks, symmetries))
+    return table[indexing.subset_rows[subset_ranks], columns]
+
+
+# Tables of the running generation, mapped by each worker process
+_tables: dict[tuple[int, int], np.memmap] = {}
+
+
+def _init_worker(directory: Path, materials: list[tuple[int, int]]):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    for material in materials:
+        _tables[material] = np.memmap(
+            table_path(directory, material),
+            dtype=np.uint8,
+            mode="r",
+            shape=table_shape(material),
+        )
+
+
+def _solve_rows(
+    material: tuple[int, int], rows: list[int]
+) -> list[tuple[int, np.ndarray, np.ndarray]]:
+    """Compute the entries of the rows that become known with the current tables.
+
+    Returns:
+        list[tuple[int, np.ndarray, np.ndarray]]: The row, columns and values of the new entries.
+    """
+    n_mover, n_other = material
+    table = _tables[material]
+    other_masks = _indexing(n_other).subsets
+    updates = []
+
+    for row in rows:
+        known = table[row]
+        mover_mask = int(_indexing(n_mover).rows[row])
+        unknown = (known == 0) & (other_masks & mover_mask == 0)
+        if not unknown.any():
+            continue
+
+        columns = np.flatnonzero(unknown)
+        others = other_masks[columns]
+        other_in_mill = mill_points(others)
+        all_in_mills = other_in_mill == others
+
+        # Values of the successors, seen from the opponent, and their number
+        best_win = np.full(len(columns), 256, dtype=np.int64)
+        n_successors = np.zeros(len(columns), dtype=np.int64)
+        n_losing = np.zeros(len(columns), dtype=np.int64)
+        longest_loss = np.zeros(len(columns), dtype=np.int64)
+
+        def add_successors(
+            values: np.ndarray,
+            valid: np.ndarray,
+            n_successors: np.ndarray = n_successors,
+            best_win: np.ndarray = best_win,
+            n_losing: np.ndarray = n_losing,
+            longest_loss: np.ndarray = longest_loss,
+        ):
+            n_successors[valid] += 1
+            opponent_loses = valid & (values % 2 == 1)
+            np.minimum(best_win, np.where(opponent_loses, values, 256), out=best_win)
+            opponent_wins = valid & (values > 0) & (values % 2 == 0)
+            n_losing[opponent_wins] += 1
+            np.maximum(
+                longest_loss, np.where(opponent_wins, values, 0), out=longest_loss
+            )
+
+        for start in range(N_POINTS):
+            if not mover_mask >> start & 1:
+                continue
+            if n_mover == 3:
+                targets = ~mover_mask & ((1 << N_POINTS) - 1)
+            else:
+                targets = int(NEIGHBOR_MASKS[start]) & ~mover_mask
+            for end in range(N_POINTS):
+                if not targets >> end & 1:
+                    continue
+                valid = others >> end & 1 == 0
+                moved_mask = mover_mask & ~(1 << start) | 1 << end
+                forms_mill = any(
+                    moved_mask & MILL_MASKS[mill] == MILL_MASKS[mill]
+                    for mill in POINT_MILLS[end]
+                )
+                if not forms_mill:
+                    values = _lookup(
+                        _tables[(n_other, n_mover)],
+                        (n_other, n_mover),
+                        others,
+                        moved_mask,
+                    )
+                    add_successors(values.astype(np.int64), valid)
+                    continue
+
+                for captured in range(N_POINTS):
+                    capturable = (
+                        valid
+                        & (others >> captured & 1 == 1)
+                        & ((other_in_mill >> captured & 1 == 0) | all_in_mills)
+                    )
+                    if not capturable.any():
+                        continue
+                    if n_other - 1 < 3:
+                        # The opponent is left with two pieces and loses
+                        add_successors(np.ones(len(columns), np.int64), capturable)
+                        continue
+                    values = np.zeros(len(columns), dtype=np.int64)
+                    values[capturable] = _lookup(
+                        _tables[(n_other - 1, n_mover)],
+                        (n_other - 1, n_mover),
+                        others[capturable] & ~(1 << captured),
+                        moved_mask,
+                    )
+                    add_successors(values, capturable)
+
+        values = np.zeros(len(columns), dtype=np.int64)
+        wins = best_win < 256
+        values[wins] = np.minimum(best_win[wins] + 1, MAX_DISTANCE)
+        losses = ~wins & (n_losing == n_successors)
+        values[losses] = longest_loss[losses] + 1
+        new = values > 0
+        if new.any():
+            updates.append((row, columns[new], values[new].astype(np.uint8)))
+
+    return updates
+
+
+def generate_tablebases(
+    directory: Path = TABLEBASE_DIRECTORY,
+    materials: list[tuple[int, int]] = DEFAULT_MATERIALS,
+    n_processes: int = -1,
+    verbose: bool = True,
+):
+    """Build endgame tables by retrograde analysis.
+
+    The tables of a material configuration and of its mirror, which follow each other
+    in a game, are solved together. All the entries are recomputed from the tables of
+    the previous iteration until none changes, the rows being shared out among a pool
+    of worker processes.
+
+    Args:
+        directory (Path, optional): The directory to write the tables to. Defaults to TABLEBASE_DIRECTORY.
+        materials (list[tuple[int, int]], optional): The material configurations to build. Defaults to DEFAULT_MATERIALS.
+        n_processes (int, optional): The number of worker processes, -1 for all cores. Defaults to -1.
+        verbose (bool, optional): Whether to print the progress. Defaults to True.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    n_processes = cpu_count() if n_processes == -1 else n_processes
+
+    built = set()
+    for material in sorted(materials, key=lambda material: (sum(material), material)):
+        if material in built:
+            continue
+        group = sorted({material, material[::-1]})
+        for n_mover, n_other in group:
+            if min(n_mover, n_other) < 3:
+                raise ValueError(
+                    f"Tables need at least 3 pieces per player: {material}"
+                )
+            if n_other > 3 and (n_other - 1, n_mover) not in built:
+                raise ValueError(
+                    f"The table {(n_other - 1, n_mover)} is needed before {(n_mover, n_other)}"
+                )
+        for member in group:
+            table = np.memmap(
+                table_path(directory, member),
+                dtype=np.uint8,
+                mode="w+",
+                shape=table_shape(member),
+            )
+            table.flush()
+            del table
+
+        tables = {
+            member: np.memmap(
+                table_path(directory, member),
+                dtype=np.uint8,
+                mode="r+",
+                shape=table_shape(member),
+            )
+            for member in group
+        }
+        dependencies = sorted(
+            {(n_other - 1, n_mover) for n_mover, n_other in group if n_other > 3}
+            | set(group)
+        )
+        with Pool(
+            n_processes, initializer=_init_worker, initargs=(directory, dependencies)
+        ) as pool:
+            iteration = 0
+            while True:
+                iteration += 1
+                tasks = [
+                    (member, list(rows))
+                    for member in group
+                    for rows in np.array_split(
+                        np.arange(table_shape(member)[0]), 4 * n_processes
+                    )
+                    if len(rows)
+                ]
+                n_new = 0
+                results = pool.starmap(_solve_rows, tasks)
+                for (member, _), updates in zip(tasks, results):
+                    for row, columns, values in updates:
+                        tables[member][row, columns] = values
+                        n_new += len(columns)
+                for table in tables.values():
+                    table.flush()
+                if verbose:
+                    print(f"Tables {group}, iteration {iteration}: {n_new} new entries")
+                if n_new == 0:
+                    break
+        built.update(group)
+
+
+def main():
+    """Command line entry point of the tablebase generator."""
+    parser = argparse.ArgumentParser(description="Build endgame tablebases.")
+    parser.add_argument("--directory", type=Path, default=TABLEBASE_DIRECTORY)
+    parser.add_argument(
+        "--materials",
+        nargs="+",
+        default=["{}v{}".format(*material) for material in DEFAULT_MATERIALS],
+        help="Material configurations such as 3v4, player to move first.",
+    )
+    parser.add_argument("--processes", type=int, default=-1)
+    args = parser.parse_args()
+    generate_tablebases(
+        args.directory,
+        [tuple(int(n) for n in material.split("v")) for material in args.materials],  # type: ignore
+        args.processes,
+    )
+
+
+if __name__ == "__main__":
+    main()
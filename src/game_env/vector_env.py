@@ -0,0 +1,314 @@
+# Many games played at once, stored as NumPy arrays instead of `Board` objects.
+#
+# The moves are integers `source * N_POINTS + target`, with the source HAND for the
+# pieces placed from the hand and for the captures, as in `symmetry.encode_move`. The
+# rules are those of `Board` and `AutonomousAgent.make_move`: a mill allows a capture
+# only the first time its three pieces form it, the pieces in a mill can only be
+# captured when all the pieces of the player are in mills, a player with three pieces
+# flies, and a player with fewer than three pieces or without a legal move loses.
+from src.game_env.bitboard import (
+    MILL_MASKS,
+    MILLS,
+    N_POINTS,
+    NEIGHBOR_MASKS,
+    mill_points,
+    popcount,
+)
+from src.game_env.symmetry import HAND
+from src.globals import MIN_DRAW_MOVES
+from typing import Callable, Optional
+from itertools import combinations, permutations
+import dataclasses as dc
+import numpy as np
+
+N_MOVES = (N_POINTS + 1) * N_POINTS
+N_PIECES = 9
+
+ORANGE, WHITE = 0, 1
+
+_FULL_MASK = (1 << N_POINTS) - 1
+_POINT_BITS = np.int64(1) << np.arange(N_POINTS, dtype=np.int64)
+
+# Index of each set of three pieces of a player, in the order they were placed, so
+# that the mills a player formed are bits of a fixed size history
+_TRIPLES = list(combinations(range(N_PIECES), 3))
+_TRIPLE_INDEX = np.zeros((N_PIECES,) * 3, dtype=np.int64)
+for _index, _triple in enumerate(_TRIPLES):
+    for _permutation in permutations(_triple):
+        _TRIPLE_INDEX[_permutation] = _index
+_N_HISTORY_WORDS = -(-2 * len(_TRIPLES) // 64)
+
+
+def _bits(masks: np.ndarray) -> np.ndarray:
+    # One boolean column per point
+    return masks[:, None] & _POINT_BITS != 0
+
+
+@dc.dataclass
+class VectorEnv:
+    """Class to play many games at once.
+
+    Args:
+        n_games (int): The number of games.
+        max_quiet_moves (int, optional): The number of moves without capture after the placing phase after which a game is a draw. Defaults to MIN_DRAW_MOVES.
+
+    Attributes:
+        masks (np.ndarray): The points occupied by each player, one row per game.
+        piece_ids (np.ndarray): The rank in which each piece on a point was placed by its player, -1 for the empty points.
+        in_hand (np.ndarray): The number of pieces each player has still to place.
+        turn (np.ndarray): The player to move, ORANGE or WHITE.
+        capturing (np.ndarray): Whether the player to move captures a piece.
+        quiet_moves (np.ndarray): The number of moves since the last capture, after the placing phase.
+        winner (np.ndarray): The winner of each game, -1 while there is none.
+        draw (np.ndarray): Whether each game is a draw.
+        mill_history (np.ndarray): The mills formed by each set of three pieces, as bits.
+    """
+
+    n_games: int
+    max_quiet_moves: int = MIN_DRAW_MOVES
+    masks: np.ndarray = dc.field(init=False, repr=False)
+    piece_ids: np.ndarray = dc.field(init=False, repr=False)
+    in_hand: np.ndarray = dc.field(init=False, repr=False)
+    turn: np.ndarray = dc.field(init=False, repr=False)
+    capturing: np.ndarray = dc.field(init=False, repr=False)
+    quiet_moves: np.ndarray = dc.field(init=False, repr=False)
+    winner: np.ndarray = dc.field(init=False, repr=False)
+    draw: np.ndarray = dc.field(init=False, repr=False)
+    mill_history: np.ndarray = dc.field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.masks = np.zeros((self.n_games, 2), dtype=np.int64)
+        self.piece_ids = np.full((self.n_games, N_POINTS), -1, dtype=np.int8)
+        self.in_hand = np.full((self.n_games, 2), N_PIECES, dtype=np.int64)
+        self.turn = np.zeros(self.n_games, dtype=np.int64)
+        self.capturing = np.zeros(self.n_games, dtype=bool)
+        self.quiet_moves = np.zeros(self.n_games, dtype=np.int64)
+        self.winner = np.full(self.n_games, -1, dtype=np.int64)
+        self.draw = np.zeros(self.n_games, dtype=bool)
+        self.mill_history = np.zeros(
+            (self.n_games, len(MILLS), _N_HISTORY_WORDS), dtype=np.uint64
+        )
+
+    @property
+    def done(self) -> np.ndarray:
+        """Whether each game is over."""
+        return (self.winner >= 0) | self.draw
+
+    def reset(self, games: Optional[np.ndarray] = None) -> np.ndarray:
+        """Start the games again from the empty board.
+
+        Args:
+            games (Optional[np.ndarray], optional): The games to reset, all of them if None. Defaults to None.
+
+        Returns:
+            np.ndarray: The keys of the positions of all the games.
+        """
+        games = slice(None) if games is None else games  # type: ignore
+        self.masks[games] = 0
+        self.piece_ids[games] = -1
+        self.in_hand[games] = N_PIECES
+        self.turn[games] = ORANGE
+        self.capturing[games] = False
+        self.quiet_moves[games] = 0
+        self.winner[games] = -1
+        self.draw[games] = False
+        self.mill_history[games] = 0
+        return self.keys()
+
+    def take(self, games: np.ndarray) -> "VectorEnv":
+        """Copy some of the games into a new environment.
+
+        Args:
+            games (np.ndarray): The indices of the games, repeated to copy a game several times.
+
+        Returns:
+            VectorEnv: The environment of the copied games.
+        """
+        env = VectorEnv(len(games), self.max_quiet_moves)
+        for field in dc.fields(self):
+            if not field.init:
+                setattr(env, field.name, getattr(self, field.name)[games].copy())
+        return env
+
+    def keys(self) -> np.ndarray:
+        """Compute the keys of the positions, as `Board.key` does.
+
+        Returns:
+            np.ndarray: The key of each position.
+        """
+        return (
+            self.masks[:, ORANGE]
+            | self.masks[:, WHITE] << 24
+            | self.in_hand[:, ORANGE] << 48
+            | self.in_hand[:, WHITE] << 52
+            | self.turn << 56
+            | self.capturing.astype(np.int64) << 57
+        )
+
+    def legal_moves(self) -> np.ndarray:
+        """Compute the legal moves of all the games.
+
+        Returns:
+            np.ndarray: A boolean mask of shape (n_games, N_MOVES), empty for the games
+                that are over.
+        """
+        games = np.arange(self.n_games)
+        own = self.masks[games, self.turn]
+        other = self.masks[games, 1 - self.turn]
+        empty = ~(own | other) & _FULL_MASK
+        legal = np.zeros((self.n_games, N_POINTS + 1, N_POINTS), dtype=bool)
+
+        # Pieces in a mill can be captured when all the pieces are in mills
+        other_in_mill = mill_points(other)
+        capturable = np.where(other_in_mill == other, other, other & ~other_in_mill)
+        placing = ~self.capturing & (self.in_hand[games, self.turn] > 0)
+        legal[:, HAND] = _bits(
+            np.where(self.capturing, capturable, np.where(placing, empty, 0))
+        )
+
+        moving = ~self.capturing & ~placing
+        flying = popcount(own) <= 3
+        for source in range(N_POINTS):
+            movable = moving & (own >> source & 1 == 1)
+            if movable.any():
+                targets = np.where(flying, empty, empty & NEIGHBOR_MASKS[source])
+                legal[movable, source] = _bits(targets[movable])
+
+        legal[self.done] = False
+        return legal.reshape(self.n_games, N_MOVES)
+
+    def step(
+        self, moves: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Play a move in each game that is not over.
+
+        Args:
+            moves (np.ndarray): The move of each game, ignored for the games that are over.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]: The keys of the new
+                positions, their legal moves, the result of each game, 1 when orange
+                wins, -1 when white wins and 0 otherwise, and whether each game is over.
+        """
+        active = ~self.done
+        self._play(np.asarray(moves, dtype=np.int64), active)
+
+        # Fewer than three pieces lose once all the pieces are drawn from the hand
+        n_pieces = popcount(self.masks) + (self.in_hand > 0)
+        drawn = (self.in_hand <= 1).all(axis=1)
+        lost = active & drawn & (n_pieces < 3).any(axis=1)
+        self.winner[lost] = np.where(n_pieces[lost, WHITE] < 3, ORANGE, WHITE)
+        self.draw |= active & ~lost & (self.quiet_moves > self.max_quiet_moves)
+
+        # A player without a legal move loses
+        legal = self.legal_moves()
+        stuck = active & ~self.done & ~legal.any(axis=1)
+        self.winner[stuck] = 1 - self.turn[stuck]
+
+        results = np.where(
+            self.winner == ORANGE, 1, np.where(self.winner == WHITE, -1, 0)
+        )
+        return self.keys(), legal, results, self.done
+
+    def _play(self, moves: np.ndarray, active: np.ndarray):
+        sources, targets = moves // N_POINTS, moves % N_POINTS
+        target_bits = np.int64(1) << targets
+        after_placing = (self.in_hand == 0).all(axis=1)
+
+        # Captures
+        games = np.flatnonzero(active & self.capturing)
+        others = 1 - self.turn[games]
+        self.masks[games, others] &= ~target_bits[games]
+        self.piece_ids[games, targets[games]] = -1
+        self.capturing[games] = False
+        self.quiet_moves[games] = 0
+        self.turn[games] = others
+        captured = games
+
+        # Pieces placed or moved
+        games = np.setdiff1d(np.flatnonzero(active), captured, assume_unique=True)
+        turns = self.turn[games]
+        placing = self.in_hand[games, turns] > 0
+        placed, moved = games[placing], games[~placing]
+        self.piece_ids[placed, targets[placed]] = (
+            N_PIECES - self.in_hand[placed, turns[placing]]
+        )
+        self.in_hand[placed, turns[placing]] -= 1
+        self.piece_ids[moved, targets[moved]] = self.piece_ids[moved, sources[moved]]
+        self.piece_ids[moved, sources[moved]] = -1
+        self.masks[moved, turns[~placing]] &= ~(np.int64(1) << sources[moved])
+        self.masks[games, turns] |= target_bits[games]
+
+        # A mill allows a capture the first time its three pieces form it
+        new_mill = np.zeros(len(games), dtype=bool)
+        own = self.masks[games, turns]
+        for mill, mill_mask in enumerate(MILL_MASKS):
+            formed = (target_bits[games] & mill_mask != 0) & (
+                own & mill_mask == mill_mask
+            )
+            if not formed.any():
+                continue
+            rows = games[formed]
+            ids = self.piece_ids[rows][:, MILLS[mill]].astype(np.int64)
+            history_bits = (
+                turns[formed] * len(_TRIPLES)
+                + _TRIPLE_INDEX[ids[:, 0], ids[:, 1], ids[:, 2]]
+            )
+            words = history_bits // 64
+            bits = np.uint64(1) << (history_bits % 64).astype(np.uint64)
+            first_time = self.mill_history[rows, mill, words] & bits == 0
+            self.mill_history[rows, mill, words] |= bits
+            new_mill[formed] |= first_time
+
+        self.capturing[games] = new_mill
+        self.turn[games] = np.where(new_mill, turns, 1 - turns)
+        self.quiet_moves[games] += 1
+        self.quiet_moves[active & ~after_placing] = 0
+
+
+def random_moves(legal: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Choose a legal move uniformly at random in each game.
+
+    Args:
+        legal (np.ndarray): The legal moves, as returned by `VectorEnv.legal_moves`.
+        rng (np.random.Generator): The random generator.
+
+    Returns:
+        np.ndarray: The move of each game, 0 for the games without legal moves.
+    """
+    scores = np.where(legal, rng.random(legal.shape), -1.0)
+    return scores.argmax(axis=1)
+
+
+def greedy_moves(
+    env: VectorEnv,
+    legal: np.ndarray,
+    evaluate: Callable[[np.ndarray], np.ndarray],
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Choose in each game the move leading to the best evaluated position.
+
+    Args:
+        env (VectorEnv): The environment of the games.
+        legal (np.ndarray): The legal moves, as returned by `VectorEnv.legal_moves`.
+        evaluate (Callable[[np.ndarray], np.ndarray]): Evaluation of position keys from the point of view of orange, such as `MinMaxAgent.evaluate_batch`.
+        rng (np.random.Generator): The random generator breaking the ties.
+
+    Returns:
+        np.ndarray: The move of each game, 0 for the games without legal moves.
+    """
+    games, moves = np.nonzero(legal)
+    children = env.take(games)
+    children._play(moves, np.ones(len(games), dtype=bool))
+    values = evaluate(children.keys())
+    values = np.where(env.turn[games] == ORANGE, values, -values)
+    values = np.nan_to_num(values, posinf=1e9, neginf=-1e9) + 1e-6 * rng.random(
+        len(values)
+    )
+
+    # The best child of each game comes first once sorted
+    order = np.lexsort((-values, games))
+    first = np.unique(games[order], return_index=True)[1]
+    best = np.zeros(env.n_games, dtype=np.int64)
+    best[games[order][first]] = moves[order][first]
+    return best
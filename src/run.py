@@ -1,152 +1,198 @@
-from src.game_env.board import Board
-from src.globals import CELL_SIZE, MARGIN, MIN_DRAW_MOVES, Player, Phase
-
-from src.globals import TRAINING_PARAMETERS
-from src.agents.autonomous_agents import MinMaxAgent
-from src.agents.human_agent import HumanAgent
-import numpy as np
-from threading import Thread
-
-ai_thinking = False
-play_sound = False
-
-
-def main():
-    """Main function to run the game."""
-
-    global ai_thinking, play_sound
-
-    if TRAINING_PARAMETERS["RENDER"]:
-        import pygame
-
-        screen = pygame.display.set_mode(
-            (7 * CELL_SIZE + MARGIN * 5, 7 * CELL_SIZE + MARGIN)
-        )
-        move_sound = pygame.mixer.Sound("assets/move_sound.mp3")
-        background_music = pygame.mixer.Sound("assets/background_music.mp3")
-        background_music.set_volume(0.6)
-        background_music.play(-1)
-    else:
-        screen = None
-    board = Board(
-        interactables=TRAINING_PARAMETERS["INTERACTABLES"],  # type: ignore
-        screen=screen,
-        margin=MARGIN,
-        cell_size=CELL_SIZE,
-    )  # type: ignore
-
-    max_n_samples = {Player.orange: None, Player.white: None}
-    if TRAINING_PARAMETERS["MAX_N_OPERATIONS"]:
-        max_n_samples = {
-            turn: int(
-                np.exp(
-                    np.log(TRAINING_PARAMETERS["MAX_N_OPERATIONS"])  # type: ignore
-                    / TRAINING_PARAMETERS["DIFFICULTY"][turn]  # type: ignore
-                )  # type: ignore
-                # type: ignore
-            )
-            for turn in [Player.orange, Player.white]
-        }
-
-    agents = {
-        color: (
-            MinMaxAgent(max_n_samples=TRAINING_PARAMETERS["MAX_N_OPERATIONS"])  # type: ignore
-            if color not in board.interactables  # type: ignore
-            else HumanAgent()
-        )
-        for color in board.available_pieces.keys()
-    }  # type: ignore
-
-    board.latest_phase = board.phase
-
-    print("Starting game : ")
-    print("Difficulty : ", TRAINING_PARAMETERS["DIFFICULTY"])
-    print("Interactables : ", TRAINING_PARAMETERS["INTERACTABLES"])
-    print("Number of processors : ", TRAINING_PARAMETERS["N_PROCESS"])
-    print("Stupidity : ", TRAINING_PARAMETERS["STUPIDITY"])
-    print("Max number of operations : ", TRAINING_PARAMETERS["MAX_N_OPERATIONS"])
-    print("Max number of samples : ", max_n_samples)
-    latest_moves = []
-    can_add = False
-
-    while True:  # Main game loop
-        board.update_draggable_pieces()
-        if TRAINING_PARAMETERS["RENDER"]:
-            board.draw()
-
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    exit()
-                elif not board.game_over:
-                    if board.turn in board.interactables:  # type: ignore
-                        if isinstance(agents[board.turn], HumanAgent):
-                            move = agents[board.turn].move(event, board)  # type: ignore
-                            if move is not None:
-                                play_sound = True
-                            if can_add:
-                                if move is not None:
-                                    latest_moves.append(move)
-
-        board.update_draggable_pieces()
-        if TRAINING_PARAMETERS["RENDER"]:
-            board.draw()
-
-        if board.turn not in board.interactables:  # type: ignore
-            if not board.game_over:
-                if isinstance(agents[board.turn], MinMaxAgent):
-                    if not ai_thinking:
-                        ai_thinking = True
-                        Thread(
-                            target=process_bot,
-                            args=(board, agents, max_n_samples, latest_moves, can_add),
-                        ).start()
-
-        if TRAINING_PARAMETERS["RENDER"] and play_sound:
-            move_sound.play()
-            play_sound = False
-
-        if not can_add and board.phase == Phase.moving:
-            can_add = True
-
-        if (
-            len(latest_moves) > MIN_DRAW_MOVES
-            and not any(latest_moves[-MIN_DRAW_MOVES:])
-            and board.phase == Phase.moving
-        ):
-            board.is_draw = True
-
-
-def process_bot(
-    board: Board,
-    agents: dict[Player, MinMaxAgent],
-    max_n_samples: dict,
-    latest_moves: list,
-    can_add: bool,
-):
-    global ai_thinking, play_sound
-
-    best_move, _ = agents[board.turn].minimax(  # type: ignore
-        board,
-        depth=TRAINING_PARAMETERS["DIFFICULTY"][board.turn],  # type: ignore
-        alpha=float("-inf"),
-        beta=float("inf"),
-        fanning=max_n_samples[board.turn],
-        multicore=TRAINING_PARAMETERS["N_PROCESS"],  # type: ignore
-    )
-    move = agents[board.turn].make_move(
-        board,
-        best_move,
-        render=TRAINING_PARAMETERS["RENDER"],  # type: ignore
-    )  # type: ignore
-
-    if can_add:
-        if move is not None:
-            latest_moves.append(move)
-
-    ai_thinking = False
-    play_sound = True
-
-
-if __name__ == "__main__":
-    main()
+from src.game_env.board import Board
+from src.globals import CELL_SIZE, FPS, MARGIN, MIN_DRAW_MOVES, Player, Phase
+
+from src.globals import TRAINING_PARAMETERS
+from src.agents.autonomous_agents import EngineConfig, MinMaxAgent
+from src.agents.engine_process import EngineProcess
+from src.agents.analysis_cache import AnalysisCache
+from src.agents.human_agent import HumanAgent
+from src.agents.opening_book import OpeningBook
+from src.agents.time_manager import TimeManager
+from src.game_env.tablebase import Tablebase
+from threading import Event, Thread
+
+# Set whenever no bot is searching or playing a move
+bot_idle = Event()
+bot_idle.set()
+play_sound = False
+
+
+def main():
+    """Main function to run the game."""
+
+    global play_sound
+
+    if TRAINING_PARAMETERS["RENDER"]:
+        import pygame
+
+        screen = pygame.display.set_mode(
+            (7 * CELL_SIZE + MARGIN * 5, 7 * CELL_SIZE + MARGIN)
+        )
+        clock = pygame.time.Clock()
+        move_sound = pygame.mixer.Sound("assets/move_sound.mp3")
+        background_music = pygame.mixer.Sound("assets/background_music.mp3")
+        background_music.set_volume(0.6)
+        background_music.play(-1)
+    else:
+        screen = None
+    board = Board(
+        interactables=TRAINING_PARAMETERS["INTERACTABLES"],  # type: ignore
+        screen=screen,
+        margin=MARGIN,
+        cell_size=CELL_SIZE,
+    )  # type: ignore
+
+    # The settings of the bots are fixed for the whole game
+    configs = {
+        color: EngineConfig.from_training_parameters(color)
+        for color in [Player.orange, Player.white]
+    }
+
+    # The tables only order the moves of the bots, which do without them when none
+    # were built
+    tablebase = Tablebase()
+
+    # Bots search in their own process so that rendering never waits on them
+    agents = {
+        color: (
+            EngineProcess(
+                MinMaxAgent(
+                    max_n_samples=TRAINING_PARAMETERS["MAX_N_OPERATIONS"],  # type: ignore
+                    late_move_reductions=TRAINING_PARAMETERS["LATE_MOVE_REDUCTIONS"][
+                        color
+                    ],  # type: ignore
+                    futility_pruning=TRAINING_PARAMETERS["FUTILITY_PRUNING"][color],  # type: ignore
+                    config=configs[color],
+                    tablebase=tablebase if tablebase.tables else None,
+                    opening_book=OpeningBook(),
+                    analysis_cache=(
+                        AnalysisCache()
+                        if TRAINING_PARAMETERS["ANALYSIS_CACHE"]
+                        else None
+                    ),
+                ),
+                time_manager=(
+                    TimeManager(*configs[color].time_control)
+                    if configs[color].time_control
+                    else None
+                ),
+            ).start()
+            if color not in board.interactables  # type: ignore
+            else HumanAgent()
+        )
+        for color in board.available_pieces.keys()
+    }  # type: ignore
+
+    board.latest_phase = board.phase
+
+    print("Starting game : ")
+    print("Difficulty : ", TRAINING_PARAMETERS["DIFFICULTY"])
+    print("Interactables : ", TRAINING_PARAMETERS["INTERACTABLES"])
+    print("Number of processors : ", TRAINING_PARAMETERS["N_PROCESS"])
+    print("Stupidity : ", TRAINING_PARAMETERS["STUPIDITY"])
+    print("Max number of operations : ", TRAINING_PARAMETERS["MAX_N_OPERATIONS"])
+    print("Time control : ", TRAINING_PARAMETERS["TIME_CONTROL"])
+    print("Late move reductions : ", TRAINING_PARAMETERS["LATE_MOVE_REDUCTIONS"])
+    print("Futility pruning : ", TRAINING_PARAMETERS["FUTILITY_PRUNING"])
+    print(
+        "Max number of samples : ",
+        {color: config.fanning for color, config in configs.items()},
+    )
+    latest_moves = []
+    can_add = False
+
+    while True:  # Main game loop
+        board.update_draggable_pieces()
+        if TRAINING_PARAMETERS["RENDER"]:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    for agent in agents.values():
+                        if isinstance(agent, EngineProcess):
+                            agent.stop()
+                    pygame.quit()
+                    exit()
+                elif not board.game_over:
+                    if board.turn in board.interactables:  # type: ignore
+                        if isinstance(agents[board.turn], HumanAgent):
+                            move = agents[board.turn].move(event, board)  # type: ignore
+                            if move is not None:
+                                play_sound = True
+                            if can_add:
+                                if move is not None:
+                                    latest_moves.append(move)
+
+        board.update_draggable_pieces()
+        if TRAINING_PARAMETERS["RENDER"]:
+            board.draw()
+
+        if board.turn not in board.interactables:  # type: ignore
+            if not board.game_over:
+                if isinstance(agents[board.turn], EngineProcess):
+                    if bot_idle.is_set():
+                        bot_idle.clear()
+                        Thread(
+                            target=process_bot,
+                            args=(board, agents, latest_moves, can_add),
+                            daemon=True,
+                        ).start()
+
+        if TRAINING_PARAMETERS["RENDER"] and play_sound:
+            move_sound.play()
+            play_sound = False
+
+        if not can_add and board.phase == Phase.moving:
+            can_add = True
+
+        if (
+            len(latest_moves) > MIN_DRAW_MOVES
+            and not any(latest_moves[-MIN_DRAW_MOVES:])
+            and board.phase == Phase.moving
+        ):
+            board.is_draw = True
+
+        if TRAINING_PARAMETERS["RENDER"]:
+            clock.tick(FPS)
+        elif board.game_over:
+            for agent in agents.values():
+                if isinstance(agent, EngineProcess):
+                    agent.stop()
+            return
+        else:
+            # Nothing to render, sleep until the bot has played
+            bot_idle.wait()
+
+
+def process_bot(
+    board: Board,
+    agents: dict[Player, EngineProcess],
+    latest_moves: list,
+    can_add: bool,
+):
+    global play_sound
+
+    turn = board.turn
+    engine = agents[turn]
+
+    # The engine process stops pondering when it receives the actual position
+    best_move, _ = engine.search(board)
+    print("Turn : ", str(turn), "Nodes : ", engine.last_search_stats["n_nodes"])
+    move = engine.agent.make_move(
+        board,
+        best_move,
+        render=TRAINING_PARAMETERS["RENDER"],  # type: ignore
+    )  # type: ignore
+
+    if can_add:
+        if move is not None:
+            latest_moves.append(move)
+
+    # Search the expected reply while the human is thinking
+    if board.turn in board.interactables and not board.game_over:  # type: ignore
+        engine.ponder(board)
+
+    play_sound = True
+    bot_idle.set()
+
+
+if __name__ == "__main__":
+    main()
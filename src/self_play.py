@@ -0,0 +1,325 @@
+# Headless games between bots, played in a pool of processes.
+#
+# Each worker plays whole games without rendering, and the records of the games are
+# streamed back as they finish, in the order they finish.
+from src.game_env.board import Board
+from src.globals import CELL_SIZE, MARGIN, MIN_DRAW_MOVES, Player
+from src.agents.autonomous_agents import EngineConfig, MinMaxAgent
+from src.agents.mcts_agent import MCTSAgent
+from src.agents.time_manager import TimeManager
+from src.game_env.symmetry import decode_move
+from typing import Any, Iterable, Iterator, Optional, Sequence
+from contextlib import nullcontext
+from multiprocessing import Pool, cpu_count
+from pathlib import Path
+import argparse
+import dataclasses as dc
+import datetime
+import json
+import numpy as np
+import random
+import signal
+import time
+
+# Agents of the search algorithms of AgentConfig
+AGENTS = {"minimax": MinMaxAgent, "mcts": MCTSAgent}
+
+
+@dc.dataclass
+class AgentConfig:
+    """Class to describe a bot and how it searches.
+
+    Args:
+        algorithm (str, optional): The search of the bot, "minimax" or "mcts". Defaults to "minimax".
+        depth (int, optional): The depth of the searches, unused by "mcts". Defaults to 3.
+        max_nodes (Optional[int], optional): The node budget of each search. Defaults to None.
+        max_time (Optional[float], optional): The time budget of each search in seconds. Defaults to None.
+        fanning (Optional[int], optional): The number of moves searched at each node. Defaults to None.
+        stupidity (float, optional): The scale of the noise added to the evaluation. Defaults to 0.0.
+        time_control (Optional[tuple[float, float]], optional): The seconds per game and the increment per move of a clock, "minimax" only. Defaults to None.
+        evaluation_coefficients (dict[str, dict[str, float]], optional): Coefficients replacing those of EVALUATION_COEFFICIENTS, by phase. Defaults to {}.
+        agent_parameters (dict[str, Any], optional): The arguments of the agent. Defaults to {}.
+    """
+
+    algorithm: str = "minimax"
+    depth: int = 3
+    max_nodes: Optional[int] = None
+    max_time: Optional[float] = None
+    fanning: Optional[int] = None
+    stupidity: float = 0.0
+    time_control: Optional[tuple[float, float]] = None
+    evaluation_coefficients: dict[str, dict[str, float]] = dc.field(
+        default_factory=dict
+    )
+    agent_parameters: dict[str, Any] = dc.field(default_factory=dict)
+
+    def engine_config(self) -> EngineConfig:
+        """Return the immutable search settings of the configuration."""
+        return EngineConfig(
+            depth=self.depth,
+            fanning=self.fanning,
+            max_nodes=self.max_nodes,
+            max_time=self.max_time,
+            stupidity=self.stupidity,
+            time_control=tuple(self.time_control) if self.time_control else None,  # type: ignore
+            evaluation_coefficients=self.evaluation_coefficients,
+        )
+
+    def make_agent(self) -> MinMaxAgent | MCTSAgent:
+        """Create the agent of the configuration."""
+        if self.time_control and self.algorithm != "minimax":
+            raise ValueError(f"No time control for the {self.algorithm} algorithm")
+        return AGENTS[self.algorithm](
+            **self.agent_parameters, config=self.engine_config()
+        )
+
+
+@dc.dataclass
+class GameRecord:
+    """Class to store the course and the result of a game.
+
+    Attributes:
+        game (int): The index of the game.
+        configs (dict[str, AgentConfig]): The configuration of each player.
+        winner (Optional[str]): The winner, None for a draw.
+        n_plies (int): The number of plies played.
+        n_nodes (dict[str, int]): The number of nodes searched by each player.
+        n_pieces (dict[str, list[int]]): The number of pieces of each player after each of its moves.
+        evaluations (dict[str, list[float]]): The evaluation after each move of each player.
+        remaining_times (dict[str, float]): The time left on the clock of each player with a time control.
+        flag_fell (dict[str, bool]): Whether the clock of each player with a time control ran out.
+        start_time (str): The time the game started.
+        end_time (str): The time the game ended.
+    """
+
+    game: int
+    configs: dict[str, AgentConfig]
+    winner: Optional[str] = None
+    n_plies: int = 0
+    n_nodes: dict[str, int] = dc.field(default_factory=dict)
+    n_pieces: dict[str, list[int]] = dc.field(default_factory=dict)
+    evaluations: dict[str, list[float]] = dc.field(default_factory=dict)
+    remaining_times: dict[str, float] = dc.field(default_factory=dict)
+    flag_fell: dict[str, bool] = dc.field(default_factory=dict)
+    start_time: str = ""
+    end_time: str = ""
+
+
+def play_game(
+    configs: dict[Player, AgentConfig],
+    game: int = 0,
+    seed: int = 0,
+    n_random_plies: int = 0,
+    opening: Optional[list[tuple[int, int]]] = None,
+    max_plies: int = 1000,
+) -> GameRecord:
+    """Play a game between two bots.
+
+    The game starts with the moves of the opening, then with the random plies.
+
+    Args:
+        configs (dict[Player, AgentConfig]): The configuration of each player.
+        game (int, optional): The index of the game. Defaults to 0.
+        seed (int, optional): The seed of the random plies and of the evaluation noise. Defaults to 0.
+        n_random_plies (int, optional): The number of random plies opening the game. Defaults to 0.
+        opening (Optional[list[tuple[int, int]]], optional): Moves encoded by `symmetry.encode_move`. Defaults to None.
+        max_plies (int, optional): The number of plies after which the game is a draw. Defaults to 1000.
+
+    Returns:
+        GameRecord: The record of the game.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    agents = {player: config.make_agent() for player, config in configs.items()}
+    # Each player records the evaluation it searches with
+    coefficients = {
+        player: config.engine_config().coefficients
+        for player, config in configs.items()
+    }
+    clocks = {
+        player: TimeManager(*config.time_control)
+        for player, config in configs.items()
+        if config.time_control
+    }
+    record = GameRecord(
+        game=game,
+        configs={str(player): config for player, config in configs.items()},
+        n_nodes={str(player): 0 for player in configs},
+        n_pieces={str(player): [] for player in configs},
+        evaluations={str(player): [] for player in configs},
+        start_time=str(datetime.datetime.now()),
+    )
+
+    board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+    opening = opening or []
+    n_quiet_moves = 0
+    for ply in range(max_plies):
+        board.update_draggable_pieces()
+        if board.game_over:
+            break
+        player = board.turn
+        agent = agents[player]
+        possible_moves = agent.generate_possible_moves(board)
+        if ply < len(opening):
+            move = decode_move(board, possible_moves, *opening[ply], 0)
+        elif ply < len(opening) + n_random_plies and possible_moves:
+            move = random.choice(possible_moves)
+        elif player in clocks:
+            # The clock sets the depth and the time of each search
+            search_kwargs = agent.search_parameters()
+            search_kwargs.pop("max_time", None)
+            move, _ = clocks[player].search(agent, board, **search_kwargs)  # type: ignore
+            record.n_nodes[str(player)] += agent.last_search_stats.get("n_nodes", 0)
+        else:
+            move, _ = agent.search(board, **agent.search_parameters())
+            record.n_nodes[str(player)] += agent.last_search_stats.get("n_nodes", 0)
+
+        removed = agent.make_move(board, move, render=False)
+        record.n_plies = ply + 1
+        if not move:
+            break
+        record.n_pieces[str(player)].append(len(board.pieces[player]))
+        record.evaluations[str(player)].append(
+            float(MinMaxAgent.evaluate(board, coefficients[player]))
+        )
+
+        n_quiet_moves = 0 if removed or not board.started_moving else n_quiet_moves + 1
+        if n_quiet_moves > MIN_DRAW_MOVES:
+            board.is_draw = True
+
+    record.winner = None if board.winner is None else str(board.winner)
+    for player, clock in clocks.items():
+        record.remaining_times[str(player)] = clock.remaining
+        record.flag_fell[str(player)] = clock.flag_fell
+    record.end_time = str(datetime.datetime.now())
+    return record
+
+
+# Configurations of the games of the worker processes, set once by `_init_worker`
+_worker_configs: list[AgentConfig] = []
+
+
+def _init_worker(configs: Sequence[AgentConfig] = ()):
+    global _worker_configs
+    # The parent process handles the interruptions
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_configs = list(configs)
+
+
+def _play_game(
+    args: tuple[dict[Player, int], int, int, int, Optional[list]],
+) -> GameRecord:
+    players, game, seed, n_random_plies, opening = args
+    configs = {player: _worker_configs[index] for player, index in players.items()}
+    return play_game(configs, game, seed, n_random_plies, opening)
+
+
+def play_games(
+    matches: Iterable[dict[Player, AgentConfig]],
+    n_processes: int = -1,
+    seed: int = 0,
+    n_random_plies: int = 0,
+    openings: Optional[Sequence[Optional[list[tuple[int, int]]]]] = None,
+) -> Iterator[GameRecord]:
+    """Play games in a pool of processes, one game per task.
+
+    Closing the generator terminates the games still running.
+
+    Args:
+        matches (Iterable[dict[Player, AgentConfig]]): The configurations of the players of each game.
+        n_processes (int, optional): The number of processes, -1 for all the cores. Defaults to -1.
+        seed (int, optional): The seed of the first game, incremented for each game. Defaults to 0.
+        n_random_plies (int, optional): The number of random plies opening each game. Defaults to 0.
+        openings (Optional[Sequence[Optional[list[tuple[int, int]]]]], optional): The opening of each game. Defaults to None.
+
+    Yields:
+        GameRecord: The record of each game, as soon as it finishes.
+    """
+    n_processes = cpu_count() if n_processes == -1 else n_processes
+    # The distinct configurations are sent once to each worker, the tasks only
+    # carry their indices
+    configs: list[AgentConfig] = []
+    tasks = []
+    for game, match in enumerate(matches):
+        players = {}
+        for player, config in match.items():
+            if config not in configs:
+                configs.append(config)
+            players[player] = configs.index(config)
+        tasks.append(
+            (
+                players,
+                game,
+                seed + game,
+                n_random_plies,
+                openings[game] if openings is not None else None,
+            )
+        )
+    with Pool(n_processes, initializer=_init_worker, initargs=(configs,)) as pool:
+        yield from pool.imap_unordered(_play_game, tasks, chunksize=1)
+
+
+def parse_config(text: str) -> AgentConfig:
+    # The fields that are not part of AgentConfig are arguments of MinMaxAgent
+    parameters = json.loads(text)
+    fields = {field.name for field in dc.fields(AgentConfig)}
+    config = {key: value for key, value in parameters.items() if key in fields}
+    agent_parameters = {
+        key: value for key, value in parameters.items() if key not in fields
+    }
+    config.setdefault("agent_parameters", {}).update(agent_parameters)
+    return AgentConfig(**config)
+
+
+def main():
+    """Command line entry point of the self-play runner."""
+    parser = argparse.ArgumentParser(description="Play games between bots.")
+    parser.add_argument(
+        "--orange",
+        type=parse_config,
+        default=AgentConfig(),
+        help='JSON configuration, for example \'{"depth": 3, "late_move_reductions": true}\'',
+    )
+    parser.add_argument("--white", type=parse_config, default=AgentConfig())
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--swap-colors", action="store_true")
+    parser.add_argument("--random-plies", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    matches = [
+        {Player.orange: args.orange, Player.white: args.white}
+        if not args.swap_colors or game % 2 == 0
+        else {Player.orange: args.white, Player.white: args.orange}
+        for game in range(args.games)
+    ]
+    start_time = time.time()
+    # Scores of the configurations given as --orange and --white, whatever their color
+    scores = {"--orange": 0, "--white": 0, "draw": 0}
+    with open(args.output, "a") if args.output else nullcontext() as output:
+        for record in play_games(matches, args.processes, args.seed, args.random_plies):
+            swapped = args.swap_colors and record.game % 2 == 1
+            if record.winner is None:
+                scores["draw"] += 1
+            else:
+                scores[
+                    "--white" if (record.winner == "white") != swapped else "--orange"
+                ] += 1
+            print(
+                "Game {}: winner {}, {} plies, {} games/min".format(
+                    record.game,
+                    record.winner,
+                    record.n_plies,
+                    round(60 * sum(scores.values()) / (time.time() - start_time), 1),
+                )
+            )
+            if output is not None:
+                output.write(json.dumps(dc.asdict(record)) + "\n")
+                output.flush()
+    print("Results : ", scores)
+
+
+if __name__ == "__main__":
+    main()
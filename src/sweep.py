@@ -0,0 +1,267 @@
+# Sweeps of agent configurations, each measured by paired games against a baseline.
+#
+# A sweep is described by a JSON spec, for example:
+#
+#     {
+#         "baseline": {"depth": 2},
+#         "pairs": 10,
+#         "grid": {"depth": [1, 2, 3], "stupidity": [0.0, 0.5]},
+#         "random": {"n_samples": 8, "parameters": {
+#             "evaluation_coefficients.moving.n_pieces": {"low": 0.5, "high": 2.0}
+#         }}
+#     }
+#
+# The parameters are the fields of AgentConfig (or DIFFICULTY, STUPIDITY and
+# MAX_N_OPERATIONS, as in TRAINING_PARAMETERS), the coefficients of the evaluation
+# as "evaluation_coefficients.<phase>.<feature>", and the arguments of MinMaxAgent.
+# The games of all the configurations go to one pool of processes, and the result of
+# each configuration is cached under the hash of everything that determines it, so
+# that a sweep that is run again only plays the configurations it has not seen.
+from src.globals import SWEEP_CACHE_PATH, Player
+from src.self_play import AgentConfig, play_games
+from src.tournament import elo_estimate, generate_openings
+from typing import Any
+from pathlib import Path
+import argparse
+import copy
+import dataclasses as dc
+import hashlib
+import itertools
+import json
+import numpy as np
+import pandas as pd
+import time
+
+# Names of TRAINING_PARAMETERS accepted for the fields of AgentConfig
+PARAMETER_ALIASES = {
+    "DIFFICULTY": "depth",
+    "STUPIDITY": "stupidity",
+    "MAX_N_OPERATIONS": "max_nodes",
+}
+
+
+def make_config(parameters: dict[str, Any]) -> AgentConfig:
+    """Build the configuration of a cell of the sweep.
+
+    Args:
+        parameters (dict[str, Any]): The values of the parameters of the cell.
+
+    Returns:
+        AgentConfig: The configuration.
+    """
+    fields = {field.name for field in dc.fields(AgentConfig)}
+    config = AgentConfig()
+    for name, value in parameters.items():
+        name = PARAMETER_ALIASES.get(name, name)
+        if name.startswith("evaluation_coefficients."):
+            _, phase, feature = name.split(".")
+            config.evaluation_coefficients.setdefault(phase, {})[feature] = value
+        elif name in fields:
+            setattr(config, name, value)
+        else:
+            config.agent_parameters[name] = value
+    return config
+
+
+def sample_cells(spec: dict[str, Any], seed: int = 0) -> list[dict[str, Any]]:
+    """List the cells of a sweep: the product of the grid, with the random samples.
+
+    Args:
+        spec (dict[str, Any]): The spec of the sweep.
+        seed (int, optional): The seed of the random samples. Defaults to 0.
+
+    Returns:
+        list[dict[str, Any]]: The values of the parameters of each cell.
+    """
+    grid = spec.get("grid", {})
+    cells = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+
+    search = spec.get("random")
+    if search:
+        rng = np.random.default_rng(seed)
+        samples = []
+        for _ in range(search["n_samples"]):
+            sample = {}
+            for name, domain in search["parameters"].items():
+                if isinstance(domain, list):
+                    sample[name] = domain[rng.integers(len(domain))]
+                elif domain.get("log"):
+                    sample[name] = float(
+                        np.exp(
+                            rng.uniform(np.log(domain["low"]), np.log(domain["high"]))
+                        )
+                    )
+                else:
+                    sample[name] = float(rng.uniform(domain["low"], domain["high"]))
+            samples.append(sample)
+        # Each random sample completes every cell of the grid
+        cells = [{**cell, **sample} for cell in cells for sample in samples]
+    return cells
+
+
+def config_hash(
+    config: AgentConfig,
+    baseline: AgentConfig,
+    n_pairs: int,
+    n_opening_plies: int,
+    seed: int,
+) -> str:
+    """Hash everything that determines the result of a cell.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    description = dict(
+        config=dc.asdict(config),
+        baseline=dc.asdict(baseline),
+        n_pairs=n_pairs,
+        n_opening_plies=n_opening_plies,
+        seed=seed,
+    )
+    return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()[
+        :16
+    ]
+
+
+def load_cache(path: Path = SWEEP_CACHE_PATH) -> dict[str, dict[str, Any]]:
+    """Read the results of the cells computed so far, keyed by their hash."""
+    if not Path(path).exists():
+        return {}
+    with open(path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    return {row["hash"]: row for row in rows}
+
+
+def run_sweep(
+    spec: dict[str, Any],
+    cache_path: Path = SWEEP_CACHE_PATH,
+    n_processes: int = -1,
+    seed: int = 0,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """Measure every cell of a sweep against the baseline, reusing the cached cells.
+
+    Args:
+        spec (dict[str, Any]): The spec of the sweep.
+        cache_path (Path, optional): The file of the cached results. Defaults to SWEEP_CACHE_PATH.
+        n_processes (int, optional): The number of processes, -1 for all the cores. Defaults to -1.
+        seed (int, optional): The seed of the random samples and of the openings. Defaults to 0.
+        verbose (bool, optional): Whether to print the progress. Defaults to True.
+
+    Returns:
+        pd.DataFrame: One row per cell, with its parameters, its score against the
+            baseline, its Elo difference and its search statistics.
+    """
+    baseline = make_config(spec.get("baseline", {}))
+    n_pairs = spec.get("pairs", 10)
+    n_opening_plies = spec.get("opening_plies", 4)
+    cells = sample_cells(spec, seed)
+    configs = [make_config(copy.deepcopy(cell)) for cell in cells]
+    hashes = [
+        config_hash(config, baseline, n_pairs, n_opening_plies, seed)
+        for config in configs
+    ]
+
+    cache = load_cache(cache_path)
+    # The first cell of each hash not in the cache, so that no result is computed twice
+    missing = [
+        index
+        for index, key in enumerate(hashes)
+        if key not in cache and hashes.index(key) == index
+    ]
+    if verbose:
+        print("{} cells, {} to play".format(len(cells), len(missing)))
+
+    # Every game of every missing cell is a task of the same pool
+    openings = generate_openings(n_pairs, n_opening_plies, seed)
+    matches, game_openings, game_cells = [], [], []
+    for index in missing:
+        for opening in openings:
+            matches.append({Player.orange: configs[index], Player.white: baseline})
+            matches.append({Player.orange: baseline, Player.white: configs[index]})
+            game_openings.extend([opening, opening])
+            game_cells.extend([index, index])
+
+    scores: dict[int, dict[int, float]] = {index: {} for index in missing}
+    statistics = {index: dict(n_nodes=0, n_moves=0) for index in missing}
+    start_time = time.time()
+    with open(cache_path, "a") as cache_file:
+        for record in play_games(matches, n_processes, seed, openings=game_openings):
+            index = game_cells[record.game]
+            # The cell plays orange in the even games
+            color = "orange" if record.game % 2 == 0 else "white"
+            scores[index][record.game] = (
+                0.5 if record.winner is None else float(record.winner == color)
+            )
+            statistics[index]["n_nodes"] += record.n_nodes[color]
+            statistics[index]["n_moves"] += len(record.n_pieces[color])
+            if len(scores[index]) < 2 * len(openings):
+                continue
+
+            row = _summarize(cells[index], hashes[index], scores[index])
+            row["nodes_per_move"] = statistics[index]["n_nodes"] / max(
+                statistics[index]["n_moves"], 1
+            )
+            cache[hashes[index]] = row
+            cache_file.write(json.dumps(row) + "\n")
+            cache_file.flush()
+            if verbose:
+                print(
+                    "Cell {}: score {:.3f}, Elo {:+.1f}, {:.1f}s".format(
+                        cells[index],
+                        row["score"],
+                        row["elo"],
+                        time.time() - start_time,
+                    )
+                )
+
+    # The parameters are those of the spec, whatever names the cached cells used
+    return pd.DataFrame(
+        [{**cell, **cache[key], "parameters": None} for cell, key in zip(cells, hashes)]
+    ).drop(columns="parameters")
+
+
+def _summarize(
+    cell: dict[str, Any], key: str, scores: dict[int, float]
+) -> dict[str, Any]:
+    # Scores of the pairs of games, counted as in `tournament.run_tournament`
+    pentanomial = np.zeros(5, dtype=np.int64)
+    games = sorted(scores)
+    for first, second in zip(games[::2], games[1::2]):
+        pentanomial[int(2 * (scores[first] + scores[second]))] += 1
+    elo, lower, upper = elo_estimate(pentanomial)
+    values = list(scores.values())
+    return dict(
+        hash=key,
+        parameters=cell,
+        games=len(values),
+        wins=values.count(1.0),
+        draws=values.count(0.5),
+        losses=values.count(0.0),
+        score=float(np.mean(values)),
+        elo=elo,
+        elo_lower=lower,
+        elo_upper=upper,
+    )
+
+
+def main():
+    """Command line entry point of the sweep scheduler."""
+    parser = argparse.ArgumentParser(description="Sweep agent configurations.")
+    parser.add_argument("spec", type=Path, help="JSON spec of the sweep")
+    parser.add_argument("--cache", type=Path, default=SWEEP_CACHE_PATH)
+    parser.add_argument("--output", type=Path, default=None, help="CSV table")
+    parser.add_argument("--processes", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    table = run_sweep(
+        json.loads(args.spec.read_text()), args.cache, args.processes, args.seed
+    )
+    print(table.drop(columns="hash").to_string(index=False))
+    if args.output is not None:
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
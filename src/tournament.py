@@ -0,0 +1,261 @@
+# Matches between a candidate and a baseline bot, measured in Elo.
+#
+# Each opening of the seed book is played twice, with the colours swapped, and the two
+# games form a pair. The pairs are counted by the score of the candidate, 0, 0.5, 1,
+# 1.5 or 2 (the pentanomial distribution), which removes the variance the opening
+# adds to the result. A sequential probability ratio test stops the match as soon as
+# the candidate is shown to be better by elo1 or no better than elo0.
+from src.game_env.board import Board
+from src.game_env.symmetry import canonical_keys, encode_move
+from src.globals import CELL_SIZE, MARGIN, Player
+from src.agents.autonomous_agents import MinMaxAgent
+from src.self_play import AgentConfig, parse_config, play_games
+from typing import Optional
+import argparse
+import dataclasses as dc
+import numpy as np
+import random
+import time
+
+
+def expected_score(elo: float) -> float:
+    """Return the expected score of a player stronger by `elo`."""
+    return 1.0 / (1.0 + 10.0 ** (-elo / 400.0))
+
+
+def elo_difference(score: float) -> float:
+    """Return the Elo difference giving the expected score, the inverse of `expected_score`."""
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return float(-400.0 * np.log10(1.0 / score - 1.0))
+
+
+def _pair_statistics(pentanomial: np.ndarray) -> tuple[float, float, int]:
+    # Mean and variance of the score per game of the pairs
+    n_pairs = int(pentanomial.sum())
+    scores = np.arange(5) / 4.0
+    frequencies = pentanomial / max(n_pairs, 1)
+    mean = float(frequencies @ scores)
+    variance = float(frequencies @ (scores - mean) ** 2)
+    return mean, variance, n_pairs
+
+
+def elo_estimate(pentanomial: np.ndarray) -> tuple[float, float, float]:
+    """Estimate the Elo difference of the candidate with a 95% confidence interval.
+
+    Args:
+        pentanomial (np.ndarray): The number of pairs in which the candidate scored 0, 0.5, 1, 1.5 and 2.
+
+    Returns:
+        tuple[float, float, float]: The Elo difference and the bounds of its interval.
+    """
+    mean, variance, n_pairs = _pair_statistics(pentanomial)
+    error = 1.96 * np.sqrt(variance / max(n_pairs, 1))
+    return (
+        elo_difference(mean),
+        elo_difference(mean - error),
+        elo_difference(mean + error),
+    )
+
+
+@dc.dataclass(frozen=True)
+class Sprt:
+    """Class to run a sequential probability ratio test on the pairs of a match.
+
+    The test compares the hypotheses that the candidate is stronger by elo0 and by
+    elo1, with the normal approximation of the log-likelihood ratio of the pair scores.
+
+    Args:
+        elo0 (float, optional): The Elo difference of the null hypothesis. Defaults to 0.0.
+        elo1 (float, optional): The Elo difference of the alternative hypothesis. Defaults to 10.0.
+        alpha (float, optional): The probability of accepting elo1 when elo0 holds. Defaults to 0.05.
+        beta (float, optional): The probability of accepting elo0 when elo1 holds. Defaults to 0.05.
+    """
+
+    elo0: float = 0.0
+    elo1: float = 10.0
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def bounds(self) -> tuple[float, float]:
+        """The log-likelihood ratios at which elo0 and elo1 are accepted."""
+        return (
+            float(np.log(self.beta / (1 - self.alpha))),
+            float(np.log((1 - self.beta) / self.alpha)),
+        )
+
+    def llr(self, pentanomial: np.ndarray) -> float:
+        """Compute the log-likelihood ratio of elo1 against elo0.
+
+        Args:
+            pentanomial (np.ndarray): The number of pairs in which the candidate scored 0, 0.5, 1, 1.5 and 2.
+
+        Returns:
+            float: The log-likelihood ratio, 0 while the scores do not vary.
+        """
+        mean, variance, n_pairs = _pair_statistics(pentanomial)
+        if variance <= 0:
+            return 0.0
+        score0, score1 = expected_score(self.elo0), expected_score(self.elo1)
+        return (
+            n_pairs * (score1 - score0) * (2 * mean - score0 - score1) / (2 * variance)
+        )
+
+    def decision(self, pentanomial: np.ndarray) -> Optional[str]:
+        """Return "H1" once elo1 is accepted, "H0" once elo0 is, and None before."""
+        lower, upper = self.bounds
+        llr = self.llr(pentanomial)
+        if llr >= upper:
+            return "H1"
+        if llr <= lower:
+            return "H0"
+        return None
+
+
+# Test of the matches that do not set one, the Sprt being immutable
+DEFAULT_SPRT = Sprt()
+
+
+def generate_openings(
+    n_openings: int, n_plies: int = 4, seed: int = 0
+) -> list[list[tuple[int, int]]]:
+    """Draw random openings leading to positions that are not symmetric to each other.
+
+    Args:
+        n_openings (int): The number of openings.
+        n_plies (int, optional): The number of plies of each opening. Defaults to 4.
+        seed (int, optional): The seed of the random moves. Defaults to 0.
+
+    Returns:
+        list[list[tuple[int, int]]]: The moves of each opening, encoded by `symmetry.encode_move`.
+    """
+    rng = random.Random(seed)
+    agent = MinMaxAgent()
+    openings, seen = [], set()
+    for _ in range(100 * n_openings):
+        if len(openings) == n_openings:
+            break
+        board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+        opening = []
+        for _ in range(n_plies):
+            board.update_draggable_pieces()
+            move = rng.choice(agent.generate_possible_moves(board))
+            opening.append(encode_move(board, move, 0))
+            agent.make_move(board, move, render=False)
+        board.update_draggable_pieces()
+        key = int(canonical_keys(np.array([board.key()]))[0][0])
+        if key not in seen:
+            seen.add(key)
+            openings.append(opening)
+    return openings
+
+
+def run_tournament(
+    candidate: AgentConfig,
+    baseline: AgentConfig,
+    max_pairs: int = 500,
+    n_opening_plies: int = 4,
+    sprt: Optional[Sprt] = DEFAULT_SPRT,
+    n_processes: int = -1,
+    seed: int = 0,
+    verbose: bool = True,
+) -> dict:
+    """Play pairs of games between the candidate and the baseline.
+
+    Args:
+        candidate (AgentConfig): The configuration under test.
+        baseline (AgentConfig): The configuration it is compared to.
+        max_pairs (int, optional): The maximum number of pairs of games. Defaults to 500.
+        n_opening_plies (int, optional): The number of plies of the openings. Defaults to 4.
+        sprt (Optional[Sprt], optional): The test stopping the match early, None to play every pair. Defaults to DEFAULT_SPRT.
+        n_processes (int, optional): The number of processes, -1 for all the cores. Defaults to -1.
+        seed (int, optional): The seed of the openings. Defaults to 0.
+        verbose (bool, optional): Whether to print the progress. Defaults to True.
+
+    Returns:
+        dict: The pentanomial counts, the Elo estimate and its interval, the
+            log-likelihood ratio and the decision of the test.
+    """
+    openings = generate_openings(max_pairs, n_opening_plies, seed)
+    matches, game_openings = [], []
+    for opening in openings:
+        matches.append({Player.orange: candidate, Player.white: baseline})
+        matches.append({Player.orange: baseline, Player.white: candidate})
+        game_openings.extend([opening, opening])
+
+    pentanomial = np.zeros(5, dtype=np.int64)
+    pending: dict[int, float] = {}
+    decision = None
+    start_time = time.time()
+    games = play_games(matches, n_processes, seed, openings=game_openings)
+    for record in games:
+        # The candidate plays orange in the even games
+        candidate_color = "orange" if record.game % 2 == 0 else "white"
+        score = (
+            0.5 if record.winner is None else float(record.winner == candidate_color)
+        )
+        pair = record.game // 2
+        if pair not in pending:
+            pending[pair] = score
+            continue
+        pentanomial[int(2 * (pending.pop(pair) + score))] += 1
+
+        elo, lower, upper = elo_estimate(pentanomial)
+        llr = sprt.llr(pentanomial) if sprt is not None else 0.0
+        if verbose:
+            print(
+                "Pairs {} {}: Elo {:+.1f} [{:+.1f}, {:+.1f}], LLR {:.2f}, {:.1f}s".format(
+                    pentanomial.sum(),
+                    pentanomial.tolist(),
+                    elo,
+                    lower,
+                    upper,
+                    llr,
+                    time.time() - start_time,
+                )
+            )
+        decision = sprt.decision(pentanomial) if sprt is not None else None
+        if decision is not None:
+            break
+    games.close()
+
+    elo, lower, upper = elo_estimate(pentanomial)
+    return dict(
+        pentanomial=pentanomial.tolist(),
+        elo=elo,
+        elo_interval=(lower, upper),
+        llr=sprt.llr(pentanomial) if sprt is not None else None,
+        decision=decision,
+    )
+
+
+def main():
+    """Command line entry point of the tournament runner."""
+    parser = argparse.ArgumentParser(description="Compare a candidate to a baseline.")
+    parser.add_argument("--candidate", type=parse_config, default=AgentConfig())
+    parser.add_argument("--baseline", type=parse_config, default=AgentConfig())
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--opening-plies", type=int, default=4)
+    parser.add_argument("--elo0", type=float, default=0.0)
+    parser.add_argument("--elo1", type=float, default=10.0)
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    parser.add_argument("--no-sprt", action="store_true")
+    parser.add_argument("--processes", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = run_tournament(
+        args.candidate,
+        args.baseline,
+        args.pairs,
+        args.opening_plies,
+        None if args.no_sprt else Sprt(args.elo0, args.elo1, args.alpha, args.beta),
+        args.processes,
+        args.seed,
+    )
+    print("Result : ", result)
+
+
+if __name__ == "__main__":
+    main()
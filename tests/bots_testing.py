@@ -1,261 +1,123 @@
-from src.game_env.board import Board
-from src.globals import (
-    CELL_SIZE,
-    MARGIN,
-    MIN_DRAW_MOVES,
-    N_REPITITIONS,
-    EVALUATION_COEFFICIENTS,
-    Phase,
-    Player,
-)
-
-from src.globals import TRAINING_PARAMETERS
-from src.agents.autonomous_agents import MinMaxAgent
-from src.agents.human_agent import HumanAgent
-import numpy as np
-from threading import Thread
-from pathlib import Path
-import datetime
-import json
-
-ai_thinking = False
-play_sound = False
-evaluations = {str(Player.orange): [], str(Player.white): []}
-board_phases = []
-n_pieces = {str(Player.orange): [], str(Player.white): []}
-
-
-def main():
-    """Main function to run the game."""
-
-    global ai_thinking, play_sound, evaluations
-
-    if TRAINING_PARAMETERS["RENDER"]:
-        import pygame
-
-        pygame.init()
-
-        screen = pygame.display.set_mode(
-            (7 * CELL_SIZE + MARGIN * 5, 7 * CELL_SIZE + MARGIN)
-        )
-        move_sound = pygame.mixer.Sound("assets/move_sound.mp3")
-        background_music = pygame.mixer.Sound("assets/background_music.mp3")
-        background_music.set_volume(0.6)
-        background_music.play(-1)
-    else:
-        screen = None
-
-    # Evaluation Results
-    evaluation_folder = Path(
-        "./evaluation_results/{}".format(
-            datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-        )
-    )
-    evaluation_folder.mkdir(exist_ok=True, parents=True)
-    max_n_samples = {Player.orange: None, Player.white: None}
-
-    if TRAINING_PARAMETERS["MAX_N_OPERATIONS"]:
-        max_n_samples = {
-            turn: int(
-                np.exp(
-                    np.log(TRAINING_PARAMETERS["MAX_N_OPERATIONS"])  # type: ignore
-                    / TRAINING_PARAMETERS["DIFFICULTY"][turn]  # type: ignore
-                )
-            )
-            for turn in [Player.orange, Player.white]
-        }
-    # Loop over all possible combinations of difficulties
-    for difficulty_1 in range(1, 6):
-        for difficulty_2 in range(1, 6):
-            for i in range(N_REPITITIONS):
-                start_time = datetime.datetime.now()
-
-                board = Board(
-                    interactables=TRAINING_PARAMETERS["INTERACTABLES"],  # type: ignore
-                    screen=screen,
-                    margin=MARGIN,
-                    cell_size=CELL_SIZE,
-                )  # type: ignore
-                dummy_agent = MinMaxAgent()
-
-                agents = {
-                    color: (
-                        MinMaxAgent(
-                            max_n_samples=TRAINING_PARAMETERS["MAX_N_OPERATIONS"]  # type: ignore
-                        )
-                        if color not in board.interactables  # type: ignore
-                        else HumanAgent()
-                    )
-                    for color in board.available_pieces.keys()
-                }  # type: ignore
-
-                board.latest_phase = board.phase
-
-                print("Starting game : ")
-                print("Difficulty : ", difficulty_1, difficulty_2)
-                print("Interactables : ", TRAINING_PARAMETERS["INTERACTABLES"])
-                print("Stupidity : ", TRAINING_PARAMETERS["STUPIDITY"])
-                print(
-                    "Max number of operations : ",
-                    TRAINING_PARAMETERS["MAX_N_OPERATIONS"],
-                )
-                print("Max number of samples : ", max_n_samples)
-                latest_moves = []
-                can_add = False
-
-                while True:  # Main game loop
-                    if not ai_thinking:
-                        board.update_draggable_pieces()
-                    if TRAINING_PARAMETERS["RENDER"]:
-                        board.draw()
-
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                pygame.quit()
-                                exit()
-                            elif not board.game_over:
-                                if board.turn in board.interactables:  # type: ignore
-                                    if isinstance(agents[board.turn], HumanAgent):  # type: ignore
-                                        move = agents[board.turn].move(event, board)  # type: ignore
-                                        if move is not None:
-                                            play_sound = True
-                                            evaluations[str(board.turn)].append(  # type: ignore
-                                                dummy_agent.evaluate(board)
-                                            )
-                                            n_pieces[str(board.turn)].append(
-                                                len(board.pieces[board.turn])
-                                            )  # type: ignore
-                                            print(
-                                                "Turn : ",
-                                                str(board.turn),
-                                                "Evaluation : ",
-                                                evaluations[str(board.turn)][-1],  # type: ignore
-                                            )
-
-                                        if can_add:
-                                            if move is not None:
-                                                latest_moves.append(move)
-
-                    board.update_draggable_pieces()
-                    if TRAINING_PARAMETERS["RENDER"]:
-                        board.draw()
-
-                    if board.turn not in board.interactables:  # type: ignore
-                        if not board.game_over:
-                            if isinstance(agents[board.turn], MinMaxAgent):  # type: ignore
-                                if not ai_thinking:
-                                    ai_thinking = True
-                                    print("Starting Thread for ", board.turn)
-                                    Thread(
-                                        target=process_bot,
-                                        args=(
-                                            board,
-                                            agents,
-                                            max_n_samples,
-                                            latest_moves,
-                                            can_add,
-                                            dummy_agent,
-                                            difficulty_1
-                                            if board.turn == Player.orange
-                                            else difficulty_2,
-                                        ),
-                                    ).start()
-
-                    if TRAINING_PARAMETERS["RENDER"] and play_sound:
-                        move_sound.play()
-                        play_sound = False
-
-                    if not can_add and board.phase == Phase.moving:
-                        can_add = True
-                    if (
-                        len(latest_moves) > MIN_DRAW_MOVES
-                        and not any(latest_moves[-MIN_DRAW_MOVES:])
-                        and board.phase == Phase.moving
-                    ):
-                        board.is_draw = True
-
-                    if board.game_over:
-                        print("Game over")
-                        print("N Pieces ", board.pieces)
-                        end_time = datetime.datetime.now()
-                        with open(
-                            evaluation_folder / "evaluation_results.txt", "a"
-                        ) as f:
-                            f.write("Game : {}\n".format(i))
-                            f.write(
-                                "Start Time : {} , End Time : {}\n".format(
-                                    start_time, end_time
-                                )
-                            )
-                            f.write(
-                                "Difficulties : Orange : {} White : {}\n".format(
-                                    difficulty_1, difficulty_2
-                                )
-                            )
-                            f.write(
-                                "Number of Pieces : Orange : {} White : {}\n".format(
-                                    n_pieces[str(Player.orange)],
-                                    n_pieces[str(Player.white)],
-                                )
-                            )
-                            f.write("Training Parameters : \n")
-                            f.write(
-                                "Stupidity : {}\n".format(
-                                    TRAINING_PARAMETERS["STUPIDITY"]
-                                )
-                            )
-                            f.write(
-                                "Max Number of Operations : {}\n".format(
-                                    TRAINING_PARAMETERS["MAX_N_OPERATIONS"]
-                                )
-                            )
-                            f.write(
-                                "Max Number of Samples : {}\n".format(max_n_samples)
-                            )
-                            f.write("Evaluation Coefficients : \n")
-                            f.write(json.dumps(EVALUATION_COEFFICIENTS))
-                            f.write("\n")
-                            f.write("Winner : {}\n".format(board.winner))
-                            f.write(str(evaluations))
-                            f.write("\n\n\n")
-                        del board
-                        break
-
-
-def process_bot(
-    board: Board,
-    agents: dict["str", MinMaxAgent | HumanAgent],
-    max_n_samples: dict,
-    latest_moves: list,
-    can_add: bool,
-    dummy_agent: MinMaxAgent,
-    difficulty: int,
-):
-    global ai_thinking, play_sound, evaluations, n_pieces
-    best_move, _ = agents[board.turn].minimax(  # type: ignore
-        board,
-        depth=difficulty,  # type: ignore
-        alpha=float("-inf"),
-        beta=float("inf"),
-        fanning=max_n_samples[board.turn],
-        multicore=TRAINING_PARAMETERS["N_PROCESS"],  # type: ignore
-    )
-    move = agents[board.turn].make_move(  # type: ignore
-        board,
-        best_move,
-        render=TRAINING_PARAMETERS["RENDER"],  # type: ignore
-    )  # type: ignore
-    evaluations[str(board.turn)].append(dummy_agent.evaluate(board))
-    n_pieces[str(board.turn)].append(len(board.pieces[board.turn]))  # type: ignore
-    print("Turn : ", str(board.turn), "Evaluation : ", evaluations[str(board.turn)][-1])
-
-    if can_add:
-        if move is not None:
-            latest_moves.append(move)
-
-    ai_thinking = False
-    play_sound = True
-
-
-if __name__ == "__main__":
-    main()
+from src.globals import (
+    N_REPITITIONS,
+    EVALUATION_COEFFICIENTS,
+    Player,
+)
+
+from src.globals import TRAINING_PARAMETERS
+from src.self_play import AgentConfig, GameRecord, play_games
+import numpy as np
+from pathlib import Path
+import datetime
+import json
+
+
+def main():
+    """Play every pair of difficulties against each other and log the games."""
+
+    # Evaluation Results
+    evaluation_folder = Path(
+        "./evaluation_results/{}".format(
+            datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        )
+    )
+    evaluation_folder.mkdir(exist_ok=True, parents=True)
+
+    def config(difficulty: int, color: Player) -> AgentConfig:
+        max_n_samples = None
+        if TRAINING_PARAMETERS["MAX_N_OPERATIONS"]:
+            max_n_samples = int(
+                np.exp(
+                    np.log(TRAINING_PARAMETERS["MAX_N_OPERATIONS"])  # type: ignore
+                    / difficulty
+                )
+            )
+        return AgentConfig(
+            depth=difficulty,
+            max_nodes=TRAINING_PARAMETERS["MAX_N_OPERATIONS"],  # type: ignore
+            fanning=max_n_samples,
+            stupidity=TRAINING_PARAMETERS["STUPIDITY"],  # type: ignore
+            agent_parameters=dict(
+                max_n_samples=TRAINING_PARAMETERS["MAX_N_OPERATIONS"],
+                late_move_reductions=TRAINING_PARAMETERS["LATE_MOVE_REDUCTIONS"][color],  # type: ignore
+                futility_pruning=TRAINING_PARAMETERS["FUTILITY_PRUNING"][color],  # type: ignore
+            ),
+        )
+
+    # All the combinations of difficulties, played in parallel
+    matches = [
+        {
+            Player.orange: config(difficulty_1, Player.orange),
+            Player.white: config(difficulty_2, Player.white),
+        }
+        for difficulty_1 in range(1, 6)
+        for difficulty_2 in range(1, 6)
+        for _ in range(N_REPITITIONS)
+    ]
+
+    for record in play_games(matches, TRAINING_PARAMETERS["N_PROCESS"]):  # type: ignore
+        print(
+            "Game {} over, difficulties {} / {}, winner {}".format(
+                record.game,
+                record.configs[str(Player.orange)].depth,
+                record.configs[str(Player.white)].depth,
+                record.winner,
+            )
+        )
+        with open(evaluation_folder / "evaluation_results.txt", "a") as f:
+            write_record(f, record)
+
+
+def write_record(f, record: GameRecord):
+    """Write a game in the format read by `log_parsing.parse_logs`."""
+    orange, white = str(Player.orange), str(Player.white)
+    f.write("Game : {}\n".format(record.game))
+    f.write(
+        "Start Time : {} , End Time : {}\n".format(record.start_time, record.end_time)
+    )
+    f.write(
+        "Difficulties : Orange : {} White : {}\n".format(
+            record.configs[orange].depth, record.configs[white].depth
+        )
+    )
+    f.write(
+        "Number of Pieces : Orange : {} White : {}\n".format(
+            record.n_pieces[orange], record.n_pieces[white]
+        )
+    )
+    f.write("Training Parameters : \n")
+    f.write("Stupidity : {}\n".format(TRAINING_PARAMETERS["STUPIDITY"]))
+    f.write(
+        "Max Number of Operations : {}\n".format(
+            TRAINING_PARAMETERS["MAX_N_OPERATIONS"]
+        )
+    )
+    f.write(
+        "Max Number of Samples : {}\n".format(
+            {
+                Player.orange: record.configs[orange].fanning,
+                Player.white: record.configs[white].fanning,
+            }
+        )
+    )
+    f.write(
+        "Late Move Reductions : {}\n".format(
+            TRAINING_PARAMETERS["LATE_MOVE_REDUCTIONS"]
+        )
+    )
+    f.write("Futility Pruning : {}\n".format(TRAINING_PARAMETERS["FUTILITY_PRUNING"]))
+    f.write(
+        "Number of Nodes : Orange : {} White : {}\n".format(
+            record.n_nodes[orange], record.n_nodes[white]
+        )
+    )
+    f.write("Evaluation Coefficients : \n")
+    f.write(json.dumps(EVALUATION_COEFFICIENTS))
+    f.write("\n")
+    f.write("Winner : {}\n".format(record.winner))
+    f.write(str(record.evaluations))
+    f.write("\n\n\n")
+
+
+if __name__ == "__main__":
+    main()
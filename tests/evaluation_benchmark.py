@@ -0,0 +1,92 @@
+from src.game_env.board import Board
+from src.globals import CELL_SIZE, MARGIN
+from src.agents.autonomous_agents import MinMaxAgent
+import numpy as np
+import argparse
+import random
+import time
+
+
+def sample_positions(n_games: int, seed: int = 0) -> list[Board]:
+    """Collect the positions of random games, with their draggable pieces updated."""
+    random.seed(seed)
+    agent = MinMaxAgent()
+    boards = []
+    for _ in range(n_games):
+        board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+        while True:
+            board.update_draggable_pieces()
+            possible_moves = agent.generate_possible_moves(board)
+            if board.game_over or not possible_moves or len(boards) > 100 * n_games:
+                break
+            boards.append(board.ai_copy())
+            agent.make_move(board, random.choice(possible_moves), render=False)
+    return boards
+
+
+def benchmark_search(
+    boards: list[Board], depth: int, batch_leaf_evaluation: bool
+) -> tuple[list[float], int, float]:
+    """Search every position, with or without the batched leaves.
+
+    Returns:
+        tuple[list[float], int, float]: The values of the searches, the number of
+            nodes they visited and their duration in seconds.
+    """
+    values, n_nodes = [], 0
+    start_time = time.perf_counter()
+    for board in boards:
+        agent = MinMaxAgent(batch_leaf_evaluation=batch_leaf_evaluation)
+        _, value = agent.search(
+            board.ai_copy(), depth, training_parameters={"STUPIDITY": 0.0}
+        )
+        values.append(value)
+        n_nodes += agent.last_search_stats["n_nodes"]
+    return values, n_nodes, time.perf_counter() - start_time
+
+
+def main():
+    """Compare the evaluations per second of `evaluate` and `evaluate_batch`."""
+    parser = argparse.ArgumentParser(description="Benchmark the evaluation.")
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--depths", type=int, nargs="*", default=[2, 3])
+    parser.add_argument("--searches", type=int, default=100)
+    args = parser.parse_args()
+
+    boards = sample_positions(args.games)
+    keys = np.array([board.key() for board in boards])
+    print("Positions : ", len(boards))
+
+    start_time = time.perf_counter()
+    for _ in range(args.repeats):
+        values = np.array([MinMaxAgent.evaluate(board) for board in boards])
+    single_rate = args.repeats * len(boards) / (time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    for _ in range(args.repeats):
+        batch_values = MinMaxAgent.evaluate_batch(keys)
+    batch_rate = args.repeats * len(boards) / (time.perf_counter() - start_time)
+
+    assert np.allclose(values, batch_values), "The evaluations differ"
+    print("evaluate       : {:,.0f} evaluations/s".format(single_rate))
+    print("evaluate_batch : {:,.0f} evaluations/s".format(batch_rate))
+    print("Speedup : {:.1f}x".format(batch_rate / single_rate))
+
+    # The searches of evenly spaced positions, with and without the batched leaves
+    searched = boards[:: max(1, len(boards) // args.searches)]
+    for depth in args.depths:
+        values, n_nodes, duration = benchmark_search(searched, depth, False)
+        batch_values, batch_n_nodes, batch_duration = benchmark_search(
+            searched, depth, True
+        )
+        assert np.allclose(values, batch_values), "The search values differ"
+        print(
+            "Depth {} : {:,} nodes in {:.2f}s, batched {:,} nodes in {:.2f}s".format(
+                depth, n_nodes, duration, batch_n_nodes, batch_duration
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
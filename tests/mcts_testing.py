@@ -0,0 +1,84 @@
+from src.game_env.board import Board
+from src.globals import CELL_SIZE, MARGIN, Player
+from src.agents.mcts_agent import MCTSAgent
+from src.self_play import AgentConfig, play_game
+import argparse
+import time
+
+
+def check_reroot_full_tree(sizes: range = range(100, 200)) -> int:
+    """Fill the tree of the agent exactly, then reuse a subtree of it.
+
+    Returns:
+        int: The number of tree sizes that were filled exactly.
+    """
+    n_full = 0
+    for size in sizes:
+        agent = MCTSAgent(max_tree_size=size, use_priors=False, seed=0)
+        board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+        move, _ = agent.search(board, max_nodes=50)
+        if agent.n_used < size:
+            continue
+        n_full += 1
+
+        # The most visited child of the root of the full tree becomes the root
+        agent.make_move(board, move, render=False)
+        board.update_draggable_pieces()
+        n_used = agent.n_used
+        assert agent._reuse_tree(board) > 0, "The subtree was not reused"
+        assert agent.n_used <= n_used, "The tree grew when rerooted"
+        freed = slice(agent.n_used, size)
+        assert (agent.visits[freed] == 0).all(), "Freed nodes kept their visits"
+        assert (agent.first_child[freed] == -1).all(), "Freed nodes kept children"
+        assert (agent.keys[freed] == -1).all(), "Freed nodes kept their keys"
+        assert all(move is None for move in agent.moves[freed]), "Freed moves remain"
+        agent.search(board, max_nodes=50)
+    assert n_full > 0, "No tree size was filled exactly"
+    return n_full
+
+
+def check_small_budget(n_workers: int = 4):
+    """Check that parallel trees find a move with fewer simulations than trees."""
+    agent = MCTSAgent(seed=0)
+    board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+    for max_nodes in range(1, n_workers + 1):
+        move, _ = agent.search(board, max_nodes=max_nodes, multicore=n_workers)
+        assert move is not None, "No move with {} simulations".format(max_nodes)
+
+
+def check_self_play(n_games: int = 2) -> dict:
+    """Play MCTS against minimax through the self-play configurations.
+
+    Returns:
+        dict: The winner of each game.
+    """
+    configs = [AgentConfig(algorithm="mcts", max_nodes=200), AgentConfig(depth=1)]
+    winners = {}
+    for game in range(n_games):
+        orange, white = configs if game % 2 == 0 else configs[::-1]
+        record = play_game({Player.orange: orange, Player.white: white}, game, game)
+        assert record.n_nodes[str(Player.orange if game % 2 == 0 else Player.white)] > 0
+        winners[game] = record.winner
+    return winners
+
+
+def main():
+    """Check the tree reuse and the parallel budgets of the MCTS agent."""
+    parser = argparse.ArgumentParser(description="Check the MCTS agent.")
+    parser.add_argument("--games", type=int, default=2)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    n_full = check_reroot_full_tree()
+    print(
+        "Rerooted {} full trees ({:.1f}s)".format(
+            n_full, time.perf_counter() - start_time
+        )
+    )
+    check_small_budget()
+    print("Parallel trees play with any budget")
+    print("Winners against minimax : ", check_self_play(args.games))
+
+
+if __name__ == "__main__":
+    main()
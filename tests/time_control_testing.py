@@ -0,0 +1,55 @@
+from src.globals import Player
+from src.self_play import AgentConfig, play_games
+import argparse
+import time
+
+
+def check_time_control(
+    n_games: int,
+    time_control: tuple[float, float] = (5.0, 0.05),
+    depth: int = 6,
+    n_processes: int = -1,
+    seed: int = 0,
+) -> float:
+    """Play timed games between bots and check that no clock runs out.
+
+    The depth is the deepest iteration allowed, the clocks stopping the searches
+    before it in most positions.
+
+    Returns:
+        float: The least time left on a clock at the end of a game, in seconds.
+    """
+    config = AgentConfig(depth=depth, time_control=time_control)
+    matches = [{Player.orange: config, Player.white: config} for _ in range(n_games)]
+    least_remaining = time_control[0]
+    for record in play_games(matches, n_processes, seed, n_random_plies=2):
+        assert not any(record.flag_fell.values()), "A flag fell in game {}: {}".format(
+            record.game, record.remaining_times
+        )
+        least_remaining = min(least_remaining, *record.remaining_times.values())
+    return least_remaining
+
+
+def main():
+    """Play many timed games and check that every clock keeps some time."""
+    parser = argparse.ArgumentParser(description="Check the time manager.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--time", type=float, default=5.0)
+    parser.add_argument("--increment", type=float, default=0.05)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--processes", type=int, default=-1)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    least_remaining = check_time_control(
+        args.games, (args.time, args.increment), args.depth, args.processes
+    )
+    print(
+        "No flag fell in {} games, least time left {:.2f}s ({:.1f}s)".format(
+            args.games, least_remaining, time.perf_counter() - start_time
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from src.game_env.board import Board
+from src.game_env.symmetry import encode_move
+from src.game_env.vector_env import (
+    N_POINTS,
+    ORANGE,
+    VectorEnv,
+    greedy_moves,
+    random_moves,
+)
+from src.globals import CELL_SIZE, MARGIN, Player
+from src.agents.autonomous_agents import MinMaxAgent
+import numpy as np
+import argparse
+import random
+import time
+
+
+def check_rules(n_games: int, seed: int = 0) -> int:
+    """Play random games on `Board` and `VectorEnv` side by side and compare them.
+
+    Returns:
+        int: The number of positions compared.
+    """
+    random.seed(seed)
+    agent = MinMaxAgent()
+    n_positions = 0
+    for game in range(n_games):
+        board = Board(cell_size=CELL_SIZE, margin=MARGIN)
+        env = VectorEnv(1)
+        legal = env.legal_moves()
+        while True:
+            board.update_draggable_pieces()
+            assert board.key() == env.keys()[0], "The positions differ"
+            possible_moves = agent.generate_possible_moves(board)
+            if board.game_over or not possible_moves:
+                break
+            moves = {
+                source * N_POINTS + target: move
+                for move in possible_moves
+                for source, target in [encode_move(board, move, 0)]
+            }
+            assert set(moves) == set(np.flatnonzero(legal[0])), "The moves differ"
+            assert not env.done[0], "The game is over too early"
+
+            move = random.choice(sorted(moves))
+            agent.make_move(board, moves[move], render=False)
+            _, legal, _, _ = env.step(np.array([move]))
+            n_positions += 1
+            if env.draw[0]:
+                break
+
+        if not env.draw[0]:
+            winner = board.winner or (
+                Player.white if board.turn == Player.orange else Player.orange
+            )
+            assert env.winner[0] == (ORANGE if winner == Player.orange else 1), (
+                "The winners differ in game {}".format(game)
+            )
+    return n_positions
+
+
+def benchmark(n_games: int, n_steps: int, policy: str, seed: int = 0) -> float:
+    """Measure the number of positions per second generated by a policy.
+
+    Returns:
+        float: The number of positions per second.
+    """
+    rng = np.random.default_rng(seed)
+    env = VectorEnv(n_games)
+    env.reset()
+    legal = env.legal_moves()
+    n_positions = 0
+    start_time = time.perf_counter()
+    for _ in range(n_steps):
+        if policy == "greedy":
+            moves = greedy_moves(env, legal, MinMaxAgent.evaluate_batch, rng)
+        else:
+            moves = random_moves(legal, rng)
+        n_positions += int((~env.done).sum())
+        _, legal, _, done = env.step(moves)
+        if done.any():
+            env.reset(np.flatnonzero(done))
+            legal = env.legal_moves()
+    return n_positions / (time.perf_counter() - start_time)
+
+
+def main():
+    """Check the rules of the vectorized environment and measure its speed."""
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized games.")
+    parser.add_argument("--check-games", type=int, default=200)
+    parser.add_argument("--games", type=int, default=1024)
+    parser.add_argument("--steps", type=int, default=200)
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    n_positions = check_rules(args.check_games)
+    print(
+        "Rules match Board on {} positions of {} games ({:.1f}s)".format(
+            n_positions, args.check_games, time.perf_counter() - start_time
+        )
+    )
+    for policy in ["random", "greedy"]:
+        rate = benchmark(args.games, args.steps, policy)
+        print(
+            "{:<6} : {:,.0f} positions/s, {:,.0f} positions/hour".format(
+                policy, rate, 3600 * rate
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()